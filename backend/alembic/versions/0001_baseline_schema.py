@@ -0,0 +1,265 @@
+"""baseline schema
+
+The application tables as Base.metadata.create_all() built them before
+migrations were introduced, together with dashboard_counters (dashboard
+summary counters) and table_versions (per-table write counters), which were
+added by create_all() shortly before. Tables that already exist are kept.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 09:26:30.751307
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases created by Base.metadata.create_all() before migrations existed
+    # already have some of these tables; they are left as they are.
+    existing = set() if context.is_offline_mode() else set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'dashboard_counters' not in existing:
+        op.create_table('dashboard_counters',
+            sa.Column('project_id', sa.Integer(), nullable=False),
+            sa.Column('entity', sa.String(length=30), nullable=False),
+            sa.Column('status', sa.String(length=50), nullable=False),
+            sa.Column('approval', sa.String(length=10), nullable=False),
+            sa.Column('day', sa.Date(), nullable=False),
+            sa.Column('count', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('project_id', 'entity', 'status', 'approval', 'day')
+        )
+
+    if 'table_versions' not in existing:
+        op.create_table('table_versions',
+            sa.Column('table_name', sa.String(length=50), nullable=False),
+            sa.Column('version', sa.Integer(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('table_name')
+        )
+
+    if 'users' not in existing:
+        op.create_table('users',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('username', sa.String(length=50), nullable=False),
+            sa.Column('email', sa.String(length=100), nullable=False),
+            sa.Column('hashed_password', sa.String(length=255), nullable=False),
+            sa.Column('full_name', sa.String(length=100), nullable=True),
+            sa.Column('role', sa.Enum('ADMIN', 'QA_MANAGER', 'INSPECTOR', 'MEMBER', 'VISITOR', name='userrole'), nullable=False),
+            sa.Column('is_active', sa.Boolean(), nullable=False),
+            sa.Column('is_superuser', sa.Boolean(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('validated_until', sa.DateTime(), nullable=False),
+            sa.Column('created_by', sa.Integer(), nullable=True),
+            sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+        op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+        op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+
+    if 'audit_trail' not in existing:
+        op.create_table('audit_trail',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('action', sa.String(length=20), nullable=False),
+            sa.Column('table_name', sa.String(length=50), nullable=False),
+            sa.Column('record_id', sa.Integer(), nullable=False),
+            sa.Column('changes', sa.JSON(), nullable=True),
+            sa.Column('description', sa.Text(), nullable=True),
+            sa.Column('ip_address', sa.String(length=45), nullable=True),
+            sa.Column('user_agent', sa.String(length=255), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_audit_trail_id'), 'audit_trail', ['id'], unique=False)
+
+    if 'projects' not in existing:
+        op.create_table('projects',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('project_number', sa.String(length=50), nullable=False),
+            sa.Column('project_name', sa.String(length=200), nullable=False),
+            sa.Column('client', sa.String(length=200), nullable=False),
+            sa.Column('start_date', sa.Date(), nullable=False),
+            sa.Column('end_date', sa.Date(), nullable=True),
+            sa.Column('status', sa.String(length=50), nullable=False),
+            sa.Column('project_manager', sa.String(length=100), nullable=False),
+            sa.Column('description', sa.String(length=500), nullable=True),
+            sa.Column('budget', sa.Float(), nullable=True),
+            sa.Column('created_by', sa.Integer(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('project_number')
+        )
+        op.create_index(op.f('ix_projects_id'), 'projects', ['id'], unique=False)
+
+    if 'final_inspections' not in existing:
+        op.create_table('final_inspections',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('project_id', sa.Integer(), nullable=False),
+            sa.Column('drawing_no', sa.String(length=100), nullable=True),
+            sa.Column('line_no', sa.String(length=50), nullable=True),
+            sa.Column('spool_no', sa.String(length=50), nullable=True),
+            sa.Column('joint_no', sa.String(length=50), nullable=True),
+            sa.Column('weld_type', sa.String(length=50), nullable=True),
+            sa.Column('part1_thickness', sa.Float(), nullable=True),
+            sa.Column('part1_grade', sa.String(length=50), nullable=True),
+            sa.Column('part1_size', sa.String(length=50), nullable=True),
+            sa.Column('part2_thickness', sa.Float(), nullable=True),
+            sa.Column('part2_grade', sa.String(length=50), nullable=True),
+            sa.Column('part2_size', sa.String(length=50), nullable=True),
+            sa.Column('joint_type', sa.String(length=50), nullable=True),
+            sa.Column('work_site', sa.String(length=20), nullable=True),
+            sa.Column('wps_no', sa.String(length=100), nullable=True),
+            sa.Column('welder_no', sa.String(length=100), nullable=True),
+            sa.Column('weld_process', sa.String(length=50), nullable=True),
+            sa.Column('welding_completion_date', sa.Date(), nullable=True),
+            sa.Column('weld_length', sa.Float(), nullable=True),
+            sa.Column('final_inspection_date', sa.Date(), nullable=True),
+            sa.Column('final_report_no', sa.String(length=100), nullable=True),
+            sa.Column('final_result', sa.String(length=20), nullable=True),
+            sa.Column('status', sa.String(length=20), nullable=True),
+            sa.Column('is_approved', sa.Boolean(), nullable=True),
+            sa.Column('approved_by', sa.Integer(), nullable=True),
+            sa.Column('approved_at', sa.Date(), nullable=True),
+            sa.Column('created_by', sa.Integer(), nullable=False),
+            sa.Column('updated_by', sa.Integer(), nullable=True),
+            sa.Column('created_at', sa.Date(), nullable=False),
+            sa.Column('updated_at', sa.Date(), nullable=False),
+            sa.ForeignKeyConstraint(['approved_by'], ['users.id'], ),
+            sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+            sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+            sa.ForeignKeyConstraint(['updated_by'], ['users.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_final_inspections_id'), 'final_inspections', ['id'], unique=False)
+
+    if 'fitups' not in existing:
+        op.create_table('fitups',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('project_id', sa.Integer(), nullable=False),
+            sa.Column('drawing_no', sa.String(length=100), nullable=True),
+            sa.Column('line_no', sa.String(length=50), nullable=True),
+            sa.Column('spool_no', sa.String(length=50), nullable=True),
+            sa.Column('joint_no', sa.String(length=50), nullable=True),
+            sa.Column('weld_type', sa.String(length=50), nullable=True),
+            sa.Column('part1_thickness', sa.Float(), nullable=True),
+            sa.Column('part1_grade', sa.String(length=50), nullable=True),
+            sa.Column('part1_size', sa.String(length=50), nullable=True),
+            sa.Column('part2_thickness', sa.Float(), nullable=True),
+            sa.Column('part2_grade', sa.String(length=50), nullable=True),
+            sa.Column('part2_size', sa.String(length=50), nullable=True),
+            sa.Column('joint_type', sa.String(length=50), nullable=True),
+            sa.Column('work_site', sa.String(length=20), nullable=True),
+            sa.Column('fitup_inspection_date', sa.Date(), nullable=True),
+            sa.Column('fitup_report_no', sa.String(length=100), nullable=True),
+            sa.Column('fitup_result', sa.String(length=20), nullable=True),
+            sa.Column('status', sa.String(length=20), nullable=True),
+            sa.Column('is_approved', sa.Boolean(), nullable=True),
+            sa.Column('approved_by', sa.Integer(), nullable=True),
+            sa.Column('approved_at', sa.Date(), nullable=True),
+            sa.Column('created_by', sa.Integer(), nullable=False),
+            sa.Column('updated_by', sa.Integer(), nullable=True),
+            sa.Column('created_at', sa.Date(), nullable=False),
+            sa.Column('updated_at', sa.Date(), nullable=False),
+            sa.ForeignKeyConstraint(['approved_by'], ['users.id'], ),
+            sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+            sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+            sa.ForeignKeyConstraint(['updated_by'], ['users.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_fitups_id'), 'fitups', ['id'], unique=False)
+
+    if 'materials' not in existing:
+        op.create_table('materials',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('project_id', sa.Integer(), nullable=False),
+            sa.Column('material_type', sa.String(length=50), nullable=False),
+            sa.Column('material_grade', sa.String(length=50), nullable=True),
+            sa.Column('thickness', sa.Float(), nullable=True),
+            sa.Column('size', sa.String(length=50), nullable=True),
+            sa.Column('heat_no', sa.String(length=100), nullable=True),
+            sa.Column('material_inspection_date', sa.Date(), nullable=True),
+            sa.Column('material_inspection_result', sa.String(length=20), nullable=True),
+            sa.Column('material_report_no', sa.String(length=100), nullable=True),
+            sa.Column('status', sa.String(length=20), nullable=True),
+            sa.Column('created_by', sa.Integer(), nullable=False),
+            sa.Column('updated_by', sa.Integer(), nullable=True),
+            sa.Column('created_at', sa.Date(), nullable=False),
+            sa.Column('updated_at', sa.Date(), nullable=False),
+            sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+            sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+            sa.ForeignKeyConstraint(['updated_by'], ['users.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_materials_id'), 'materials', ['id'], unique=False)
+
+    if 'ndt_requests' not in existing:
+        op.create_table('ndt_requests',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('project_id', sa.Integer(), nullable=False),
+            sa.Column('line_no', sa.String(length=50), nullable=True),
+            sa.Column('spool_no', sa.String(length=50), nullable=True),
+            sa.Column('joint_no', sa.String(length=50), nullable=True),
+            sa.Column('weld_process', sa.String(length=50), nullable=True),
+            sa.Column('welder_no', sa.String(length=100), nullable=True),
+            sa.Column('weld_length', sa.Float(), nullable=True),
+            sa.Column('ndt_request_date', sa.Date(), nullable=True),
+            sa.Column('ndt_method', sa.String(length=50), nullable=True),
+            sa.Column('ndt_result', sa.String(length=20), nullable=True),
+            sa.Column('status', sa.String(length=20), nullable=True),
+            sa.Column('is_completed', sa.Boolean(), nullable=True),
+            sa.Column('completed_by', sa.Integer(), nullable=True),
+            sa.Column('completed_at', sa.Date(), nullable=True),
+            sa.Column('created_by', sa.Integer(), nullable=False),
+            sa.Column('updated_by', sa.Integer(), nullable=True),
+            sa.Column('created_at', sa.Date(), nullable=False),
+            sa.Column('updated_at', sa.Date(), nullable=False),
+            sa.ForeignKeyConstraint(['completed_by'], ['users.id'], ),
+            sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+            sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+            sa.ForeignKeyConstraint(['updated_by'], ['users.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_ndt_requests_id'), 'ndt_requests', ['id'], unique=False)
+
+    if 'user_project_assignments' not in existing:
+        op.create_table('user_project_assignments',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('project_id', sa.Integer(), nullable=False),
+            sa.Column('assigned_by', sa.Integer(), nullable=False),
+            sa.Column('assigned_at', sa.DateTime(), nullable=False),
+            sa.Column('is_active', sa.Boolean(), nullable=False),
+            sa.Column('project_role', sa.String(length=50), nullable=False),
+            sa.ForeignKeyConstraint(['assigned_by'], ['users.id'], ),
+            sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_user_project_assignments_id'), 'user_project_assignments', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_table('user_project_assignments')
+    op.drop_table('ndt_requests')
+    op.drop_table('materials')
+    op.drop_table('fitups')
+    op.drop_table('final_inspections')
+    op.drop_table('projects')
+    op.drop_table('audit_trail')
+    op.drop_table('users')
+    op.drop_table('table_versions')
+    op.drop_table('dashboard_counters')
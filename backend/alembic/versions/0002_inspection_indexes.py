@@ -0,0 +1,84 @@
+"""inspection and audit indexes
+
+Composite indexes for the per-project list, status and joint lookups, the
+dashboard and trend date filters, pending approvals, and audit trail history.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:40:00.000000
+
+"""
+from contextlib import nullcontext
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PENDING_APPROVAL = sa.text("is_approved IS NULL")
+
+# (index name, table, columns, create_index keyword arguments)
+INDEXES = [
+    ('ix_materials_created_at', 'materials', ['created_at'], {}),
+    ('ix_materials_project_status', 'materials', ['project_id', 'status'], {}),
+    ('ix_materials_project_created_at', 'materials', ['project_id', 'created_at'], {}),
+    ('ix_materials_status', 'materials', ['status'], {}),
+    ('ix_ndt_requests_ndt_method', 'ndt_requests', ['ndt_method'], {}),
+    ('ix_audit_trail_record', 'audit_trail', ['table_name', 'record_id', 'created_at'], {}),
+    ('ix_audit_trail_user_created_at', 'audit_trail', ['user_id', 'created_at'], {}),
+    ('ix_audit_trail_created_at', 'audit_trail', ['created_at'], {}),
+]
+for _table in ('fitups', 'final_inspections', 'ndt_requests'):
+    INDEXES += [
+        (f'ix_{_table}_created_at', _table, ['created_at'], {}),
+        (f'ix_{_table}_project_status', _table, ['project_id', 'status'], {}),
+        (f'ix_{_table}_project_created_at', _table, ['project_id', 'created_at'], {}),
+        (f'ix_{_table}_project_joint', _table, ['project_id', 'line_no', 'spool_no', 'joint_no'], {}),
+        (f'ix_{_table}_status', _table, ['status'], {}),
+    ]
+for _table in ('fitups', 'final_inspections'):
+    INDEXES.append((
+        f'ix_{_table}_pending_approval', _table, ['project_id'],
+        {'postgresql_where': PENDING_APPROVAL, 'sqlite_where': PENDING_APPROVAL},
+    ))
+
+
+def _concurrently():
+    """
+    On PostgreSQL, build and drop indexes with CONCURRENTLY outside the migration
+    transaction, so writes to the inspection tables are not blocked meanwhile.
+    """
+    if op.get_context().dialect.name == "postgresql":
+        return op.get_context().autocommit_block(), {"postgresql_concurrently": True}
+    return nullcontext(), {}
+
+
+def _existing_indexes(table: str) -> set:
+    if context.is_offline_mode():
+        return set()
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade() -> None:
+    # Tables created by Base.metadata.create_all() may already carry these indexes
+    block, concurrently = _concurrently()
+    existing = {}
+    with block:
+        for name, table, columns, options in INDEXES:
+            if table not in existing:
+                existing[table] = _existing_indexes(table)
+            if name not in existing[table]:
+                op.create_index(name, table, columns, unique=False, **options, **concurrently)
+
+
+def downgrade() -> None:
+    block, concurrently = _concurrently()
+    with block:
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, **concurrently)
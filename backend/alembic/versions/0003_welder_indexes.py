@@ -0,0 +1,56 @@
+"""welder indexes
+
+Indexes for the welder filter of the final inspection and NDT request lists.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 14:10:00.000000
+
+"""
+from contextlib import nullcontext
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns)
+INDEXES = [
+    ('ix_final_inspections_welder_no', 'final_inspections', ['welder_no']),
+    ('ix_ndt_requests_welder_no', 'ndt_requests', ['welder_no']),
+]
+
+
+def _concurrently():
+    """(context manager, create/drop_index options): CONCURRENTLY on PostgreSQL, as in 0002."""
+    if op.get_context().dialect.name == "postgresql":
+        return op.get_context().autocommit_block(), {"postgresql_concurrently": True}
+    return nullcontext(), {}
+
+
+def _existing_indexes(table: str) -> set:
+    if context.is_offline_mode():
+        return set()
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade() -> None:
+    # Skip indexes a create_all() database already has
+    block, concurrently = _concurrently()
+    with block:
+        for name, table, columns in INDEXES:
+            if name not in _existing_indexes(table):
+                op.create_index(name, table, columns, unique=False, **concurrently)
+
+
+def downgrade() -> None:
+    block, concurrently = _concurrently()
+    with block:
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, **concurrently)
@@ -0,0 +1,39 @@
+"""backfill dashboard counters
+
+Databases that held records before dashboard_counters existed start with an
+empty counters table; fill it from the record tables. Counters that are already
+populated are kept, since the ORM keeps them current from then on.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 16:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+from sqlalchemy.orm import Session
+
+from app.utils.dashboard_counters import counters_need_rebuild, rebuild_counters
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Data only; there is nothing to emit in offline (--sql) mode
+    if context.is_offline_mode():
+        return
+    # The session joins the migration transaction, so the rebuild commits with it
+    with Session(bind=op.get_bind()) as db:
+        if counters_need_rebuild(db):
+            rebuild_counters(db)
+
+
+def downgrade() -> None:
+    # The counters are derived data; leaving them in place is harmless
+    pass
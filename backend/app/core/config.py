@@ -0,0 +1,89 @@
+import os
+from pathlib import Path
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# backend/ directory
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+class Settings:
+    """
+    Runtime settings read from environment variables (or a .env file).
+    """
+    def __init__(self):
+        # Database connection; docker-compose points this at PostgreSQL
+        self.database_url = os.getenv("DATABASE_URL", "sqlite:///./fabrication_app.db")
+        # Defaults to DATABASE_URL with the aiosqlite / asyncpg driver
+        self.async_database_url = os.getenv("ASYNC_DATABASE_URL", "")
+        self.db_pool_size = int(os.getenv("DB_POOL_SIZE", "5"))
+        self.db_max_overflow = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+        self.db_pool_timeout = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+        self.db_pool_recycle = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+        self.db_pool_pre_ping = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+        # Per-statement limit in milliseconds (PostgreSQL only); 0 disables it
+        self.db_statement_timeout_ms = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+
+        # Opt-in tuning of file-based SQLite databases: WAL journal, larger cache, mmap, busy timeout
+        self.sqlite_performance_profile = os.getenv("SQLITE_PERFORMANCE_PROFILE", "false").lower() == "true"
+        self.sqlite_cache_size_kb = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+        self.sqlite_mmap_size = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+        self.sqlite_busy_timeout_ms = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+        self.sqlite_journal_size_limit = int(os.getenv("SQLITE_JOURNAL_SIZE_LIMIT", str(64 * 1024 * 1024)))
+        # Seconds between background WAL checkpoints; 0 leaves checkpoints to SQLite alone
+        self.sqlite_checkpoint_interval_seconds = float(os.getenv("SQLITE_CHECKPOINT_INTERVAL_SECONDS", "60"))
+
+        # Per-request SQL statistics (Server-Timing header and a log line per request)
+        self.query_stats_enabled = os.getenv("QUERY_STATS_ENABLED", "true").lower() == "true"
+        # Statements at least this slow go to the slow-query log; -1 disables it
+        self.slow_query_threshold_ms = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+        self.slow_query_log_file = Path(os.getenv("SLOW_QUERY_LOG_FILE")) if os.getenv("SLOW_QUERY_LOG_FILE") else None
+        # A statement repeated more often than this in one request is logged as a likely N+1
+        self.query_repeat_threshold = int(os.getenv("QUERY_REPEAT_THRESHOLD", "10"))
+        # Level of the per-request query log lines on stderr; WARNING keeps only repeats and slow queries
+        self.query_log_level = os.getenv("QUERY_LOG_LEVEL", "INFO").upper()
+
+        # Bulk create/update endpoints: records per request, and per flushed INSERT batch
+        self.bulk_max_items = int(os.getenv("BULK_MAX_ITEMS", "5000"))
+        self.bulk_chunk_size = int(os.getenv("BULK_CHUNK_SIZE", "500"))
+
+        # Background export jobs
+        self.export_dir = Path(os.getenv("EXPORT_DIR", str(BASE_DIR / "exports")))
+        self.export_workers = int(os.getenv("EXPORT_WORKERS", "2"))
+        self.export_job_ttl_seconds = int(os.getenv("EXPORT_JOB_TTL_SECONDS", "3600"))
+
+        # Background spreadsheet imports (POST /import/{kind}): uploads, workers, rows per transaction,
+        # and how long a finished import's status and error report are kept
+        self.import_dir = Path(os.getenv("IMPORT_DIR", str(BASE_DIR / "imports")))
+        self.import_workers = int(os.getenv("IMPORT_WORKERS", "1"))
+        self.import_batch_size = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+        self.import_job_ttl_seconds = int(os.getenv("IMPORT_JOB_TTL_SECONDS", "3600"))
+
+        # Threads producing the sheets of a multi-sheet export concurrently
+        self.export_sheet_workers = int(os.getenv("EXPORT_SHEET_WORKERS", "5"))
+
+        # Process pool used to render batches of PDF reports
+        self.pdf_workers = int(os.getenv("PDF_WORKERS", str(os.cpu_count() or 2)))
+
+        # Rendered export artifact cache
+        self.export_cache_enabled = os.getenv("EXPORT_CACHE_ENABLED", "true").lower() == "true"
+        self.export_cache_dir = Path(os.getenv("EXPORT_CACHE_DIR", str(self.export_dir / "cache")))
+        self.export_cache_max_bytes = int(os.getenv("EXPORT_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+
+        # Serve dashboard statistics from the dashboard_counters summary table
+        self.dashboard_use_counters = os.getenv("DASHBOARD_USE_COUNTERS", "true").lower() == "true"
+
+        # Short-lived cache of dashboard statistics; the "file" backend is shared by all local workers
+        self.stats_cache_enabled = os.getenv("STATS_CACHE_ENABLED", "true").lower() == "true"
+        self.stats_cache_ttl_seconds = float(os.getenv("STATS_CACHE_TTL_SECONDS", "5"))
+        self.stats_cache_backend = os.getenv("STATS_CACHE_BACKEND", "memory").lower()
+        self.stats_cache_dir = Path(os.getenv("STATS_CACHE_DIR", str(BASE_DIR / "stats_cache")))
+
+        # Live dashboard updates (/dashboard/stream)
+        self.dashboard_stream_heartbeat_seconds = float(os.getenv("DASHBOARD_STREAM_HEARTBEAT_SECONDS", "15"))
+        self.dashboard_stream_replay_size = int(os.getenv("DASHBOARD_STREAM_REPLAY_SIZE", "1000"))
+        self.dashboard_stream_queue_size = int(os.getenv("DASHBOARD_STREAM_QUEUE_SIZE", "1000"))
+
+
+settings = Settings()
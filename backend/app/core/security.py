@@ -4,11 +4,12 @@ from jose import JWTError, jwt
 import bcrypt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..database import get_db
+from ..database import get_async_db, get_db
 from .. import models, schemas
-from ..crud.user import user as user_crud
+from ..crud.user import user as user_crud, user_async as user_async_crud
 
 # Secret key for JWT encoding/decoding
 SECRET_KEY = "dataprojecthash"  # In production, use environment variable
@@ -52,26 +53,26 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> schemas.User:
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def _token_username(token: str) -> str:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
         if username is None:
-            raise credentials_exception
+            raise _credentials_exception()
     except JWTError:
-        raise credentials_exception
-    
-    user = user_crud.get_by_username(db, username=username)
+        raise _credentials_exception()
+    return username
+
+def _user_schema(user: Optional[models.User]) -> schemas.User:
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     
     # Convert SQLAlchemy model to Pydantic model using model_dump()
     # First convert the SQLAlchemy model to a dictionary
@@ -91,6 +92,21 @@ async def get_current_user(
     user_model = schemas.User(**user_dict)
     return user_model
 
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> schemas.User:
+    username = _token_username(token)
+    return _user_schema(user_crud.get_by_username(db, username=username))
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> schemas.User:
+    """Same as get_current_user, but looks the user up on the request's AsyncSession."""
+    username = _token_username(token)
+    return _user_schema(await user_async_crud.get_by_username(db, username=username))
+
 async def get_current_active_user(
     current_user: schemas.User = Depends(get_current_user)
 ):
@@ -98,6 +114,13 @@ async def get_current_active_user(
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
+async def get_current_active_user_async(
+    current_user: schemas.User = Depends(get_current_user_async)
+):
+    if not current_user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
+
 async def get_current_admin_user(
     current_user: schemas.User = Depends(get_current_user)
 ):
@@ -1,17 +1,25 @@
-from .base import CRUDBase
+from .base import AsyncCRUDBase, CRUDBase
 from .user import user as user_crud
 from .project import project as project_crud
-from .material import material as material_crud
-from .fitup import fitup as fitup_crud
-from .final_inspection import final_inspection as final_inspection_crud
-from .ndt_request import ndt_request as ndt_request_crud
+from .material import material as material_crud, material_async as material_async_crud
+from .fitup import fitup as fitup_crud, fitup_async as fitup_async_crud
+from .final_inspection import (
+    final_inspection as final_inspection_crud,
+    final_inspection_async as final_inspection_async_crud,
+)
+from .ndt_request import ndt_request as ndt_request_crud, ndt_request_async as ndt_request_async_crud
 
 __all__ = [
     "CRUDBase",
+    "AsyncCRUDBase",
     "user_crud",
     "project_crud",
     "material_crud",
     "fitup_crud",
     "final_inspection_crud",
-    "ndt_request_crud"
+    "ndt_request_crud",
+    "material_async_crud",
+    "fitup_async_crud",
+    "final_inspection_async_crud",
+    "ndt_request_async_crud"
 ]
@@ -1,9 +1,14 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, List, Optional, Tuple
 from ..models.audit_trail import AuditTrail
 from ..schemas.audit_trail import AuditTrailCreate, AuditTrailFilter
+from ..utils.pagination import keyset_select, split_page
 from datetime import datetime
 
+# Audit records are listed newest first
+AUDIT_SORT = "-created_at"
+
 class AuditTrailCRUD:
     def create(self, db: Session, audit_trail_in: AuditTrailCreate) -> AuditTrail:
         db_audit_trail = AuditTrail(**audit_trail_in.dict())
@@ -15,31 +20,49 @@ class AuditTrailCRUD:
     def get(self, db: Session, id: int) -> Optional[AuditTrail]:
         return db.query(AuditTrail).filter(AuditTrail.id == id).first()
 
-    def get_multi(
-        self, 
-        db: Session, 
-        skip: int = 0, 
-        limit: int = 100,
-        filters: Optional[AuditTrailFilter] = None
-    ) -> List[AuditTrail]:
-        query = db.query(AuditTrail)
-        
+    def _criteria(self, filters: Optional[AuditTrailFilter]) -> List[Any]:
+        criteria = []
         if filters:
             if filters.user_id:
-                query = query.filter(AuditTrail.user_id == filters.user_id)
+                criteria.append(AuditTrail.user_id == filters.user_id)
             if filters.action:
-                query = query.filter(AuditTrail.action == filters.action)
+                criteria.append(AuditTrail.action == filters.action)
             if filters.table_name:
-                query = query.filter(AuditTrail.table_name == filters.table_name)
+                criteria.append(AuditTrail.table_name == filters.table_name)
             if filters.record_id:
-                query = query.filter(AuditTrail.record_id == filters.record_id)
+                criteria.append(AuditTrail.record_id == filters.record_id)
             if filters.start_date:
-                query = query.filter(AuditTrail.created_at >= filters.start_date)
+                criteria.append(AuditTrail.created_at >= filters.start_date)
             if filters.end_date:
-                query = query.filter(AuditTrail.created_at <= filters.end_date)
-        
+                criteria.append(AuditTrail.created_at <= filters.end_date)
+        return criteria
+
+    def get_multi(
+        self, 
+        db: Session, 
+        skip: int = 0, 
+        limit: int = 100,
+        filters: Optional[AuditTrailFilter] = None
+    ) -> List[AuditTrail]:
+        query = db.query(AuditTrail).filter(*self._criteria(filters))
         return query.order_by(AuditTrail.created_at.desc()).offset(skip).limit(limit).all()
 
+    def get_page(
+        self,
+        db: Session,
+        filters: Optional[AuditTrailFilter] = None,
+        after: Optional[str] = None,
+        limit: int = 100
+    ) -> Tuple[List[AuditTrail], Optional[str]]:
+        """
+        Newest-first page of records using keyset pagination on (created_at, id),
+        and the cursor of the next page. Raises ValueError for an invalid cursor.
+        """
+        stmt = keyset_select(
+            select(AuditTrail).where(*self._criteria(filters)), AuditTrail, sort=AUDIT_SORT, after=after, limit=limit
+        )
+        return split_page(db.scalars(stmt).all(), sort=AUDIT_SORT, limit=limit)
+
     def get_by_user(self, db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[AuditTrail]:
         return db.query(AuditTrail).filter(AuditTrail.user_id == user_id).order_by(AuditTrail.created_at.desc()).offset(skip).limit(limit).all()
 
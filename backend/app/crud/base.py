@@ -1,15 +1,34 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import Any, Dict, Generic, Iterator, List, Optional, Sequence, Tuple, Type, TypeVar, Union
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ..database import Base
+from ..utils.pagination import keyset_select, order_by_sort, split_page
+from .filters import FilterField, filter_conditions
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+
+def _where(model: Any, criteria: Sequence[Any], filters: Dict[str, Any]):
+    """SELECT of `model` matching `criteria` and the non-None equality `filters`."""
+    conditions = [getattr(model, name) == value for name, value in filters.items() if value is not None]
+    return select(model).where(*criteria, *conditions)
+
+
+def _create_data(obj_in: Any) -> Dict[str, Any]:
+    # model_dump keeps date values as dates, which every driver accepts
+    return dict(obj_in) if isinstance(obj_in, dict) else obj_in.model_dump()
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    # Filters accepted by filter_conditions(); see crud/filters.py
+    filter_fields: Dict[str, FilterField] = {}
+
     def __init__(self, model: Type[ModelType]):
         """
         CRUD object with default methods to Create, Read, Update, Delete (CRUD).
@@ -22,11 +41,123 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def get(self, db: Session, id: Any) -> Optional[ModelType]:
         return db.query(self.model).filter(self.model.id == id).first()
 
+    def get_many(
+        self,
+        db: Session,
+        ids: Sequence[Any],
+        *,
+        columns: Optional[Sequence[str]] = None,
+        chunk_size: int = 500
+    ) -> List[Any]:
+        """
+        Load many records by primary key with one `IN` query per `chunk_size` ids.
+        Results follow the order of `ids`; unknown ids are skipped.
+        With `columns`, only `id` and those attributes are selected and each record
+        is returned as a dict instead of a model instance.
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        found: Dict[Any, Any] = {}
+        for start in range(0, len(unique_ids), chunk_size):
+            id_chunk = unique_ids[start:start + chunk_size]
+            if columns:
+                stmt = select(
+                    self.model.id, *[getattr(self.model, name) for name in columns if name != "id"]
+                ).where(self.model.id.in_(id_chunk))
+                for row in db.execute(stmt):
+                    found[row.id] = dict(row._mapping)
+            else:
+                for obj in db.query(self.model).filter(self.model.id.in_(id_chunk)):
+                    found[obj.id] = obj
+        return [found[id] for id in ids if id in found]
+
     def get_multi(
         self, db: Session, *, skip: int = 0, limit: int = 100
     ) -> List[ModelType]:
         return db.query(self.model).offset(skip).limit(limit).all()
 
+    def get_multi_where(
+        self, db: Session, *criteria: Any, skip: int = 0, limit: int = 100, sort: Optional[str] = None
+    ) -> List[ModelType]:
+        stmt = select(self.model).where(*criteria)
+        if sort:
+            stmt = order_by_sort(stmt, self.model, sort)
+        return list(db.scalars(stmt.offset(skip).limit(limit)).all())
+
+    def get_page(
+        self,
+        db: Session,
+        *criteria: Any,
+        after: Optional[str] = None,
+        limit: int = 100,
+        sort: str = "id",
+        **filters: Any
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """
+        One page of records in (sort key, id) order using keyset pagination, and
+        the cursor of the next page (None on the last page). `criteria` are
+        SQLAlchemy conditions; `filters` are column equality tests, skipped when
+        None. Raises ValueError for an invalid `after` cursor or `sort`.
+        """
+        stmt = keyset_select(_where(self.model, criteria, filters), self.model, sort=sort, after=after, limit=limit)
+        return split_page(db.scalars(stmt).all(), sort=sort, limit=limit)
+
+    def filter_conditions(self, filters: Any) -> List[Any]:
+        """Conditions for the set fields of a filter schema, to pass to get_page()."""
+        return filter_conditions(self.model, self.filter_fields, filters)
+
+    def count(self, db: Session) -> int:
+        return db.query(func.count(self.model.id)).scalar()
+
+    def iter_chunks(
+        self,
+        db: Session,
+        *,
+        chunk_size: int = 1000,
+        columns: Optional[Sequence[str]] = None
+    ) -> Iterator[List[Any]]:
+        """
+        Iterate over the whole table in primary key order, one chunk at a time.
+        Uses keyset pagination (`id > last_id`) rather than OFFSET, and expunges each
+        chunk from the session once the caller moves on, so memory stays bounded.
+        With `columns`, only those attributes are selected and each record is a
+        plain tuple in `columns` order; no model instances are built.
+        """
+        if columns:
+            yield from self._iter_column_chunks(db, columns, chunk_size)
+            return
+
+        last_id = None
+        while True:
+            query = db.query(self.model)
+            if last_id is not None:
+                query = query.filter(self.model.id > last_id)
+            chunk = query.order_by(self.model.id).limit(chunk_size).all()
+            if not chunk:
+                return
+            last_id = chunk[-1].id
+            yield chunk
+            for obj in chunk:
+                db.expunge(obj)
+            if len(chunk) < chunk_size:
+                return
+
+    def _iter_column_chunks(
+        self, db: Session, columns: Sequence[str], chunk_size: int
+    ) -> Iterator[List[tuple]]:
+        stmt = select(self.model.id, *[getattr(self.model, name) for name in columns])
+        last_id = None
+        while True:
+            page = stmt
+            if last_id is not None:
+                page = page.where(self.model.id > last_id)
+            rows = db.execute(page.order_by(self.model.id).limit(chunk_size)).all()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield [tuple(row[1:]) for row in rows]
+            if len(rows) < chunk_size:
+                return
+
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         obj_in_data = jsonable_encoder(obj_in)
         db_obj = self.model(**obj_in_data)
@@ -35,6 +166,67 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.refresh(db_obj)
         return db_obj
 
+    def create_many(
+        self,
+        db: Session,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        *,
+        chunk_size: int = 500,
+        **values: Any
+    ) -> List[int]:
+        """
+        Insert many records in one transaction and return their ids in input order.
+        `values` (e.g. created_by) are set on every record. Each chunk of
+        `chunk_size` records is flushed as batched multi-row INSERTs; nothing is
+        committed unless every record is inserted. The session listeners
+        (counters, cache invalidation, change events) see the records as usual.
+        """
+        ids: List[int] = []
+        try:
+            for start in range(0, len(objs_in), chunk_size):
+                chunk = [
+                    self.model(**{**_create_data(obj_in), **values})
+                    for obj_in in objs_in[start:start + chunk_size]
+                ]
+                db.add_all(chunk)
+                db.flush()
+                ids.extend(obj.id for obj in chunk)
+                for obj in chunk:
+                    db.expunge(obj)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return ids
+
+    def update_many(
+        self,
+        db: Session,
+        updates: Sequence[Tuple[Any, Union[UpdateSchemaType, Dict[str, Any]]]],
+        *,
+        chunk_size: int = 500
+    ) -> List[ModelType]:
+        """
+        Apply partial updates, given as (id, changes) pairs, to many records in one
+        transaction. Only the fields set in `changes` are written. Raises
+        LookupError naming the unknown ids before anything is changed.
+        """
+        ids = [id for id, _ in updates]
+        records = {obj.id: obj for obj in self.get_many(db, ids, chunk_size=chunk_size)}
+        missing = [id for id in dict.fromkeys(ids) if id not in records]
+        if missing:
+            raise LookupError(f"{self.model.__name__} not found: {', '.join(map(str, missing))}")
+        try:
+            for id, obj_in in updates:
+                update_data = obj_in if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
+                for field, value in update_data.items():
+                    setattr(records[id], field, value)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return [records[id] for id in dict.fromkeys(ids)]
+
     def update(
         self,
         db: Session,
@@ -60,3 +252,64 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.delete(obj)
         db.commit()
         return obj
+
+
+class AsyncCRUDBase(Generic[ModelType]):
+    # Filters accepted by filter_conditions(); see crud/filters.py
+    filter_fields: Dict[str, FilterField] = {}
+
+    def __init__(self, model: Type[ModelType]):
+        """
+        Read-only CRUD object for AsyncSession, mirroring the read methods of
+        CRUDBase. Writes still go through CRUDBase so the session event
+        listeners (counters, cache invalidation, change events) keep one path.
+        **Parameters**
+        * `model`: A SQLAlchemy model class
+        """
+        self.model = model
+
+    async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        return await db.get(self.model, id)
+
+    async def get_many(self, db: AsyncSession, ids: Sequence[Any], *, chunk_size: int = 500) -> List[ModelType]:
+        """Like CRUDBase.get_many: one `IN` query per chunk, results in the order of `ids`."""
+        unique_ids = list(dict.fromkeys(ids))
+        found: Dict[Any, ModelType] = {}
+        for start in range(0, len(unique_ids), chunk_size):
+            stmt = select(self.model).where(self.model.id.in_(unique_ids[start:start + chunk_size]))
+            for obj in (await db.scalars(stmt)).all():
+                found[obj.id] = obj
+        return [found[id] for id in ids if id in found]
+
+    async def get_multi(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+    ) -> List[ModelType]:
+        return await self.get_multi_where(db, skip=skip, limit=limit)
+
+    async def get_multi_where(
+        self, db: AsyncSession, *criteria: Any, skip: int = 0, limit: int = 100, sort: Optional[str] = None
+    ) -> List[ModelType]:
+        stmt = select(self.model).where(*criteria)
+        if sort:
+            stmt = order_by_sort(stmt, self.model, sort)
+        return list((await db.scalars(stmt.offset(skip).limit(limit))).all())
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *criteria: Any,
+        after: Optional[str] = None,
+        limit: int = 100,
+        sort: str = "id",
+        **filters: Any
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """Like CRUDBase.get_page."""
+        stmt = keyset_select(_where(self.model, criteria, filters), self.model, sort=sort, after=after, limit=limit)
+        return split_page((await db.scalars(stmt)).all(), sort=sort, limit=limit)
+
+    def filter_conditions(self, filters: Any) -> List[Any]:
+        """Like CRUDBase.filter_conditions."""
+        return filter_conditions(self.model, self.filter_fields, filters)
+
+    async def count(self, db: AsyncSession) -> int:
+        return await db.scalar(select(func.count(self.model.id)))
@@ -0,0 +1,82 @@
+"""
+Composable list filters.
+
+A CRUD class declares the filters it supports in `filter_fields`, mapping each
+filter name to the model column it narrows and an operator. The values come
+from a filter schema (e.g. schemas.FitupFilter) bound to the query string:
+every value that is set adds one condition, and the conditions are ANDed, so
+any combination is applied by the database.
+"""
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Union
+
+from pydantic import BaseModel
+
+
+class FilterField(NamedTuple):
+    column: str
+    op: str = "eq"
+
+
+def _split(value: Any) -> List[str]:
+    return [part.strip() for part in str(value).split(",") if part.strip()]
+
+
+def _in(column, value):
+    values = _split(value)
+    return column == values[0] if len(values) == 1 else column.in_(values)
+
+
+def _approval(column, value):
+    # Same labels as the dashboard statistics: NULL is pending, False rejected
+    if value == "pending":
+        return column.is_(None)
+    return column == (value == "approved")
+
+
+OPERATORS: Dict[str, Callable[[Any, Any], Any]] = {
+    "eq": lambda column, value: column == value,
+    # Comma-separated alternatives: "pending,approved"
+    "in": _in,
+    "gte": lambda column, value: column >= value,
+    "lte": lambda column, value: column <= value,
+    # "approved", "rejected" or "pending" on an is_approved column
+    "approval": _approval,
+}
+
+
+def filter_conditions(
+    model: Any,
+    fields: Dict[str, FilterField],
+    filters: Optional[Union[BaseModel, Dict[str, Any]]]
+) -> List[Any]:
+    """SQLAlchemy conditions for the filters that are set; raises ValueError for an unsupported filter."""
+    if filters is None:
+        return []
+    values = filters.model_dump(exclude_none=True) if isinstance(filters, BaseModel) else filters
+    conditions = []
+    for name, value in values.items():
+        if value is None:
+            continue
+        if name not in fields:
+            raise ValueError(f"Unsupported filter: {name}")
+        field = fields[name]
+        if field.op == "in" and not _split(value):
+            continue
+        conditions.append(OPERATORS[field.op](getattr(model, field.column), value))
+    return conditions
+
+
+# Filters shared by the inspection tables
+COMMON_FILTERS = {
+    "project_id": FilterField("project_id"),
+    "status": FilterField("status", "in"),
+    "created_from": FilterField("created_at", "gte"),
+    "created_to": FilterField("created_at", "lte"),
+}
+
+# Joint identification, for the tables recording welds
+JOINT_FILTERS = {
+    "line_no": FilterField("line_no"),
+    "spool_no": FilterField("spool_no"),
+    "joint_no": FilterField("joint_no"),
+}
@@ -1,12 +1,27 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
-from .base import CRUDBase
+from .base import AsyncCRUDBase, CRUDBase
+from .filters import COMMON_FILTERS, JOINT_FILTERS, FilterField
 from ..models.final_inspection import FinalInspection
 from ..schemas.final_inspection import FinalInspectionCreate, FinalInspectionUpdate
 
 
+# Query-string filters of the list endpoint (schemas.FinalInspectionFilter)
+FINAL_INSPECTION_FILTERS = {
+    **COMMON_FILTERS,
+    **JOINT_FILTERS,
+    "approval": FilterField("is_approved", "approval"),
+    "welder_no": FilterField("welder_no"),
+    "inspection_from": FilterField("final_inspection_date", "gte"),
+    "inspection_to": FilterField("final_inspection_date", "lte"),
+}
+
+
 class CRUDFinalInspection(CRUDBase[FinalInspection, FinalInspectionCreate, FinalInspectionUpdate]):
+    filter_fields = FINAL_INSPECTION_FILTERS
+
     def get_by_project(self, db: Session, project_id: int, skip: int = 0, limit: int = 100) -> list[FinalInspection]:
         return db.query(FinalInspection).filter(FinalInspection.project_id == project_id).offset(skip).limit(limit).all()
 
@@ -15,3 +30,16 @@ class CRUDFinalInspection(CRUDBase[FinalInspection, FinalInspectionCreate, Final
 
 
 final_inspection = CRUDFinalInspection(FinalInspection)
+
+
+class AsyncCRUDFinalInspection(AsyncCRUDBase[FinalInspection]):
+    filter_fields = FINAL_INSPECTION_FILTERS
+
+    async def get_by_project(self, db: AsyncSession, project_id: int, skip: int = 0, limit: int = 100) -> list[FinalInspection]:
+        return await self.get_multi_where(db, FinalInspection.project_id == project_id, skip=skip, limit=limit)
+
+    async def get_by_status(self, db: AsyncSession, status: str, skip: int = 0, limit: int = 100) -> list[FinalInspection]:
+        return await self.get_multi_where(db, FinalInspection.status == status, skip=skip, limit=limit)
+
+
+final_inspection_async = AsyncCRUDFinalInspection(FinalInspection)
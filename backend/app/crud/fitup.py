@@ -1,12 +1,26 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
-from .base import CRUDBase
+from .base import AsyncCRUDBase, CRUDBase
+from .filters import COMMON_FILTERS, JOINT_FILTERS, FilterField
 from ..models.fitup import Fitup
 from ..schemas.fitup import FitupCreate, FitupUpdate
 
 
+# Query-string filters of the list endpoint (schemas.FitupFilter)
+FITUP_FILTERS = {
+    **COMMON_FILTERS,
+    **JOINT_FILTERS,
+    "approval": FilterField("is_approved", "approval"),
+    "inspection_from": FilterField("fitup_inspection_date", "gte"),
+    "inspection_to": FilterField("fitup_inspection_date", "lte"),
+}
+
+
 class CRUDFitup(CRUDBase[Fitup, FitupCreate, FitupUpdate]):
+    filter_fields = FITUP_FILTERS
+
     def get_by_project(self, db: Session, project_id: int, skip: int = 0, limit: int = 100) -> list[Fitup]:
         return db.query(Fitup).filter(Fitup.project_id == project_id).offset(skip).limit(limit).all()
 
@@ -18,3 +32,16 @@ class CRUDFitup(CRUDBase[Fitup, FitupCreate, FitupUpdate]):
 
 
 fitup = CRUDFitup(Fitup)
+
+
+class AsyncCRUDFitup(AsyncCRUDBase[Fitup]):
+    filter_fields = FITUP_FILTERS
+
+    async def get_by_project(self, db: AsyncSession, project_id: int, skip: int = 0, limit: int = 100) -> list[Fitup]:
+        return await self.get_multi_where(db, Fitup.project_id == project_id, skip=skip, limit=limit)
+
+    async def get_by_status(self, db: AsyncSession, status: str, skip: int = 0, limit: int = 100) -> list[Fitup]:
+        return await self.get_multi_where(db, Fitup.status == status, skip=skip, limit=limit)
+
+
+fitup_async = AsyncCRUDFitup(Fitup)
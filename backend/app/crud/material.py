@@ -1,12 +1,26 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
-from .base import CRUDBase
+from .base import AsyncCRUDBase, CRUDBase
+from .filters import COMMON_FILTERS, FilterField
 from ..models.material import Material
 from ..schemas.material import MaterialCreate, MaterialUpdate
 
 
+# Query-string filters of the list endpoint (schemas.MaterialFilter)
+MATERIAL_FILTERS = {
+    **COMMON_FILTERS,
+    "material_type": FilterField("material_type", "in"),
+    "heat_no": FilterField("heat_no"),
+    "inspection_from": FilterField("material_inspection_date", "gte"),
+    "inspection_to": FilterField("material_inspection_date", "lte"),
+}
+
+
 class CRUDMaterial(CRUDBase[Material, MaterialCreate, MaterialUpdate]):
+    filter_fields = MATERIAL_FILTERS
+
     def get_by_project(self, db: Session, project_id: int, skip: int = 0, limit: int = 100) -> list[Material]:
         return db.query(Material).filter(Material.project_id == project_id).offset(skip).limit(limit).all()
 
@@ -15,3 +29,16 @@ class CRUDMaterial(CRUDBase[Material, MaterialCreate, MaterialUpdate]):
 
 
 material = CRUDMaterial(Material)
+
+
+class AsyncCRUDMaterial(AsyncCRUDBase[Material]):
+    filter_fields = MATERIAL_FILTERS
+
+    async def get_by_project(self, db: AsyncSession, project_id: int, skip: int = 0, limit: int = 100) -> list[Material]:
+        return await self.get_multi_where(db, Material.project_id == project_id, skip=skip, limit=limit)
+
+    async def get_by_status(self, db: AsyncSession, status: str, skip: int = 0, limit: int = 100) -> list[Material]:
+        return await self.get_multi_where(db, Material.status == status, skip=skip, limit=limit)
+
+
+material_async = AsyncCRUDMaterial(Material)
@@ -1,12 +1,27 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
-from .base import CRUDBase
+from .base import AsyncCRUDBase, CRUDBase
+from .filters import COMMON_FILTERS, JOINT_FILTERS, FilterField
 from ..models.ndt_request import NDTRequest
 from ..schemas.ndt_request import NDTRequestCreate, NDTRequestUpdate
 
 
+# Query-string filters of the list endpoint (schemas.NDTRequestFilter)
+NDT_REQUEST_FILTERS = {
+    **COMMON_FILTERS,
+    **JOINT_FILTERS,
+    "welder_no": FilterField("welder_no"),
+    "ndt_method": FilterField("ndt_method", "in"),
+    "requested_from": FilterField("ndt_request_date", "gte"),
+    "requested_to": FilterField("ndt_request_date", "lte"),
+}
+
+
 class CRUDNDTRequest(CRUDBase[NDTRequest, NDTRequestCreate, NDTRequestUpdate]):
+    filter_fields = NDT_REQUEST_FILTERS
+
     def get_by_project(self, db: Session, project_id: int, skip: int = 0, limit: int = 100) -> list[NDTRequest]:
         return db.query(NDTRequest).filter(NDTRequest.project_id == project_id).offset(skip).limit(limit).all()
 
@@ -18,3 +33,19 @@ class CRUDNDTRequest(CRUDBase[NDTRequest, NDTRequestCreate, NDTRequestUpdate]):
 
 
 ndt_request = CRUDNDTRequest(NDTRequest)
+
+
+class AsyncCRUDNDTRequest(AsyncCRUDBase[NDTRequest]):
+    filter_fields = NDT_REQUEST_FILTERS
+
+    async def get_by_project(self, db: AsyncSession, project_id: int, skip: int = 0, limit: int = 100) -> list[NDTRequest]:
+        return await self.get_multi_where(db, NDTRequest.project_id == project_id, skip=skip, limit=limit)
+
+    async def get_by_status(self, db: AsyncSession, status: str, skip: int = 0, limit: int = 100) -> list[NDTRequest]:
+        return await self.get_multi_where(db, NDTRequest.status == status, skip=skip, limit=limit)
+
+    async def get_by_ndt_method(self, db: AsyncSession, ndt_method: str, skip: int = 0, limit: int = 100) -> list[NDTRequest]:
+        return await self.get_multi_where(db, NDTRequest.ndt_method == ndt_method, skip=skip, limit=limit)
+
+
+ndt_request_async = AsyncCRUDNDTRequest(NDTRequest)
@@ -1,6 +1,6 @@
 from sqlalchemy.orm import Session
 from typing import Optional, Dict, Any
-from sqlalchemy import or_
+from sqlalchemy import exists, or_
 
 from .base import CRUDBase
 from ..models.project import Project
@@ -43,5 +43,38 @@ class CRUDProject(CRUDBase[Project, ProjectCreate, ProjectUpdate]):
             UserProjectAssignment.is_active == True
         ).offset(skip).limit(limit).all()
 
+    def visible_to(self, user_id: int):
+        """
+        Condition matching the projects get_projects_by_user returns for a user,
+        written as EXISTS so it can be combined with get_page.
+        """
+        return exists().where(
+            UserProjectAssignment.project_id == Project.id,
+            UserProjectAssignment.is_active == True,
+            or_(
+                UserProjectAssignment.user_id == user_id,
+                Project.created_by == user_id
+            )
+        )
+
+    def get_project_ids(self, db: Session, user_id: Optional[int] = None) -> list[int]:
+        """
+        Ids of all projects, or of the projects a user can see (same rules as
+        get_projects_by_user) when user_id is given.
+        """
+        query = db.query(Project.id)
+        if user_id is not None:
+            query = query.join(
+                UserProjectAssignment,
+                UserProjectAssignment.project_id == Project.id
+            ).filter(
+                or_(
+                    UserProjectAssignment.user_id == user_id,
+                    Project.created_by == user_id
+                ),
+                UserProjectAssignment.is_active == True
+            ).distinct()
+        return [project_id for project_id, in query.order_by(Project.id)]
+
 
 project = CRUDProject(Project)
@@ -1,7 +1,9 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
-from .base import CRUDBase
+from .base import AsyncCRUDBase, CRUDBase
 from ..models.user import User
 from ..schemas.user import UserCreate, UserUpdate
 
@@ -47,3 +49,11 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
 
 
 user = CRUDUser(User)
+
+
+class AsyncCRUDUser(AsyncCRUDBase[User]):
+    async def get_by_username(self, db: AsyncSession, username: str) -> Optional[User]:
+        return await db.scalar(select(User).where(User.username == username).limit(1))
+
+
+user_async = AsyncCRUDUser(User)
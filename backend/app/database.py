@@ -1,21 +1,271 @@
-from sqlalchemy import create_engine
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-import os
-from dotenv import load_dotenv
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
-load_dotenv()
+from .core.config import settings
+from .utils.query_stats import instrument as instrument_queries
 
-# Force SQLite for testing since Docker is not available
-SQLALCHEMY_DATABASE_URL = "sqlite:///./fabrication_app.db"
+logger = logging.getLogger(__name__)
 
-# Use check_same_thread for SQLite
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False}  # Needed for SQLite
-)
+
+class PoolMetrics:
+    """Connection pool counters, exposed by GET /health/db."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def increment(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+                "wait_seconds_avg": round(self.wait_seconds_total / self.checkouts, 6) if self.checkouts else 0.0,
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class _CheckoutTimer:
+    """Pool mixin that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+
+class InstrumentedQueuePool(_CheckoutTimer, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimer, AsyncAdaptedQueuePool):
+    pass
+
+
+# Async driver used for each backend when ASYNC_DATABASE_URL is not set
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def async_database_url(url) -> str:
+    """DATABASE_URL with its driver swapped for the asyncio one (sqlite -> aiosqlite, postgresql -> asyncpg)."""
+    url = make_url(url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver and url.get_driver_name() != driver:
+        url = url.set(drivername=f"{url.get_backend_name()}+{driver}")
+    return url.render_as_string(hide_password=False)
+
+
+def _is_sqlite_file(url) -> bool:
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+def sqlite_pragmas() -> List[str]:
+    """Statements run on every new connection when SQLITE_PERFORMANCE_PROFILE is on."""
+    return [
+        # Readers no longer block on writers (and vice versa); persists in the database file
+        "PRAGMA journal_mode=WAL",
+        # Safe with WAL: a power loss can only lose the last commits, never corrupt the file
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA cache_size=-{settings.sqlite_cache_size_kb}",
+        f"PRAGMA mmap_size={settings.sqlite_mmap_size}",
+        # Wait for a competing writer instead of failing with "database is locked"
+        f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}",
+        f"PRAGMA journal_size_limit={settings.sqlite_journal_size_limit}",
+        "PRAGMA foreign_keys=ON",
+    ]
+
+
+def _apply_sqlite_profile(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in sqlite_pragmas():
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+class WalCheckpointer:
+    """
+    Background thread running PRAGMA wal_checkpoint(PASSIVE) every `interval`
+    seconds, so the WAL is folded back into the database between bursts of writes
+    instead of by whichever request happens to commit past the auto-checkpoint size.
+    """
+
+    def __init__(self, target: Engine, interval: float):
+        self.engine = target
+        self.interval = interval
+        self.checkpoints = 0
+        self.last_result: Optional[Dict[str, Any]] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def checkpoint(self) -> Dict[str, Any]:
+        with self.engine.connect() as connection:
+            busy, wal_pages, checkpointed = connection.exec_driver_sql("PRAGMA wal_checkpoint(PASSIVE)").one()
+        self.checkpoints += 1
+        self.last_result = {
+            "at": time.time(), "busy": bool(busy), "wal_pages": wal_pages, "checkpointed_pages": checkpointed
+        }
+        return self.last_result
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.checkpoint()
+            except Exception:
+                logger.exception("SQLite WAL checkpoint failed")
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="sqlite-wal-checkpoint", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def status(self) -> Dict[str, Any]:
+        return {"interval_seconds": self.interval, "checkpoints": self.checkpoints, "last": self.last_result}
+
+
+def engine_options(url) -> Dict[str, Any]:
+    """
+    create_engine() arguments for `url` from the DB_POOL_* settings. In-memory
+    SQLite keeps SQLAlchemy's default single-connection pool.
+    """
+    url = make_url(url)
+    is_async = url.get_dialect().is_async
+    options: Dict[str, Any] = {"pool_pre_ping": settings.db_pool_pre_ping}
+    connect_args: Dict[str, Any] = {}
+
+    if url.get_backend_name() == "sqlite":
+        connect_args["check_same_thread"] = False  # Sessions are used from the threadpool
+    elif settings.db_statement_timeout_ms and url.get_backend_name() == "postgresql":
+        if url.get_driver_name() == "asyncpg":
+            connect_args["server_settings"] = {"statement_timeout": str(settings.db_statement_timeout_ms)}
+        else:
+            connect_args["options"] = f"-c statement_timeout={settings.db_statement_timeout_ms}"
+    options["connect_args"] = connect_args
+
+    if url.get_backend_name() != "sqlite" or _is_sqlite_file(url):
+        options.update(
+            poolclass=InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+        )
+    return options
+
+
+def make_engine(url: Optional[str] = None) -> Engine:
+    """
+    Create the engine for DATABASE_URL (or `url`), counting pool activity in
+    pool_metrics. File-based SQLite gets the SQLITE_PERFORMANCE_PROFILE pragmas.
+    """
+    url = url or settings.database_url
+    new_engine = create_engine(url, **engine_options(url))
+    _instrument(new_engine, url)
+    return new_engine
+
+
+def make_async_engine(url: Optional[str] = None) -> AsyncEngine:
+    """
+    Create the asyncio engine for ASYNC_DATABASE_URL, or DATABASE_URL with its
+    async driver. Same pool settings, counters and SQLite profile as make_engine().
+    """
+    url = url or settings.async_database_url or async_database_url(settings.database_url)
+    new_engine = create_async_engine(url, **engine_options(url))
+    _instrument(new_engine.sync_engine, url)
+    return new_engine
+
+
+def _instrument(new_engine: Engine, url):
+    for pool_event, counter in (
+        ("connect", "connects"),
+        ("checkout", "checkouts"),
+        ("checkin", "checkins"),
+        ("invalidate", "invalidations"),
+    ):
+        event.listen(new_engine, pool_event, lambda *args, _counter=counter: pool_metrics.increment(_counter))
+    if settings.sqlite_performance_profile and _is_sqlite_file(url):
+        event.listen(new_engine, "connect", _apply_sqlite_profile)
+    instrument_queries(new_engine)
+
+
+def pool_status(target: Optional[Engine] = None) -> Dict[str, Any]:
+    """Current pool occupancy plus the cumulative checkout/wait counters."""
+    pool = (target or engine).pool
+    status = {"class": type(pool).__name__, **pool_metrics.snapshot()}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+            max_overflow=settings.db_max_overflow,
+        )
+    return status
+
+
+engine = make_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Used by the read-only endpoints that run on the event loop instead of the threadpool.
+# Objects stay loaded after commit, since lazy loads are not possible outside an await.
+async_engine = make_async_engine()
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Started and stopped with the application (see main.py)
+sqlite_checkpointer = (
+    WalCheckpointer(engine, settings.sqlite_checkpoint_interval_seconds)
+    if settings.sqlite_performance_profile and _is_sqlite_file(engine.url)
+    and settings.sqlite_checkpoint_interval_seconds > 0
+    else None
+)
+
 Base = declarative_base()
 
 def get_db():
@@ -27,3 +277,10 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    """
+    Dependency function that yields an asyncio database session.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
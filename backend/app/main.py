@@ -1,11 +1,15 @@
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from .routers import auth, user, projects, material, fitup, final, ndt, export, dashboard, audit_trail
-from .database import engine, Base
-import logging
+from .routers import auth, user, projects, material, fitup, final, ndt, export, dashboard, audit_trail, imports
+from .database import async_engine, engine, Base, pool_status, sqlite_checkpointer
+from .utils.query_stats import QueryStatsMiddleware, configure_slow_query_log
+from .core.security import get_current_admin_user
+from . import schemas
 
-# 创建数据库表
-Base.metadata.create_all(bind=engine)
+# 创建数据库表 (SQLite development databases only; other databases get their
+# schema from `alembic upgrade head` before the app starts)
+if engine.dialect.name == "sqlite":
+    Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="Industrial Inspection Platform API",
@@ -19,7 +23,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Lets the frontend read the cursor of the next page of a list
+    expose_headers=["X-Next-Cursor"],
 )
+# Per-request statement count and DB time (Server-Timing header, log line, slow-query log)
+configure_slow_query_log()
+app.add_middleware(QueryStatsMiddleware)
 
 # 包含路由
 app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
@@ -30,9 +39,24 @@ app.include_router(fitup.router, prefix="/fitup", tags=["Fitup Inspection"])
 app.include_router(final.router, prefix="/final", tags=["Final Inspection"])
 app.include_router(ndt.router, prefix="/ndt", tags=["NDT Requests"])
 app.include_router(export.router, prefix="/export", tags=["Export"])
+app.include_router(imports.router, prefix="/import", tags=["Import"])
 app.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboard"])
 app.include_router(audit_trail.router, prefix="/audit", tags=["Audit Trail"])
 
+@app.on_event("startup")
+def start_sqlite_checkpointer():
+    if sqlite_checkpointer:
+        sqlite_checkpointer.start()
+
+@app.on_event("shutdown")
+def stop_sqlite_checkpointer():
+    if sqlite_checkpointer:
+        sqlite_checkpointer.stop()
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    await async_engine.dispose()
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to Industrial Inspection Platform API"}
@@ -41,6 +65,19 @@ def read_root():
 def health_check():
     return {"status": "healthy"}
 
+@app.get("/health/db")
+def database_health(current_user: schemas.User = Depends(get_current_admin_user)):
+    """Connection pool occupancy and checkout/wait counters (admin only)"""
+    health = {
+        "status": "healthy",
+        "dialect": engine.dialect.name,
+        "pool": pool_status(),
+        "async_pool": pool_status(async_engine.sync_engine),
+    }
+    if sqlite_checkpointer:
+        health["sqlite_checkpoints"] = sqlite_checkpointer.status()
+    return health
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
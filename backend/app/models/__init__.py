@@ -5,6 +5,9 @@ from .fitup import Fitup
 from .final_inspection import FinalInspection
 from .ndt_request import NDTRequest
 from .user_project_assignment import UserProjectAssignment
+from .table_version import TableVersion
+from .dashboard_counter import DashboardCounter
+from .audit_trail import AuditTrail
 
 __all__ = [
     "User",
@@ -13,5 +16,8 @@ __all__ = [
     "Fitup",
     "FinalInspection",
     "NDTRequest",
-    "UserProjectAssignment"
+    "UserProjectAssignment",
+    "TableVersion",
+    "DashboardCounter",
+    "AuditTrail"
 ]
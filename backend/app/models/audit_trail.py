@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON, Index
 from sqlalchemy.sql import func
 from ..database import Base
 from datetime import datetime
@@ -27,5 +27,12 @@ class AuditTrail(Base):
     user_agent = Column(String(255), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    # History of one record, a user's activity, and the newest-first listing
+    __table_args__ = (
+        Index("ix_audit_trail_record", "table_name", "record_id", "created_at"),
+        Index("ix_audit_trail_user_created_at", "user_id", "created_at"),
+        Index("ix_audit_trail_created_at", "created_at"),
+    )
+
     def __repr__(self):
         return f"<AuditTrail {self.action} {self.table_name} {self.record_id} by user {self.user_id}>"
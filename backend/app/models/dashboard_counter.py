@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, Date
+from ..database import Base
+
+class DashboardCounter(Base):
+    __tablename__ = "dashboard_counters"
+
+    # Row counts per project x entity x status x approval x creation day, maintained in the
+    # same transaction as every insert/update/delete (see utils/dashboard_counters.py).
+    # NULL statuses and entities without approval are stored as "" so every key column is non-null.
+    project_id = Column(Integer, primary_key=True)
+    entity = Column(String(30), primary_key=True)
+    status = Column(String(50), primary_key=True)
+    approval = Column(String(10), primary_key=True)
+    day = Column(Date, primary_key=True)
+    count = Column(Integer, default=0, nullable=False)
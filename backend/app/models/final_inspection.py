@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Text, Boolean
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Text, Boolean, Index, text
+from sqlalchemy.orm import mapped_column
 from sqlalchemy.sql import func
 from ..database import Base
 from datetime import date
@@ -7,7 +8,9 @@ class FinalInspection(Base):
     __tablename__ = "final_inspections"
 
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    # Columns mapped with active_history keep the value a changed row had before,
+    # which the dashboard counters need to move it to its new counter
+    project_id = mapped_column(Integer, ForeignKey("projects.id"), nullable=False, active_history=True)
     drawing_no = Column(String(100))
     line_no = Column(String(50))
     spool_no = Column(String(50))
@@ -29,11 +32,26 @@ class FinalInspection(Base):
     final_inspection_date = Column(Date)
     final_report_no = Column(String(100))
     final_result = Column(String(20))
-    status = Column(String(20), default="pending")
-    is_approved = Column(Boolean, default=False)
+    status = mapped_column(String(20), default="pending", active_history=True)
+    is_approved = mapped_column(Boolean, default=False, active_history=True)
     approved_by = Column(Integer, ForeignKey("users.id"))
     approved_at = Column(Date)
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     updated_by = Column(Integer, ForeignKey("users.id"))
-    created_at = Column(Date, default=date.today, nullable=False)
+    created_at = mapped_column(Date, default=date.today, nullable=False, index=True, active_history=True)
     updated_at = Column(Date, default=date.today, onupdate=date.today, nullable=False)
+
+    # Lookups by project (list pages, dashboard filters, trends) and by joint, plus status filters
+    __table_args__ = (
+        Index("ix_final_inspections_project_status", "project_id", "status"),
+        Index("ix_final_inspections_project_created_at", "project_id", "created_at"),
+        Index("ix_final_inspections_project_joint", "project_id", "line_no", "spool_no", "joint_no"),
+        Index("ix_final_inspections_status", "status"),
+        # Welder filter of the list endpoint
+        Index("ix_final_inspections_welder_no", "welder_no"),
+        # Records awaiting approval; approved and rejected ones are not indexed
+        Index(
+            "ix_final_inspections_pending_approval", "project_id",
+            postgresql_where=text("is_approved IS NULL"), sqlite_where=text("is_approved IS NULL")
+        ),
+    )
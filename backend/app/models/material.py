@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Text, Index
+from sqlalchemy.orm import mapped_column
 from sqlalchemy.sql import func
 from ..database import Base
 from datetime import date
@@ -7,7 +8,9 @@ class Material(Base):
     __tablename__ = "materials"
 
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    # Columns mapped with active_history keep the value a changed row had before,
+    # which the dashboard counters need to move it to its new counter
+    project_id = mapped_column(Integer, ForeignKey("projects.id"), nullable=False, active_history=True)
     material_type = Column(String(50), nullable=False)
     material_grade = Column(String(50))
     thickness = Column(Float)
@@ -16,8 +19,15 @@ class Material(Base):
     material_inspection_date = Column(Date)
     material_inspection_result = Column(String(20))
     material_report_no = Column(String(100))
-    status = Column(String(20), default="pending")
+    status = mapped_column(String(20), default="pending", active_history=True)
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     updated_by = Column(Integer, ForeignKey("users.id"))
-    created_at = Column(Date, default=date.today, nullable=False)
+    created_at = mapped_column(Date, default=date.today, nullable=False, index=True, active_history=True)
     updated_at = Column(Date, default=date.today, onupdate=date.today, nullable=False)
+
+    # Lookups by project (list pages, dashboard filters, trends), plus status filters
+    __table_args__ = (
+        Index("ix_materials_project_status", "project_id", "status"),
+        Index("ix_materials_project_created_at", "project_id", "created_at"),
+        Index("ix_materials_status", "status"),
+    )
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Text, Boolean
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Text, Boolean, Index
+from sqlalchemy.orm import mapped_column
 from sqlalchemy.sql import func
 from ..database import Base
 from datetime import date
@@ -7,7 +8,9 @@ class NDTRequest(Base):
     __tablename__ = "ndt_requests"
 
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    # Columns mapped with active_history keep the value a changed row had before,
+    # which the dashboard counters need to move it to its new counter
+    project_id = mapped_column(Integer, ForeignKey("projects.id"), nullable=False, active_history=True)
     line_no = Column(String(50))
     spool_no = Column(String(50))
     joint_no = Column(String(50))
@@ -17,11 +20,22 @@ class NDTRequest(Base):
     ndt_request_date = Column(Date)
     ndt_method = Column(String(50))  # UT, RT, PT, MT, etc.
     ndt_result = Column(String(20))
-    status = Column(String(20), default="pending")
+    status = mapped_column(String(20), default="pending", active_history=True)
     is_completed = Column(Boolean, default=False)
     completed_by = Column(Integer, ForeignKey("users.id"))
     completed_at = Column(Date)
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
     updated_by = Column(Integer, ForeignKey("users.id"))
-    created_at = Column(Date, default=date.today, nullable=False)
+    created_at = mapped_column(Date, default=date.today, nullable=False, index=True, active_history=True)
     updated_at = Column(Date, default=date.today, onupdate=date.today, nullable=False)
+
+    # Lookups by project (list pages, dashboard filters, trends) and by joint, plus status filters
+    __table_args__ = (
+        Index("ix_ndt_requests_project_status", "project_id", "status"),
+        Index("ix_ndt_requests_project_created_at", "project_id", "created_at"),
+        Index("ix_ndt_requests_project_joint", "project_id", "line_no", "spool_no", "joint_no"),
+        Index("ix_ndt_requests_status", "status"),
+        # Welder filter of the list endpoint
+        Index("ix_ndt_requests_welder_no", "welder_no"),
+        Index("ix_ndt_requests_ndt_method", "ndt_method"),
+    )
@@ -1,4 +1,5 @@
 from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Date
+from sqlalchemy.orm import mapped_column
 from sqlalchemy.sql import func
 from ..database import Base
 from datetime import datetime
@@ -12,10 +13,12 @@ class Project(Base):
     client = Column(String(200), nullable=False)
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=True)
-    status = Column(String(50), default="active", nullable=False)
+    # Columns mapped with active_history keep the value a changed row had before,
+    # which the dashboard counters need to move it to its new counter
+    status = mapped_column(String(50), default="active", nullable=False, active_history=True)
     project_manager = Column(String(100), nullable=False)
     description = Column(String(500), nullable=True)
     budget = Column(Float, nullable=True)
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = mapped_column(DateTime, default=datetime.utcnow, nullable=False, active_history=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
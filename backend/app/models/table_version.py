@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from ..database import Base
+from datetime import datetime
+
+class TableVersion(Base):
+    __tablename__ = "table_versions"
+
+    # Write counter per table, bumped in the same transaction as every insert/update/delete
+    table_name = Column(String(50), primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
@@ -7,13 +7,42 @@ from ..core.security import get_current_active_user
 from .. import schemas
 from ..crud.audit_trail import audit_trail as audit_trail_crud
 from ..schemas.audit_trail import AuditTrail, AuditTrailFilter
+from ..utils.pagination import AFTER_DESCRIPTION, set_next_cursor
 
 router = APIRouter()
 
+def _audit_page(
+    db: Session,
+    response: Response,
+    filters: AuditTrailFilter,
+    skip: int,
+    after: Optional[str],
+    limit: int
+) -> List[AuditTrail]:
+    """
+    Newest-first audit records: by OFFSET when `skip` is given, otherwise by
+    cursor, with the cursor of the next page in the X-Next-Cursor header.
+    """
+    if skip and after:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="after cannot be combined with skip")
+    if skip:
+        return audit_trail_crud.get_multi(db, skip=skip, limit=limit, filters=filters)
+    try:
+        records, next_cursor = audit_trail_crud.get_page(db, filters=filters, after=after, limit=limit)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+    set_next_cursor(response, next_cursor)
+    return records
+
 @router.get("/", response_model=List[AuditTrail])
 def get_audit_trail(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    after: Optional[str] = Query(None, description=AFTER_DESCRIPTION),
     user_id: Optional[int] = None,
     action: Optional[str] = None,
     table_name: Optional[str] = None,
@@ -44,13 +73,15 @@ def get_audit_trail(
         end_date=end_date
     )
     
-    return audit_trail_crud.get_multi(db, skip=skip, limit=limit, filters=filters)
+    return _audit_page(db, response, filters, skip, after, limit)
 
 @router.get("/user/{user_id}", response_model=List[AuditTrail])
 def get_audit_trail_by_user(
     user_id: int,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    after: Optional[str] = Query(None, description=AFTER_DESCRIPTION),
     db: Session = Depends(get_db),
     current_user: schemas.User = Depends(get_current_active_user)
 ):
@@ -64,13 +95,15 @@ def get_audit_trail_by_user(
             detail="Insufficient permissions to access audit trail"
         )
     
-    return audit_trail_crud.get_by_user(db, user_id=user_id, skip=skip, limit=limit)
+    return _audit_page(db, response, AuditTrailFilter(user_id=user_id), skip, after, limit)
 
 @router.get("/table/{table_name}", response_model=List[AuditTrail])
 def get_audit_trail_by_table(
     table_name: str,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    after: Optional[str] = Query(None, description=AFTER_DESCRIPTION),
     db: Session = Depends(get_db),
     current_user: schemas.User = Depends(get_current_active_user)
 ):
@@ -84,14 +117,16 @@ def get_audit_trail_by_table(
             detail="Insufficient permissions to access audit trail"
         )
     
-    return audit_trail_crud.get_by_table(db, table_name=table_name, skip=skip, limit=limit)
+    return _audit_page(db, response, AuditTrailFilter(table_name=table_name), skip, after, limit)
 
 @router.get("/record/{table_name}/{record_id}", response_model=List[AuditTrail])
 def get_audit_trail_by_record(
     table_name: str,
     record_id: int,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    after: Optional[str] = Query(None, description=AFTER_DESCRIPTION),
     db: Session = Depends(get_db),
     current_user: schemas.User = Depends(get_current_active_user)
 ):
@@ -105,7 +140,8 @@ def get_audit_trail_by_record(
             detail="Insufficient permissions to access audit trail"
         )
     
-    return audit_trail_crud.get_by_record(db, table_name=table_name, record_id=record_id, skip=skip, limit=limit)
+    filters = AuditTrailFilter(table_name=table_name, record_id=record_id)
+    return _audit_page(db, response, filters, skip, after, limit)
 
 @router.get("/count")
 def get_audit_trail_count(
@@ -1,190 +1,209 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import json
+from datetime import date
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case
-from datetime import datetime, timedelta
 
 from ..database import get_db
+from ..core.config import settings
 from ..core.security import get_current_active_user
 from .. import schemas
-from ..crud.material import material as material_crud
-from ..crud.fitup import fitup as fitup_crud
-from ..crud.final_inspection import final_inspection as final_inspection_crud
-from ..crud.ndt_request import ndt_request as ndt_request_crud
-from ..models.fitup import Fitup
-from ..models.final_inspection import FinalInspection
-from ..models.ndt_request import NDTRequest
-from ..models.material import Material
-from ..models.project import Project
+from ..crud import project_crud
+from ..utils.dashboard_stats import TREND_ENTITIES, dashboard_stats, project_stats, projects_stats, trends
+from ..utils.dashboard_counters import KEY_COLUMNS, CounterKey, add_change_listener, add_delta_listener
+from ..utils.dashboard_events import EventBroker, ServerSentEvent
+from ..utils.stats_cache import DASHBOARD_KEY, FileBackend, MemoryBackend, StatsCache, project_key
 
 router = APIRouter()
 
+# Upper bound on the projects of one batch statistics request
+MAX_BATCH_PROJECTS = 500
+
+# Statistics shared by identical polls until the TTL runs out or a write changes them
+stats_cache = StatsCache(
+    FileBackend(settings.stats_cache_dir) if settings.stats_cache_backend == "file" else MemoryBackend(),
+    ttl_seconds=settings.stats_cache_ttl_seconds,
+    enabled=settings.stats_cache_enabled,
+)
+add_change_listener(stats_cache.invalidate_projects)
+
+# Counter changes pushed to /dashboard/stream subscribers, one event per commit
+dashboard_events = EventBroker(
+    replay_size=settings.dashboard_stream_replay_size,
+    max_queue=settings.dashboard_stream_queue_size,
+)
+
+# Milliseconds an EventSource waits before reconnecting
+STREAM_RETRY_MS = 3000
+
+
+def _publish_counter_deltas(deltas: Dict[CounterKey, int]):
+    changes = [{**dict(zip(KEY_COLUMNS, key)), "delta": delta} for key, delta in sorted(deltas.items())]
+    dashboard_events.publish("counters", {
+        "projects": sorted({change["project_id"] for change in changes}),
+        "changes": changes,
+    })
+
+
+add_delta_listener(_publish_counter_deltas)
+
+
+def _cached(response: Response, key: str, compute):
+    value, hit = stats_cache.get_or_compute(key, compute)
+    response.headers["X-Cache"] = "HIT" if hit else "MISS"
+    return value
+
+
 @router.get("/stats")
 def get_dashboard_stats(
+    response: Response,
     db: Session = Depends(get_db),
     current_user: schemas.User = Depends(get_current_active_user)
 ):
     """
     Get comprehensive dashboard statistics including acceptance rates, pending NDT, status breakdowns, etc.
     """
-    # Get counts for each inspection type
-    material_count = material_crud.count(db)
-    fitup_count = fitup_crud.count(db)
-    final_count = final_inspection_crud.count(db)
-    ndt_count = ndt_request_crud.count(db)
-    project_count = db.query(func.count(Project.id)).scalar()
-    
-    # Calculate acceptance rates with more detailed breakdown
-    fitup_approved = db.query(func.count(Fitup.id)).filter(Fitup.is_approved == True).scalar()
-    fitup_rejected = db.query(func.count(Fitup.id)).filter(Fitup.is_approved == False).scalar()
-    fitup_pending = db.query(func.count(Fitup.id)).filter(Fitup.is_approved == None).scalar()
-    fitup_acceptance_rate = (fitup_approved / fitup_count * 100) if fitup_count > 0 else 0
-    
-    final_approved = db.query(func.count(FinalInspection.id)).filter(FinalInspection.is_approved == True).scalar()
-    final_rejected = db.query(func.count(FinalInspection.id)).filter(FinalInspection.is_approved == False).scalar()
-    final_pending = db.query(func.count(FinalInspection.id)).filter(FinalInspection.is_approved == None).scalar()
-    final_acceptance_rate = (final_approved / final_count * 100) if final_count > 0 else 0
-    
-    # Detailed NDT status breakdown
-    pending_ndt = db.query(func.count(NDTRequest.id)).filter(NDTRequest.status == "pending").scalar()
-    in_progress_ndt = db.query(func.count(NDTRequest.id)).filter(NDTRequest.status == "in_progress").scalar()
-    completed_ndt = db.query(func.count(NDTRequest.id)).filter(NDTRequest.status == "completed").scalar()
-    failed_ndt = db.query(func.count(NDTRequest.id)).filter(NDTRequest.status == "failed").scalar()
-    
-    # Material status breakdown
-    material_available = db.query(func.count(Material.id)).filter(Material.status == "available").scalar()
-    material_reserved = db.query(func.count(Material.id)).filter(Material.status == "reserved").scalar()
-    material_used = db.query(func.count(Material.id)).filter(Material.status == "used").scalar()
-    
-    # Project status breakdown
-    active_projects = db.query(func.count(Project.id)).filter(Project.status == "active").scalar()
-    completed_projects = db.query(func.count(Project.id)).filter(Project.status == "completed").scalar()
-    on_hold_projects = db.query(func.count(Project.id)).filter(Project.status == "on_hold").scalar()
-    
-    # Get recent activity (last 7 days)
-    seven_days_ago = datetime.now().date() - timedelta(days=7)
-    
-    recent_fitups = db.query(func.count(Fitup.id)).filter(Fitup.created_at >= seven_days_ago).scalar()
-    recent_finals = db.query(func.count(FinalInspection.id)).filter(FinalInspection.created_at >= seven_days_ago).scalar()
-    recent_ndt = db.query(func.count(NDTRequest.id)).filter(NDTRequest.created_at >= seven_days_ago).scalar()
-    recent_materials = db.query(func.count(Material.id)).filter(Material.created_at >= seven_days_ago).scalar()
-    
-    # Get monthly trends (last 3 months)
-    three_months_ago = datetime.now().date() - timedelta(days=90)
-    
-    monthly_fitups = db.query(
-        func.strftime('%Y-%m', Fitup.created_at).label('month'),
-        func.count(Fitup.id).label('count')
-    ).filter(Fitup.created_at >= three_months_ago).group_by('month').all()
-    
-    monthly_finals = db.query(
-        func.strftime('%Y-%m', FinalInspection.created_at).label('month'),
-        func.count(FinalInspection.id).label('count')
-    ).filter(FinalInspection.created_at >= three_months_ago).group_by('month').all()
-    
-    monthly_ndt = db.query(
-        func.strftime('%Y-%m', NDTRequest.created_at).label('month'),
-        func.count(NDTRequest.id).label('count')
-    ).filter(NDTRequest.created_at >= three_months_ago).group_by('month').all()
-    
-    return {
-        "overview": {
-            "total_projects": project_count,
-            "total_materials": material_count,
-            "total_fitups": fitup_count,
-            "total_final_inspections": final_count,
-            "total_ndt_requests": ndt_count
-        },
-        "acceptance_rates": {
-            "fitup": {
-                "approved": fitup_approved,
-                "rejected": fitup_rejected,
-                "pending": fitup_pending,
-                "rate": round(fitup_acceptance_rate, 2)
-            },
-            "final_inspection": {
-                "approved": final_approved,
-                "rejected": final_rejected,
-                "pending": final_pending,
-                "rate": round(final_acceptance_rate, 2)
-            }
-        },
-        "status_breakdown": {
-            "ndt": {
-                "pending": pending_ndt,
-                "in_progress": in_progress_ndt,
-                "completed": completed_ndt,
-                "failed": failed_ndt,
-                "completion_rate": round((completed_ndt / ndt_count * 100), 2) if ndt_count > 0 else 0
-            },
-            "materials": {
-                "available": material_available,
-                "reserved": material_reserved,
-                "used": material_used
-            },
-            "projects": {
-                "active": active_projects,
-                "completed": completed_projects,
-                "on_hold": on_hold_projects
-            }
-        },
-        "recent_activity": {
-            "last_7_days": {
-                "materials": recent_materials,
-                "fitups": recent_fitups,
-                "final_inspections": recent_finals,
-                "ndt_requests": recent_ndt
-            }
-        },
-        "monthly_trends": {
-            "fitups": [{"month": m[0], "count": m[1]} for m in monthly_fitups],
-            "final_inspections": [{"month": m[0], "count": m[1]} for m in monthly_finals],
-            "ndt_requests": [{"month": m[0], "count": m[1]} for m in monthly_ndt]
-        }
-    }
+    return _cached(response, DASHBOARD_KEY, lambda: dashboard_stats(db))
+
+@router.get("/stats/cache")
+def get_stats_cache_info(
+    current_user: schemas.User = Depends(get_current_active_user)
+):
+    """
+    Get hit/miss counters of the dashboard statistics cache (for this worker process).
+    """
+    return stats_cache.stats()
+
+def _reset_event(event_id: str, reason: str) -> str:
+    return ServerSentEvent(event_id, "reset", json.dumps({"reason": reason})).encode()
+
+@router.get("/stream")
+async def stream_dashboard(
+    last_event_id: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(get_current_active_user)
+):
+    """
+    Server-Sent Events stream of dashboard counter changes. Each commit that changes
+    the dashboard figures produces one "counters" event listing the (project,
+    entity, status, approval, day) counters and their deltas. A comment line is sent
+    as a heartbeat when idle. Reconnecting with Last-Event-ID replays the missed
+    events; when that is not possible a "reset" event asks the client to reload
+    /dashboard/stats.
+    """
+    # The session was only needed to authenticate; don't hold a connection for the whole stream
+    db.close()
+    subscription, backlog = dashboard_events.subscribe(last_event_id)
+
+    async def events():
+        try:
+            yield f"retry: {STREAM_RETRY_MS}\n\n"
+            if backlog is None:
+                yield _reset_event(subscription.last_id, "resume")
+            for event in backlog or []:
+                yield event.encode()
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=settings.dashboard_stream_heartbeat_seconds
+                    )
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                subscription.last_id = event.id
+                if subscription.overflowed:
+                    yield _reset_event(subscription.drain(), "overflow")
+                    continue
+                yield event.encode()
+        finally:
+            dashboard_events.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 @router.get("/stats/project/{project_id}")
 def get_project_stats(
     project_id: int,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: schemas.User = Depends(get_current_active_user)
 ):
     """
     Get statistics for a specific project.
     """
-    # Count inspections by type for this project
-    project_fitups = db.query(func.count(Fitup.id)).filter(Fitup.project_id == project_id).scalar()
-    project_finals = db.query(func.count(FinalInspection.id)).filter(FinalInspection.project_id == project_id).scalar()
-    project_ndt = db.query(func.count(NDTRequest.id)).filter(NDTRequest.project_id == project_id).scalar()
-    
-    # Calculate project-specific acceptance rates
-    project_fitup_approved = db.query(func.count(Fitup.id)).filter(
-        Fitup.project_id == project_id, 
-        Fitup.is_approved == True
-    ).scalar()
-    project_fitup_rate = (project_fitup_approved / project_fitups * 100) if project_fitups > 0 else 0
-    
-    project_final_approved = db.query(func.count(FinalInspection.id)).filter(
-        FinalInspection.project_id == project_id, 
-        FinalInspection.is_approved == True
-    ).scalar()
-    project_final_rate = (project_final_approved / project_finals * 100) if project_finals > 0 else 0
-    
-    # Count pending NDT for this project
-    project_pending_ndt = db.query(func.count(NDTRequest.id)).filter(
-        NDTRequest.project_id == project_id,
-        NDTRequest.status == "pending"
-    ).scalar()
-    
-    return {
-        "project_id": project_id,
-        "counts": {
-            "fitups": project_fitups,
-            "final_inspections": project_finals,
-            "ndt_requests": project_ndt
-        },
-        "acceptance_rates": {
-            "fitup": round(project_fitup_rate, 2),
-            "final_inspection": round(project_final_rate, 2)
-        },
-        "pending_ndt": project_pending_ndt
-    }
+    return _cached(response, project_key(project_id), lambda: project_stats(db, project_id))
+
+@router.get("/stats/projects")
+def get_projects_stats(
+    response: Response,
+    ids: Optional[str] = Query(None, description="Comma-separated project IDs (default: all projects visible to the user)"),
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(get_current_active_user)
+):
+    """
+    Get the statistics of many projects in one call, keyed by project ID.
+    Without `ids`, returns every project the user can see.
+    """
+    if ids:
+        try:
+            project_ids = [int(value) for value in ids.split(",") if value.strip()]
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="ids must be a comma-separated list of project IDs"
+            )
+    elif current_user.role == "admin":
+        project_ids = project_crud.get_project_ids(db)
+    else:
+        project_ids = project_crud.get_project_ids(db, user_id=current_user.id)
+    project_ids = list(dict.fromkeys(project_ids))
+    if len(project_ids) > MAX_BATCH_PROJECTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_PROJECTS} projects can be requested at once"
+        )
+
+    keys = {project_key(project_id): project_id for project_id in project_ids}
+
+    def compute(missing):
+        stats = projects_stats(db, [keys[key] for key in missing])
+        return {project_key(project_id): value for project_id, value in stats.items()}
+
+    values, hits = stats_cache.get_or_compute_many(list(keys), compute)
+    response.headers["X-Cache"] = "HIT" if project_ids and hits == len(project_ids) else "MISS"
+    return {"projects": {str(project_id): values[key] for key, project_id in keys.items()}}
+
+@router.get("/trends")
+def get_trends(
+    granularity: str = Query("month", description="Bucket size: day, week or month"),
+    from_date: Optional[date] = Query(None, alias="from", description="First day (default: 90 days before 'to')"),
+    to_date: Optional[date] = Query(None, alias="to", description="Last day (default: today)"),
+    entity: Optional[List[str]] = Query(None, description="Series to return (repeatable; default: fitups, final_inspections, ndt_requests)"),
+    project_id: Optional[int] = Query(None, description="Filter by project ID"),
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(get_current_active_user)
+):
+    """
+    Get the number of records created per day, week or month. Every bucket in the
+    range is returned, including empty ones.
+    """
+    try:
+        return trends(
+            db,
+            granularity=granularity,
+            start=from_date,
+            end=to_date,
+            entities=entity or TREND_ENTITIES,
+            project_id=project_id,
+        )
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
@@ -1,12 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-import pandas as pd
-import io
-from datetime import datetime
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
-from ..database import get_db
+from ..database import get_db, SessionLocal
+from ..core.config import settings
 from ..core.security import get_current_active_user
 from .. import schemas
 from ..crud.material import material as material_crud
@@ -14,209 +20,390 @@ from ..crud.fitup import fitup as fitup_crud
 from ..crud.final_inspection import final_inspection as final_inspection_crud
 from ..crud.ndt_request import ndt_request as ndt_request_crud
 from ..utils.pdf_generator import pdf_generator
-from ..schemas.export import PDFExportRequest
+from ..utils.pdf_batch import ReportSpec, stream_reports_zip, REPORT_FINAL, REPORT_FITUP, ZIP_MEDIA_TYPE
+from ..utils.job_queue import Job, JobQueue, JobStatus
+from ..utils.file_response import content_disposition, ranged_file_response
+from ..utils.export_cache import ExportCache, etag_matches, make_etag
+from ..utils.table_versions import current_versions
+from ..utils.export_columns import get_projection
+from ..utils.xlsx_stream import stream_xlsx, stream_xlsx_concurrent, XLSX_MEDIA_TYPE
+from ..utils.columnar_stream import (
+    arrow_schema, stream_arrow, stream_csv, stream_parquet,
+    ARROW_STREAM_MEDIA_TYPE, CSV_MEDIA_TYPE, PARQUET_MEDIA_TYPE,
+)
+from ..schemas.export import PDFExportRequest, PDFBatchExportRequest, ExportJob, ExportJobCreate
 from ..crud.project import project as project_crud
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Rows fetched from the database per round trip while streaming an export
+EXPORT_CHUNK_SIZE = 1000
+
+
+def _sheet(
+    db: Session,
+    crud,
+    sheet_name: str,
+    counter: Optional[Dict[str, int]] = None,
+    on_chunk: Optional[Callable[[int], None]] = None,
+):
+    """
+    Build a lazily evaluated sheet for the streaming XLSX writer.
+    Only the registered export columns are selected, in keyset chunks of plain tuples.
+    When `counter` is given, the number of rows written is recorded under `sheet_name`;
+    `on_chunk` is called with the size of every chunk read.
+    """
+    projection = get_projection(crud.model)
+
+    def rows():
+        written = 0
+        for chunk in crud.iter_chunks(db, chunk_size=EXPORT_CHUNK_SIZE, columns=projection.attrs):
+            yield from chunk
+            written += len(chunk)
+            if on_chunk:
+                on_chunk(len(chunk))
+        if counter is not None:
+            counter[sheet_name] = written
+
+    return sheet_name, projection.headers, rows()
+
+
+# Single-table Excel exports, keyed by export kind: (crud, sheet name)
+EXCEL_EXPORTS = {
+    "materials": (material_crud, "Materials"),
+    "fitups": (fitup_crud, "Fit-ups"),
+    "final-inspections": (final_inspection_crud, "Final Inspections"),
+    "ndt-requests": (ndt_request_crud, "NDT Requests"),
+}
+
+COMPREHENSIVE_SHEETS = [
+    (project_crud, "Projects"),
+    EXCEL_EXPORTS["materials"],
+    EXCEL_EXPORTS["fitups"],
+    EXCEL_EXPORTS["final-inspections"],
+    EXCEL_EXPORTS["ndt-requests"],
+]
+
+
+def _summary_sheet(counts: Dict[str, int]):
+    # Summary rows are produced after the data sheets have been written,
+    # so the counts come from the rows actually written
+    summary_rows = ([sheet_name, counts.get(sheet_name, 0)] for _, sheet_name in COMPREHENSIVE_SHEETS)
+    return "Summary", ["Category", "Count"], summary_rows
+
+
+# Worker threads shared by concurrently produced exports; each sheet uses its own session
+sheet_workers = ThreadPoolExecutor(max_workers=settings.export_sheet_workers, thread_name_prefix="export-sheet")
+
+
+def _sheet_producer(crud, sheet_name: str, counts: Dict[str, int], on_chunk: Optional[Callable[[int], None]] = None):
+    def produce():
+        def rows():
+            db = SessionLocal()
+            try:
+                _, _, sheet_rows = _sheet(db, crud, sheet_name, counter=counts, on_chunk=on_chunk)
+                yield from sheet_rows
+            finally:
+                db.close()
+
+        return sheet_name, get_projection(crud.model).headers, rows()
+
+    return produce
+
+
+def _stream_comprehensive(
+    timings: Optional[Dict[str, float]] = None,
+    on_chunk: Optional[Callable[[int], None]] = None,
+) -> Iterator[bytes]:
+    """The comprehensive workbook, with every data sheet fetched and serialized concurrently."""
+    counts: Dict[str, int] = {}
+    producers = [_sheet_producer(crud, sheet_name, counts, on_chunk) for crud, sheet_name in COMPREHENSIVE_SHEETS]
+    return stream_xlsx_concurrent(
+        producers,
+        sheet_workers,
+        trailing_sheets=lambda: [_summary_sheet(counts)],
+        timings=timings,
+    )
+
+
+def _timed_comprehensive() -> Iterator[bytes]:
+    """
+    Stream the comprehensive workbook, then log how long each sheet took.
+    The timings are only known once the last sheet has been written, after the
+    response has started, so they go to the log rather than into a header.
+    """
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+    yield from _stream_comprehensive(timings=timings)
+    logger.info(json.dumps({
+        "event": "comprehensive_export",
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        "sheets_ms": {name: round(seconds * 1000, 1) for name, seconds in timings.items()},
+    }))
+
+
+# Rendered artifacts, reused until a table they read from is written to
+export_cache = ExportCache(settings.export_cache_dir, settings.export_cache_max_bytes)
+
+
+def _export_etag(db: Session, kind: str, params: Dict[str, Any], table_names: List[str]) -> str:
+    return make_etag(kind, params, current_versions(db, table_names))
+
+
+def _cached_response(request: Request, etag: str, media_type: str, filename: str) -> Optional[Response]:
+    """A 304 or the cached artifact for this ETag, or None when the export has to be rendered."""
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    cached = export_cache.open(etag)
+    if cached:
+        return ranged_file_response(cached, media_type, filename, request.headers.get("range"), headers=headers)
+    return None
+
+
+def _cached_export(
+    request: Request,
+    db: Session,
+    kind: str,
+    params: Dict[str, Any],
+    table_names: List[str],
+    media_type: str,
+    filename: str,
+    render: Callable[[], Iterator[bytes]],
+) -> Response:
+    """
+    Serve an export through the artifact cache.
+    The ETag is derived from the export parameters and the write counters of the
+    tables involved: a matching If-None-Match gets a 304, a cached artifact is served
+    from disk, and anything else is rendered, streamed and stored at the same time.
+    """
+    disposition = {"Content-Disposition": content_disposition(filename)}
+    if not settings.export_cache_enabled:
+        return StreamingResponse(render(), media_type=media_type, headers=disposition)
+
+    etag = _export_etag(db, kind, params, table_names)
+    cached = _cached_response(request, etag, media_type, filename)
+    if cached:
+        return cached
+
+    return StreamingResponse(
+        export_cache.store_stream(etag, render()),
+        media_type=media_type,
+        headers={"ETag": etag, "Cache-Control": "private, no-cache", **disposition}
+    )
+
+
+def _xlsx_response(request: Request, db: Session, kind: str, cruds, sheets, filename_prefix: str) -> Response:
+    return _cached_export(
+        request,
+        db,
+        kind=f"excel:{kind}",
+        params={},
+        table_names=[crud.model.__tablename__ for crud in cruds],
+        media_type=XLSX_MEDIA_TYPE,
+        filename=f"{filename_prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+        render=lambda: stream_xlsx(sheets),
+    )
 
 @router.get("/excel/materials")
 def export_materials_excel(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: schemas.User = Depends(get_current_active_user)
 ):
     """
     Export materials data to Excel.
     """
-    materials = material_crud.get_multi(db)
-    
-    # Convert to DataFrame
-    data = []
-    for material in materials:
-        data.append({
-            "ID": material.id,
-            "Project ID": material.project_id,
-            "Material Code": material.material_code,
-            "Description": material.description,
-            "Specification": material.specification,
-            "Grade": material.grade,
-            "Size": material.size,
-            "Thickness": material.thickness,
-            "Quantity": material.quantity,
-            "Unit": material.unit,
-            "Status": material.status,
-            "Created At": material.created_at,
-            "Updated At": material.updated_at
-        })
-    
-    df = pd.DataFrame(data)
-    
-    # Create Excel file in memory
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='Materials', index=False)
-    
-    output.seek(0)
-    
-    return StreamingResponse(
-        output,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename=materials_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"}
+    return _xlsx_response(
+        request, db, "materials", [material_crud],
+        [_sheet(db, material_crud, "Materials")],
+        "materials_export"
     )
 
 @router.get("/excel/fitups")
 def export_fitups_excel(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: schemas.User = Depends(get_current_active_user)
 ):
     """
     Export fit-up data to Excel.
     """
-    fitups = fitup_crud.get_multi(db)
-    
-    # Convert to DataFrame
-    data = []
-    for fitup in fitups:
-        data.append({
-            "ID": fitup.id,
-            "Project ID": fitup.project_id,
-            "Drawing No": fitup.drawing_no,
-            "Line No": fitup.line_no,
-            "Spool No": fitup.spool_no,
-            "Joint No": fitup.joint_no,
-            "Weld Type": fitup.weld_type,
-            "Part 1 Thickness": fitup.part1_thickness,
-            "Part 1 Grade": fitup.part1_grade,
-            "Part 1 Size": fitup.part1_size,
-            "Part 2 Thickness": fitup.part2_thickness,
-            "Part 2 Grade": fitup.part2_grade,
-            "Part 2 Size": fitup.part2_size,
-            "Joint Type": fitup.joint_type,
-            "Work Site": fitup.work_site,
-            "Fit-up Date": fitup.fitup_inspection_date,
-            "Report No": fitup.fitup_report_no,
-            "Result": fitup.fitup_result,
-            "Status": fitup.status,
-            "Is Approved": fitup.is_approved,
-            "Created At": fitup.created_at
-        })
-    
-    df = pd.DataFrame(data)
-    
-    # Create Excel file in memory
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='Fit-ups', index=False)
-    
-    output.seek(0)
-    
-    return StreamingResponse(
-        output,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename=fitups_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"}
+    return _xlsx_response(
+        request, db, "fitups", [fitup_crud],
+        [_sheet(db, fitup_crud, "Fit-ups")],
+        "fitups_export"
     )
 
 @router.get("/excel/final-inspections")
 def export_final_inspections_excel(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: schemas.User = Depends(get_current_active_user)
 ):
     """
     Export final inspections data to Excel.
     """
-    inspections = final_inspection_crud.get_multi(db)
-    
-    # Convert to DataFrame
-    data = []
-    for inspection in inspections:
-        data.append({
-            "ID": inspection.id,
-            "Project ID": inspection.project_id,
-            "Drawing No": inspection.drawing_no,
-            "Line No": inspection.line_no,
-            "Spool No": inspection.spool_no,
-            "Joint No": inspection.joint_no,
-            "Weld Type": inspection.weld_type,
-            "Part 1 Thickness": inspection.part1_thickness,
-            "Part 1 Grade": inspection.part1_grade,
-            "Part 1 Size": inspection.part1_size,
-            "Part 2 Thickness": inspection.part2_thickness,
-            "Part 2 Grade": inspection.part2_grade,
-            "Part 2 Size": inspection.part2_size,
-            "Joint Type": inspection.joint_type,
-            "Work Site": inspection.work_site,
-            "WPS No": inspection.wps_no,
-            "Welder No": inspection.welder_no,
-            "Weld Process": inspection.weld_process,
-            "Welding Completion Date": inspection.welding_completion_date,
-            "Weld Length": inspection.weld_length,
-            "Final Inspection Date": inspection.final_inspection_date,
-            "Final Report No": inspection.final_report_no,
-            "Final Result": inspection.final_result,
-            "Status": inspection.status,
-            "Is Approved": inspection.is_approved,
-            "Created At": inspection.created_at
-        })
-    
-    df = pd.DataFrame(data)
-    
-    # Create Excel file in memory
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='Final Inspections', index=False)
-    
-    output.seek(0)
-    
-    return StreamingResponse(
-        output,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename=final_inspections_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"}
+    return _xlsx_response(
+        request, db, "final-inspections", [final_inspection_crud],
+        [_sheet(db, final_inspection_crud, "Final Inspections")],
+        "final_inspections_export"
     )
 
 @router.get("/excel/ndt-requests")
 def export_ndt_requests_excel(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: schemas.User = Depends(get_current_active_user)
 ):
     """
     Export NDT requests data to Excel.
     """
-    requests = ndt_request_crud.get_multi(db)
-    
-    # Convert to DataFrame
-    data = []
-    for request in requests:
-        data.append({
-            "ID": request.id,
-            "Project ID": request.project_id,
-            "Line No": request.line_no,
-            "Spool No": request.spool_no,
-            "Joint No": request.joint_no,
-            "Weld Process": request.weld_process,
-            "Welder No": request.welder_no,
-            "Weld Length": request.weld_length,
-            "NDT Request Date": request.ndt_request_date,
-            "NDT Method": request.ndt_method,
-            "NDT Result": request.ndt_result,
-            "Status": request.status,
-            "Is Completed": request.is_completed,
-            "Created At": request.created_at
-        })
-    
-    df = pd.DataFrame(data)
-    
-    # Create Excel file in memory
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='NDT Requests', index=False)
-    
-    output.seek(0)
-    
-    return StreamingResponse(
-        output,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename=ndt_requests_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"}
+    return _xlsx_response(
+        request, db, "ndt-requests", [ndt_request_crud],
+        [_sheet(db, ndt_request_crud, "NDT Requests")],
+        "ndt_requests_export"
     )
 
+# Tables available as columnar extracts, keyed by the path segment used in the URL
+COLUMNAR_TABLES = {
+    "materials": material_crud,
+    "fitups": fitup_crud,
+    "final-inspections": final_inspection_crud,
+    "ndt-requests": ndt_request_crud,
+}
+
+# Rows per fetch for columnar extracts; each chunk becomes one Arrow batch / Parquet row group
+COLUMNAR_CHUNK_SIZE = 10000
+
+
+def _columnar_source(
+    db: Session,
+    table: str,
+    project_id: Optional[int],
+    status_filter: Optional[str],
+    from_date: Optional[date],
+    to_date: Optional[date],
+):
+    """
+    Resolve a columnar extract: returns (table name, column names, SQLAlchemy column types, row chunks).
+    Only the registered export columns are selected and all filters are applied in SQL.
+    """
+    if table not in COLUMNAR_TABLES:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown export table '{table}'. Available: {', '.join(COLUMNAR_TABLES)}"
+        )
+    model = COLUMNAR_TABLES[table].model
+    projection = get_projection(model)
+
+    stmt = projection.select()
+    if project_id is not None:
+        stmt = stmt.where(model.project_id == project_id)
+    if status_filter:
+        stmt = stmt.where(model.status == status_filter)
+    if from_date:
+        stmt = stmt.where(model.created_at >= from_date)
+    if to_date:
+        stmt = stmt.where(model.created_at <= to_date)
+    stmt = stmt.order_by(model.id).execution_options(yield_per=COLUMNAR_CHUNK_SIZE)
+
+    def chunks():
+        result = db.execute(stmt)
+        for partition in result.partitions():
+            yield [tuple(row) for row in partition]
+
+    types = [column.type for column in projection.sql_columns()]
+    return model.__tablename__, projection.attrs, types, chunks()
+
+
+def _columnar_filename(table: str, extension: str) -> str:
+    return f"{table.replace('-', '_')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+
+@router.get("/{table}.csv")
+def export_table_csv(
+    table: str,
+    request: Request,
+    project_id: Optional[int] = Query(None, description="Filter by project ID"),
+    status_filter: Optional[str] = Query(None, alias="status", description="Filter by status"),
+    from_date: Optional[date] = Query(None, description="Created on or after this date"),
+    to_date: Optional[date] = Query(None, description="Created on or before this date"),
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(get_current_active_user)
+):
+    """
+    Export a table as CSV, streamed straight from SQL.
+    """
+    table_name, names, _, chunks = _columnar_source(db, table, project_id, status_filter, from_date, to_date)
+    return _cached_export(
+        request,
+        db,
+        kind=f"csv:{table}",
+        params={"project_id": project_id, "status": status_filter, "from_date": from_date, "to_date": to_date},
+        table_names=[table_name],
+        media_type=CSV_MEDIA_TYPE,
+        filename=_columnar_filename(table, "csv"),
+        render=lambda: stream_csv(names, chunks),
+    )
+
+@router.get("/{table}.parquet")
+def export_table_parquet(
+    table: str,
+    request: Request,
+    project_id: Optional[int] = Query(None, description="Filter by project ID"),
+    status_filter: Optional[str] = Query(None, alias="status", description="Filter by status"),
+    from_date: Optional[date] = Query(None, description="Created on or after this date"),
+    to_date: Optional[date] = Query(None, description="Created on or before this date"),
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(get_current_active_user)
+):
+    """
+    Export a table as Parquet, one row group per fetched chunk.
+    """
+    table_name, names, types, chunks = _columnar_source(db, table, project_id, status_filter, from_date, to_date)
+    return _cached_export(
+        request,
+        db,
+        kind=f"parquet:{table}",
+        params={"project_id": project_id, "status": status_filter, "from_date": from_date, "to_date": to_date},
+        table_names=[table_name],
+        media_type=PARQUET_MEDIA_TYPE,
+        filename=_columnar_filename(table, "parquet"),
+        render=lambda: stream_parquet(arrow_schema(list(zip(names, types))), chunks),
+    )
+
+@router.get("/{table}.arrow")
+def export_table_arrow(
+    table: str,
+    request: Request,
+    project_id: Optional[int] = Query(None, description="Filter by project ID"),
+    status_filter: Optional[str] = Query(None, alias="status", description="Filter by status"),
+    from_date: Optional[date] = Query(None, description="Created on or after this date"),
+    to_date: Optional[date] = Query(None, description="Created on or before this date"),
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(get_current_active_user)
+):
+    """
+    Export a table as an Arrow IPC stream, one record batch per fetched chunk.
+    """
+    table_name, names, types, chunks = _columnar_source(db, table, project_id, status_filter, from_date, to_date)
+    return _cached_export(
+        request,
+        db,
+        kind=f"arrow:{table}",
+        params={"project_id": project_id, "status": status_filter, "from_date": from_date, "to_date": to_date},
+        table_names=[table_name],
+        media_type=ARROW_STREAM_MEDIA_TYPE,
+        filename=_columnar_filename(table, "arrow"),
+        render=lambda: stream_arrow(arrow_schema(list(zip(names, types))), chunks),
+    )
+
+# Record fields used by the PDF report tables
+FITUP_PDF_FIELDS = get_projection(fitup_crud.model).report_fields
+FINAL_INSPECTION_PDF_FIELDS = get_projection(final_inspection_crud.model).report_fields
+
 @router.post("/pdf/fitups")
 def export_fitups_pdf(
     export_request: PDFExportRequest,
@@ -226,23 +413,8 @@ def export_fitups_pdf(
     """
     Export selected fit-up records to PDF report.
     """
-    # Get selected records
-    records = []
-    for record_id in export_request.record_ids:
-        fitup = fitup_crud.get(db, id=record_id)
-        if fitup:
-            records.append({
-                "line_no": fitup.line_no,
-                "spool_no": fitup.spool_no,
-                "joint_no": fitup.joint_no,
-                "part1_grade": fitup.part1_grade,
-                "part1_size": fitup.part1_size,
-                "part2_grade": fitup.part2_grade,
-                "part2_size": fitup.part2_size,
-                "joint_type": fitup.joint_type,
-                "part1_thickness": fitup.part1_thickness,
-                "fitup_result": fitup.fitup_result
-            })
+    # Load all selected records in one query, in the requested order
+    records = fitup_crud.get_many(db, export_request.record_ids, columns=FITUP_PDF_FIELDS)
     
     if not records:
         raise HTTPException(
@@ -266,7 +438,7 @@ def export_fitups_pdf(
     return StreamingResponse(
         pdf_buffer,
         media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename=fitup_report_{export_request.report_no}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"}
+        headers={"Content-Disposition": content_disposition(f"fitup_report_{export_request.report_no}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")}
     )
 
 @router.post("/pdf/final-inspections")
@@ -278,25 +450,8 @@ def export_final_inspections_pdf(
     """
     Export selected final inspection records to PDF report.
     """
-    # Get selected records
-    records = []
-    for record_id in export_request.record_ids:
-        inspection = final_inspection_crud.get(db, id=record_id)
-        if inspection:
-            records.append({
-                "line_no": inspection.line_no,
-                "spool_no": inspection.spool_no,
-                "joint_no": inspection.joint_no,
-                "part1_grade": inspection.part1_grade,
-                "part1_size": inspection.part1_size,
-                "part2_grade": inspection.part2_grade,
-                "part2_size": inspection.part2_size,
-                "joint_type": inspection.joint_type,
-                "part1_thickness": inspection.part1_thickness,
-                "wps_no": inspection.wps_no,
-                "welder_no": inspection.welder_no,
-                "final_result": inspection.final_result
-            })
+    # Load all selected records in one query, in the requested order
+    records = final_inspection_crud.get_many(db, export_request.record_ids, columns=FINAL_INSPECTION_PDF_FIELDS)
     
     if not records:
         raise HTTPException(
@@ -320,157 +475,244 @@ def export_final_inspections_pdf(
     return StreamingResponse(
         pdf_buffer,
         media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename=final_inspection_report_{export_request.report_no}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"}
+        headers={"Content-Disposition": content_disposition(f"final_inspection_report_{export_request.report_no}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf")}
+    )
+
+def _report_specs(
+    db: Session,
+    crud,
+    kind: str,
+    report_no_field: str,
+    date_field: str,
+    fields: List[str],
+    batch_request: PDFBatchExportRequest,
+    project_name: str,
+) -> List[ReportSpec]:
+    """
+    Load a project's records with a single query and group them into one report
+    per report number.
+    """
+    model = crud.model
+    report_no_column = getattr(model, report_no_field)
+    stmt = (
+        select(
+            report_no_column.label("report_no"),
+            model.drawing_no,
+            getattr(model, date_field).label("inspection_date"),
+            *get_projection(model).sql_columns(fields),
+        )
+        .where(model.project_id == batch_request.project_id, report_no_column.isnot(None), report_no_column != "")
+        .order_by(report_no_column, model.id)
+    )
+    if batch_request.report_nos:
+        stmt = stmt.where(report_no_column.in_(batch_request.report_nos))
+
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for row in db.execute(stmt):
+        groups.setdefault(row.report_no, []).append(dict(row._mapping))
+
+    specs = []
+    for report_no, records in groups.items():
+        drawing_nos = sorted({r["drawing_no"] for r in records if r["drawing_no"]})
+        dates = [r["inspection_date"] for r in records if r["inspection_date"]]
+        operator_data = {
+            "project": project_name,
+            "location": batch_request.location or "",
+            "report_no": report_no,
+            "drawing_no": ", ".join(drawing_nos),
+            "inspector": batch_request.inspector or "",
+            "date": (max(dates) if dates else datetime.now().date()).isoformat(),
+        }
+        specs.append(ReportSpec(kind, report_no, records, operator_data))
+    return specs
+
+@router.post("/pdf/batch")
+def export_pdf_batch(
+    batch_request: PDFBatchExportRequest,
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(get_current_active_user)
+):
+    """
+    Render one fit-up and/or final inspection report per report number of a project,
+    in parallel, and stream them back as a ZIP archive as each PDF finishes.
+    """
+    unknown = set(batch_request.report_types) - {REPORT_FITUP, REPORT_FINAL}
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown report types: {', '.join(sorted(unknown))}. Available: {REPORT_FITUP}, {REPORT_FINAL}"
+        )
+    project = project_crud.get(db, id=batch_request.project_id)
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+
+    specs: List[ReportSpec] = []
+    if REPORT_FITUP in batch_request.report_types:
+        specs += _report_specs(
+            db, fitup_crud, REPORT_FITUP, "fitup_report_no", "fitup_inspection_date",
+            FITUP_PDF_FIELDS, batch_request, project.project_name
+        )
+    if REPORT_FINAL in batch_request.report_types:
+        specs += _report_specs(
+            db, final_inspection_crud, REPORT_FINAL, "final_report_no", "final_inspection_date",
+            FINAL_INSPECTION_PDF_FIELDS, batch_request, project.project_name
+        )
+    if not specs:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No records with a report number found for this project"
+        )
+
+    return StreamingResponse(
+        stream_reports_zip(specs, max_workers=settings.pdf_workers),
+        media_type=ZIP_MEDIA_TYPE,
+        headers={"Content-Disposition": content_disposition(f"reports_{project.project_number}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip")}
     )
 
 @router.get("/excel/comprehensive")
 def export_comprehensive_excel(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: schemas.User = Depends(get_current_active_user)
 ):
     """
     Export comprehensive data including projects, materials, fitups, final inspections, and NDT requests in a single Excel file.
+    The sheets are produced concurrently and the workbook is streamed as they finish;
+    the time each sheet took is logged once the response is complete.
+    For large databases prefer POST /export/jobs, which renders the file in the background.
     """
-    # Get all data
-    projects = project_crud.get_multi(db)
-    materials = material_crud.get_multi(db)
-    fitups = fitup_crud.get_multi(db)
-    final_inspections = final_inspection_crud.get_multi(db)
-    ndt_requests = ndt_request_crud.get_multi(db)
-    
-    # Create Excel file in memory
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        # Projects sheet
-        projects_data = []
-        for project in projects:
-            projects_data.append({
-                "ID": project.id,
-                "Name": project.name,
-                "Client": project.client,
-                "Location": project.location,
-                "Start Date": project.start_date,
-                "End Date": project.end_date,
-                "Status": project.status,
-                "Description": project.description,
-                "Created At": project.created_at,
-                "Updated At": project.updated_at
-            })
-        pd.DataFrame(projects_data).to_excel(writer, sheet_name='Projects', index=False)
-        
-        # Materials sheet
-        materials_data = []
-        for material in materials:
-            materials_data.append({
-                "ID": material.id,
-                "Project ID": material.project_id,
-                "Material Code": material.material_code,
-                "Description": material.description,
-                "Specification": material.specification,
-                "Grade": material.grade,
-                "Size": material.size,
-                "Thickness": material.thickness,
-                "Quantity": material.quantity,
-                "Unit": material.unit,
-                "Status": material.status,
-                "Created At": material.created_at,
-                "Updated At": material.updated_at
-            })
-        pd.DataFrame(materials_data).to_excel(writer, sheet_name='Materials', index=False)
-        
-        # Fit-ups sheet
-        fitups_data = []
-        for fitup in fitups:
-            fitups_data.append({
-                "ID": fitup.id,
-                "Project ID": fitup.project_id,
-                "Drawing No": fitup.drawing_no,
-                "Line No": fitup.line_no,
-                "Spool No": fitup.spool_no,
-                "Joint No": fitup.joint_no,
-                "Weld Type": fitup.weld_type,
-                "Part 1 Thickness": fitup.part1_thickness,
-                "Part 1 Grade": fitup.part1_grade,
-                "Part 1 Size": fitup.part1_size,
-                "Part 2 Thickness": fitup.part2_thickness,
-                "Part 2 Grade": fitup.part2_grade,
-                "Part 2 Size": fitup.part2_size,
-                "Joint Type": fitup.joint_type,
-                "Work Site": fitup.work_site,
-                "Fit-up Date": fitup.fitup_inspection_date,
-                "Report No": fitup.fitup_report_no,
-                "Result": fitup.fitup_result,
-                "Status": fitup.status,
-                "Is Approved": fitup.is_approved,
-                "Created At": fitup.created_at
-            })
-        pd.DataFrame(fitups_data).to_excel(writer, sheet_name='Fit-ups', index=False)
-        
-        # Final Inspections sheet
-        final_data = []
-        for inspection in final_inspections:
-            final_data.append({
-                "ID": inspection.id,
-                "Project ID": inspection.project_id,
-                "Drawing No": inspection.drawing_no,
-                "Line No": inspection.line_no,
-                "Spool No": inspection.spool_no,
-                "Joint No": inspection.joint_no,
-                "Weld Type": inspection.weld_type,
-                "Part 1 Thickness": inspection.part1_thickness,
-                "Part 1 Grade": inspection.part1_grade,
-                "Part 1 Size": inspection.part1_size,
-                "Part 2 Thickness": inspection.part2_thickness,
-                "Part 2 Grade": inspection.part2_grade,
-                "Part 2 Size": inspection.part2_size,
-                "Joint Type": inspection.joint_type,
-                "Work Site": inspection.work_site,
-                "WPS No": inspection.wps_no,
-                "Welder No": inspection.welder_no,
-                "Weld Process": inspection.weld_process,
-                "Welding Completion Date": inspection.welding_completion_date,
-                "Weld Length": inspection.weld_length,
-                "Final Inspection Date": inspection.final_inspection_date,
-                "Final Report No": inspection.final_report_no,
-                "Final Result": inspection.final_result,
-                "Status": inspection.status,
-                "Is Approved": inspection.is_approved,
-                "Created At": inspection.created_at
-            })
-        pd.DataFrame(final_data).to_excel(writer, sheet_name='Final Inspections', index=False)
-        
-        # NDT Requests sheet
-        ndt_data = []
-        for request in ndt_requests:
-            ndt_data.append({
-                "ID": request.id,
-                "Project ID": request.project_id,
-                "Line No": request.line_no,
-                "Spool No": request.spool_no,
-                "Joint No": request.joint_no,
-                "Weld Process": request.weld_process,
-                "Welder No": request.welder_no,
-                "Weld Length": request.weld_length,
-                "NDT Request Date": request.ndt_request_date,
-                "NDT Method": request.ndt_method,
-                "NDT Result": request.ndt_result,
-                "Status": request.status,
-                "Is Completed": request.is_completed,
-                "Created At": request.created_at
-            })
-        pd.DataFrame(ndt_data).to_excel(writer, sheet_name='NDT Requests', index=False)
-        
-        # Summary Statistics sheet
-        summary_data = {
-            "Category": ["Projects", "Materials", "Fit-ups", "Final Inspections", "NDT Requests"],
-            "Count": [len(projects), len(materials), len(fitups), len(final_inspections), len(ndt_requests)]
-        }
-        pd.DataFrame(summary_data).to_excel(writer, sheet_name='Summary', index=False)
-    
-    output.seek(0)
-    
-    return StreamingResponse(
-        output,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename=comprehensive_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"}
+    return _cached_export(
+        request,
+        db,
+        kind="excel:comprehensive",
+        params={},
+        table_names=[crud.model.__tablename__ for crud, _ in COMPREHENSIVE_SHEETS],
+        media_type=XLSX_MEDIA_TYPE,
+        filename=f"comprehensive_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+        render=_timed_comprehensive,
     )
+
+# Background export jobs
+export_jobs = JobQueue(
+    settings.export_dir / "jobs",
+    max_workers=settings.export_workers,
+    ttl_seconds=settings.export_job_ttl_seconds,
+)
+
+
+def _render_excel_job(kind: str):
+    """Return a job render function that writes the requested Excel export to disk."""
+    def render(path: Path, progress):
+        db = SessionLocal()
+        try:
+            if kind == "comprehensive":
+                cruds = [crud for crud, _ in COMPREHENSIVE_SHEETS]
+            else:
+                cruds = [EXCEL_EXPORTS[kind][0]]
+            total = sum(crud.count(db) for crud in cruds)
+            done = 0
+
+            done_lock = threading.Lock()
+
+            def on_chunk(rows: int):
+                # Called from the sheet worker threads of a comprehensive export
+                nonlocal done
+                with done_lock:
+                    done += rows
+                    progress(done, total)
+
+            progress(0, total)
+            if kind == "comprehensive":
+                chunks = _stream_comprehensive(on_chunk=on_chunk)
+            else:
+                chunks = stream_xlsx([_sheet(db, *EXCEL_EXPORTS[kind], on_chunk=on_chunk)])
+            with open(path, "wb") as f:
+                for data in chunks:
+                    f.write(data)
+        finally:
+            db.close()
+
+    return render
+
+
+def _get_job(job_id: str, current_user: schemas.User) -> Job:
+    """The export job, if the caller submitted it or is an admin; 404 otherwise."""
+    job = export_jobs.get(job_id)
+    if not job or (current_user.role != "admin" and current_user.id not in job.requested_by):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Export job not found"
+        )
+    return job
+
+
+def _job_out(job: Job) -> ExportJob:
+    return ExportJob(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        progress=round(job.progress, 4),
+        rows_written=job.done,
+        total_rows=job.total,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        download_url=f"/export/jobs/{job.id}/download" if job.status == JobStatus.COMPLETED else None,
+    )
+
+@router.post("/jobs", response_model=ExportJob, status_code=status.HTTP_202_ACCEPTED)
+def create_export_job(
+    job_in: ExportJobCreate,
+    current_user: schemas.User = Depends(get_current_active_user)
+):
+    """
+    Queue a background Excel export. Identical requests made while a job is still
+    queued or running attach to that job instead of starting a new render.
+    """
+    if job_in.kind != "comprehensive" and job_in.kind not in EXCEL_EXPORTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown export kind '{job_in.kind}'. Available: comprehensive, {', '.join(EXCEL_EXPORTS)}"
+        )
+    filename = f"{job_in.kind.replace('-', '_')}_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    job = export_jobs.submit(
+        key=f"excel:{job_in.kind}",
+        kind=job_in.kind,
+        filename=filename,
+        media_type=XLSX_MEDIA_TYPE,
+        render=_render_excel_job(job_in.kind),
+        created_by=current_user.id,
+    )
+    return _job_out(job)
+
+@router.get("/jobs/{job_id}", response_model=ExportJob)
+def read_export_job(
+    job_id: str,
+    current_user: schemas.User = Depends(get_current_active_user)
+):
+    """
+    Poll the status and progress of a background export job.
+    """
+    job = _get_job(job_id, current_user)
+    return _job_out(job)
+
+@router.get("/jobs/{job_id}/download")
+def download_export_job(
+    job_id: str,
+    request: Request,
+    current_user: schemas.User = Depends(get_current_active_user)
+):
+    """
+    Download the artifact of a completed export job. Supports HTTP range requests.
+    """
+    job = _get_job(job_id, current_user)
+    if job.status != JobStatus.COMPLETED or not job.path:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Export job is {job.status}"
+        )
+    return ranged_file_response(job.path, job.media_type, job.filename, request.headers.get("range"))
@@ -1,12 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..database import get_db
-from ..core.security import get_current_active_user
+from ..database import get_async_db, get_db
+from ..core.config import settings
+from ..core.security import get_current_active_user, get_current_active_user_async
 from .. import schemas
-from ..crud.final_inspection import final_inspection as final_inspection_crud
+from ..crud.final_inspection import (
+    final_inspection as final_inspection_crud,
+    final_inspection_async as final_inspection_async_crud,
+)
 from ..crud.fitup import fitup as fitup_crud
 from ..crud.ndt_request import ndt_request as ndt_request_crud
+from ..utils.bulk import bulk_changes, check_bulk_size
+from ..utils.pagination import AFTER_DESCRIPTION, SORT_DESCRIPTION, set_next_cursor
 
 router = APIRouter()
 
@@ -68,28 +76,81 @@ def create_final_inspection(
     return final_inspection_obj
 
 @router.get("/", response_model=list[schemas.FinalInspection])
-def read_final_inspections(
+async def read_final_inspections(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    filters: schemas.FinalInspectionFilter = Depends(),
+    after: Optional[str] = Query(None, description=AFTER_DESCRIPTION),
+    sort: str = Query("id", description=SORT_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(get_current_active_user_async)
+):
+    """
+    Retrieve final inspections with optional filtering.
+    Every filter that is set narrows the result; `sort` orders it.
+    Without `skip`, pages are read by cursor: the X-Next-Cursor response header
+    is passed back as `after` to get the next page.
+    """
+    if skip and after:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="after cannot be combined with skip")
+    criteria = final_inspection_async_crud.filter_conditions(filters)
+    try:
+        if skip:
+            return await final_inspection_async_crud.get_multi_where(db, *criteria, skip=skip, limit=limit, sort=sort)
+        final_inspections, next_cursor = await final_inspection_async_crud.get_page(db, *criteria, after=after, limit=limit, sort=sort)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+    set_next_cursor(response, next_cursor)
+    return final_inspections
+
+@router.post("/bulk", response_model=schemas.BulkResult)
+def create_final_inspections_bulk(
+    inspections_in: List[schemas.FinalInspectionCreate],
     db: Session = Depends(get_db),
     current_user: schemas.User = Depends(get_current_active_user)
 ):
     """
-    Retrieve final inspections.
+    Create many final inspection records in one request and one transaction.
+    Returns the new ids in request order; if any record fails, none is stored.
     """
-    final_inspections = final_inspection_crud.get_multi(db, skip=skip, limit=limit)
-    return final_inspections
+    check_bulk_size(inspections_in)
+    ids = final_inspection_crud.create_many(db, inspections_in, chunk_size=settings.bulk_chunk_size, created_by=current_user.id)
+    return schemas.BulkResult(count=len(ids), ids=ids)
 
-@router.get("/{inspection_id}", response_model=schemas.FinalInspection)
-def read_final_inspection(
-    inspection_id: int,
+@router.patch("/bulk", response_model=schemas.BulkResult)
+def update_final_inspections_bulk(
+    inspections_in: List[schemas.FinalInspectionBulkUpdate],
     db: Session = Depends(get_db),
     current_user: schemas.User = Depends(get_current_active_user)
+):
+    """
+    Partially update many final inspection records by id in one transaction.
+    Only the fields sent for a record change; an unknown id fails the whole request.
+    """
+    check_bulk_size(inspections_in)
+    try:
+        updated = final_inspection_crud.update_many(db, bulk_changes(inspections_in), chunk_size=settings.bulk_chunk_size)
+    except LookupError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc)
+        )
+    return schemas.BulkResult(count=len(updated), ids=[record.id for record in updated])
+
+@router.get("/{inspection_id}", response_model=schemas.FinalInspection)
+async def read_final_inspection(
+    inspection_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(get_current_active_user_async)
 ):
     """
     Get final inspection by ID.
     """
-    final_inspection = final_inspection_crud.get(db, id=inspection_id)
+    final_inspection = await final_inspection_async_crud.get(db, id=inspection_id)
     if not final_inspection:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
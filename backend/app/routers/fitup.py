@@ -1,32 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..database import get_db
-from ..core.security import get_current_active_user
+from ..database import get_async_db, get_db
+from ..core.config import settings
+from ..core.security import get_current_active_user, get_current_active_user_async
 from .. import schemas
-from ..crud.fitup import fitup as fitup_crud
+from ..crud.fitup import fitup as fitup_crud, fitup_async as fitup_async_crud
 from ..schemas.fitup import FitupCreate, FitupUpdate
+from ..utils.bulk import bulk_changes, check_bulk_size
+from ..utils.pagination import AFTER_DESCRIPTION, SORT_DESCRIPTION, set_next_cursor
 
 router = APIRouter()
 
 @router.get("/", response_model=list[schemas.Fitup])
-def read_fitups(
+async def read_fitups(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    project_id: int = Query(None, description="Filter by project ID"),
-    status: str = Query(None, description="Filter by status"),
-    db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(get_current_active_user)
+    filters: schemas.FitupFilter = Depends(),
+    after: Optional[str] = Query(None, description=AFTER_DESCRIPTION),
+    sort: str = Query("id", description=SORT_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(get_current_active_user_async)
 ):
     """
     Retrieve fitups with optional filtering.
+    Every filter that is set narrows the result; `sort` orders it.
+    Without `skip`, pages are read by cursor: the X-Next-Cursor response header
+    is passed back as `after` to get the next page.
     """
-    if project_id:
-        fitups = fitup_crud.get_by_project(db, project_id=project_id, skip=skip, limit=limit)
-    elif status:
-        fitups = fitup_crud.get_by_status(db, status=status, skip=skip, limit=limit)
-    else:
-        fitups = fitup_crud.get_multi(db, skip=skip, limit=limit)
+    if skip and after:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="after cannot be combined with skip")
+    criteria = fitup_async_crud.filter_conditions(filters)
+    try:
+        if skip:
+            return await fitup_async_crud.get_multi_where(db, *criteria, skip=skip, limit=limit, sort=sort)
+        fitups, next_cursor = await fitup_async_crud.get_page(db, *criteria, after=after, limit=limit, sort=sort)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+    set_next_cursor(response, next_cursor)
     return fitups
 
 @router.post("/", response_model=schemas.Fitup)
@@ -76,16 +93,50 @@ def create_fitup(
     db.refresh(fitup_obj)
     return fitup_obj
 
-@router.get("/{fitup_id}", response_model=schemas.Fitup)
-def read_fitup(
-    fitup_id: int,
+@router.post("/bulk", response_model=schemas.BulkResult)
+def create_fitups_bulk(
+    fitups_in: List[FitupCreate],
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(get_current_active_user)
+):
+    """
+    Create many fitups in one request and one transaction.
+    Returns the new ids in request order; if any record fails, none is stored.
+    """
+    check_bulk_size(fitups_in)
+    ids = fitup_crud.create_many(db, fitups_in, chunk_size=settings.bulk_chunk_size, created_by=current_user.id)
+    return schemas.BulkResult(count=len(ids), ids=ids)
+
+@router.patch("/bulk", response_model=schemas.BulkResult)
+def update_fitups_bulk(
+    fitups_in: List[schemas.FitupBulkUpdate],
     db: Session = Depends(get_db),
     current_user: schemas.User = Depends(get_current_active_user)
+):
+    """
+    Partially update many fitups by id in one transaction.
+    Only the fields sent for a record change; an unknown id fails the whole request.
+    """
+    check_bulk_size(fitups_in)
+    try:
+        updated = fitup_crud.update_many(db, bulk_changes(fitups_in), chunk_size=settings.bulk_chunk_size)
+    except LookupError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc)
+        )
+    return schemas.BulkResult(count=len(updated), ids=[record.id for record in updated])
+
+@router.get("/{fitup_id}", response_model=schemas.Fitup)
+async def read_fitup(
+    fitup_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(get_current_active_user_async)
 ):
     """
     Get fitup by ID.
     """
-    fitup = fitup_crud.get(db, id=fitup_id)
+    fitup = await fitup_async_crud.get(db, id=fitup_id)
     if not fitup:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,186 @@
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status
+from sqlalchemy import select
+from pathlib import Path
+import shutil
+import uuid
+from typing import Optional
+
+from ..database import SessionLocal
+from ..core.config import settings
+from ..core.security import get_current_active_user
+from .. import schemas
+from ..crud.fitup import fitup as fitup_crud
+from ..crud.final_inspection import final_inspection as final_inspection_crud
+from ..crud.material import material as material_crud
+from ..models.project import Project
+from ..utils.columnar_stream import CSV_MEDIA_TYPE
+from ..utils.file_response import FILE_CHUNK_SIZE, ranged_file_response
+from ..utils.job_queue import Job, JobQueue, JobStatus
+from ..utils.spreadsheet_import import IMPORT_EXTENSIONS, import_rows, progress_unit
+from ..schemas.imports import ImportJob
+
+router = APIRouter()
+
+# kind -> (CRUD object, Create schema validating each row)
+IMPORTS = {
+    "fitup": (fitup_crud, schemas.FitupCreate),
+    "final": (final_inspection_crud, schemas.FinalInspectionCreate),
+    "material": (material_crud, schemas.MaterialCreate),
+}
+
+# Header spellings of shop line lists, weld logs and material certificates,
+# after normalize_header(), mapped to schema fields
+COLUMN_ALIASES = {
+    "drawing": "drawing_no",
+    "drawing_number": "drawing_no",
+    "line": "line_no",
+    "line_number": "line_no",
+    "spool": "spool_no",
+    "spool_number": "spool_no",
+    "joint": "joint_no",
+    "joint_number": "joint_no",
+    "welder": "welder_no",
+    "welder_id": "welder_no",
+    "wps": "wps_no",
+    "heat": "heat_no",
+    "heat_number": "heat_no",
+    "grade": "material_grade",
+}
+
+import_jobs = JobQueue(
+    settings.import_dir / "jobs",
+    max_workers=settings.import_workers,
+    ttl_seconds=settings.import_job_ttl_seconds,
+)
+
+
+def _render_import_job(kind: str, upload_path: Path, project_id: Optional[int], user_id: int):
+    """Return a job render function importing the uploaded file; its artifact is the error report."""
+    crud, schema = IMPORTS[kind]
+
+    def render(path: Path, progress):
+        db = SessionLocal()
+        try:
+            project_ids = set(db.scalars(select(Project.id)))
+            return import_rows(
+                db, crud, schema, upload_path,
+                errors_path=path,
+                aliases=COLUMN_ALIASES,
+                defaults={"project_id": project_id} if project_id is not None else None,
+                values={"created_by": user_id},
+                project_ids=project_ids,
+                batch_size=settings.import_batch_size,
+                progress=progress,
+            )
+        finally:
+            db.close()
+            upload_path.unlink(missing_ok=True)
+
+    return render
+
+
+def _get_job(job_id: str, current_user: schemas.User) -> Job:
+    """The import job, if the caller submitted it or is an admin; 404 otherwise."""
+    job = import_jobs.get(job_id)
+    if not job or (current_user.role != "admin" and current_user.id not in job.requested_by):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found"
+        )
+    return job
+
+
+def _job_out(job: Job) -> ImportJob:
+    summary = job.result or {}
+    return ImportJob(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        progress=round(job.progress, 4),
+        processed=job.done,
+        total=job.total,
+        progress_unit=job.progress_unit,
+        rows_processed=summary.get("rows"),
+        inserted=summary.get("inserted"),
+        failed=summary.get("failed"),
+        ignored_columns=summary.get("ignored_columns", []),
+        errors=summary.get("errors", []),
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        error_report_url=f"/import/jobs/{job.id}/errors" if job.status == JobStatus.COMPLETED else None,
+    )
+
+@router.post("/{kind}", response_model=ImportJob, status_code=status.HTTP_202_ACCEPTED)
+def create_import_job(
+    kind: str,
+    file: UploadFile = File(...),
+    project_id: Optional[int] = Query(None, description="Project of the rows that have no project_id column"),
+    current_user: schemas.User = Depends(get_current_active_user)
+):
+    """
+    Upload a CSV or XLSX file and import its rows in the background.
+    Columns are matched to fields by header name. Rows are validated and stored
+    a batch at a time; invalid rows are skipped and listed in the error report.
+    Poll GET /import/jobs/{id} for progress and the result.
+    """
+    if kind not in IMPORTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown import kind '{kind}'. Available: {', '.join(IMPORTS)}"
+        )
+    filename = Path(file.filename or "").name
+    suffix = Path(filename).suffix.lower()
+    if suffix not in IMPORT_EXTENSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported file type '{suffix}'. Use {', '.join(IMPORT_EXTENSIONS)}"
+        )
+
+    # Copy the upload to disk in chunks; the job reads it back row by row
+    upload_dir = settings.import_dir / "uploads"
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    upload_id = uuid.uuid4().hex
+    upload_path = upload_dir / f"{upload_id}{suffix}"
+    with open(upload_path, "wb") as f:
+        shutil.copyfileobj(file.file, f, FILE_CHUNK_SIZE)
+
+    job = import_jobs.submit(
+        key=f"import:{upload_id}",
+        kind=kind,
+        filename=f"{Path(filename).stem}_import_errors.csv",
+        media_type=CSV_MEDIA_TYPE,
+        render=_render_import_job(kind, upload_path, project_id, current_user.id),
+        created_by=current_user.id,
+        progress_unit=progress_unit(upload_path),
+    )
+    return _job_out(job)
+
+@router.get("/jobs/{job_id}", response_model=ImportJob)
+def read_import_job(
+    job_id: str,
+    current_user: schemas.User = Depends(get_current_active_user)
+):
+    """
+    Poll the status and progress of a background import.
+    """
+    job = _get_job(job_id, current_user)
+    return _job_out(job)
+
+@router.get("/jobs/{job_id}/errors")
+def download_import_errors(
+    job_id: str,
+    request: Request,
+    current_user: schemas.User = Depends(get_current_active_user)
+):
+    """
+    Download the error report (row, column, error) of a completed import as CSV.
+    """
+    job = _get_job(job_id, current_user)
+    if job.status != JobStatus.COMPLETED or not job.path:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Import job is {job.status}"
+        )
+    return ranged_file_response(job.path, job.media_type, job.filename, request.headers.get("range"))
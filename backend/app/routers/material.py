@@ -1,31 +1,48 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..database import get_db
-from ..core.security import get_current_active_user
+from ..database import get_async_db, get_db
+from ..core.config import settings
+from ..core.security import get_current_active_user, get_current_active_user_async
 from .. import schemas
-from ..crud.material import material as material_crud
+from ..crud.material import material as material_crud, material_async as material_async_crud
+from ..utils.bulk import bulk_changes, check_bulk_size
+from ..utils.pagination import AFTER_DESCRIPTION, SORT_DESCRIPTION, set_next_cursor
 
 router = APIRouter()
 
 @router.get("/", response_model=list[schemas.Material])
-def read_materials(
+async def read_materials(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    project_id: int = None,
-    status: str = None,
-    db: Session = Depends(get_db),
-    current_user: schemas.User = Depends(get_current_active_user)
+    filters: schemas.MaterialFilter = Depends(),
+    after: Optional[str] = Query(None, description=AFTER_DESCRIPTION),
+    sort: str = Query("id", description=SORT_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(get_current_active_user_async)
 ):
     """
-    Retrieve materials with optional filtering by project and status.
+    Retrieve materials with optional filtering.
+    Every filter that is set narrows the result; `sort` orders it.
+    Without `skip`, pages are read by cursor: the X-Next-Cursor response header
+    is passed back as `after` to get the next page.
     """
-    if project_id:
-        materials = material_crud.get_by_project(db, project_id=project_id, skip=skip, limit=limit)
-    elif status:
-        materials = material_crud.get_by_status(db, status=status, skip=skip, limit=limit)
-    else:
-        materials = material_crud.get_multi(db, skip=skip, limit=limit)
+    if skip and after:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="after cannot be combined with skip")
+    criteria = material_async_crud.filter_conditions(filters)
+    try:
+        if skip:
+            return await material_async_crud.get_multi_where(db, *criteria, skip=skip, limit=limit, sort=sort)
+        materials, next_cursor = await material_async_crud.get_page(db, *criteria, after=after, limit=limit, sort=sort)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+    set_next_cursor(response, next_cursor)
     return materials
 
 @router.post("/", response_model=schemas.Material)
@@ -66,16 +83,50 @@ def create_material(
     db.refresh(material_obj)
     return material_obj
 
-@router.get("/{material_id}", response_model=schemas.Material)
-def read_material(
-    material_id: int,
+@router.post("/bulk", response_model=schemas.BulkResult)
+def create_materials_bulk(
+    materials_in: List[schemas.MaterialCreate],
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(get_current_active_user)
+):
+    """
+    Create many material records in one request and one transaction.
+    Returns the new ids in request order; if any record fails, none is stored.
+    """
+    check_bulk_size(materials_in)
+    ids = material_crud.create_many(db, materials_in, chunk_size=settings.bulk_chunk_size, created_by=current_user.id)
+    return schemas.BulkResult(count=len(ids), ids=ids)
+
+@router.patch("/bulk", response_model=schemas.BulkResult)
+def update_materials_bulk(
+    materials_in: List[schemas.MaterialBulkUpdate],
     db: Session = Depends(get_db),
     current_user: schemas.User = Depends(get_current_active_user)
+):
+    """
+    Partially update many material records by id in one transaction.
+    Only the fields sent for a record change; an unknown id fails the whole request.
+    """
+    check_bulk_size(materials_in)
+    try:
+        updated = material_crud.update_many(db, bulk_changes(materials_in), chunk_size=settings.bulk_chunk_size)
+    except LookupError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc)
+        )
+    return schemas.BulkResult(count=len(updated), ids=[record.id for record in updated])
+
+@router.get("/{material_id}", response_model=schemas.Material)
+async def read_material(
+    material_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(get_current_active_user_async)
 ):
     """
     Get material by ID.
     """
-    material = material_crud.get(db, id=material_id)
+    material = await material_async_crud.get(db, id=material_id)
     if not material:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..database import get_db
-from ..core.security import get_current_active_user
+from ..database import get_async_db, get_db
+from ..core.config import settings
+from ..core.security import get_current_active_user, get_current_active_user_async
 from .. import schemas
-from ..crud.ndt_request import ndt_request as ndt_request_crud
+from ..crud.ndt_request import ndt_request as ndt_request_crud, ndt_request_async as ndt_request_async_crud
 from ..crud.final_inspection import final_inspection as final_inspection_crud
+from ..utils.bulk import bulk_changes, check_bulk_size
+from ..utils.pagination import AFTER_DESCRIPTION, SORT_DESCRIPTION, set_next_cursor
 
 router = APIRouter()
 
@@ -49,28 +54,81 @@ def create_ndt_request(
     return ndt_request_obj
 
 @router.get("/", response_model=list[schemas.NDTRequest])
-def read_ndt_requests(
+async def read_ndt_requests(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    filters: schemas.NDTRequestFilter = Depends(),
+    after: Optional[str] = Query(None, description=AFTER_DESCRIPTION),
+    sort: str = Query("id", description=SORT_DESCRIPTION),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(get_current_active_user_async)
+):
+    """
+    Retrieve NDT requests with optional filtering.
+    Every filter that is set narrows the result; `sort` orders it.
+    Without `skip`, pages are read by cursor: the X-Next-Cursor response header
+    is passed back as `after` to get the next page.
+    """
+    if skip and after:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="after cannot be combined with skip")
+    criteria = ndt_request_async_crud.filter_conditions(filters)
+    try:
+        if skip:
+            return await ndt_request_async_crud.get_multi_where(db, *criteria, skip=skip, limit=limit, sort=sort)
+        ndt_requests, next_cursor = await ndt_request_async_crud.get_page(db, *criteria, after=after, limit=limit, sort=sort)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+    set_next_cursor(response, next_cursor)
+    return ndt_requests
+
+@router.post("/bulk", response_model=schemas.BulkResult)
+def create_ndt_requests_bulk(
+    ndt_requests_in: List[schemas.NDTRequestCreate],
     db: Session = Depends(get_db),
     current_user: schemas.User = Depends(get_current_active_user)
 ):
     """
-    Retrieve NDT requests.
+    Create many NDT request records in one request and one transaction.
+    Returns the new ids in request order; if any record fails, none is stored.
     """
-    ndt_requests = ndt_request_crud.get_multi(db, skip=skip, limit=limit)
-    return ndt_requests
+    check_bulk_size(ndt_requests_in)
+    ids = ndt_request_crud.create_many(db, ndt_requests_in, chunk_size=settings.bulk_chunk_size, created_by=current_user.id)
+    return schemas.BulkResult(count=len(ids), ids=ids)
 
-@router.get("/{request_id}", response_model=schemas.NDTRequest)
-def read_ndt_request(
-    request_id: int,
+@router.patch("/bulk", response_model=schemas.BulkResult)
+def update_ndt_requests_bulk(
+    ndt_requests_in: List[schemas.NDTRequestBulkUpdate],
     db: Session = Depends(get_db),
     current_user: schemas.User = Depends(get_current_active_user)
+):
+    """
+    Partially update many NDT request records by id in one transaction.
+    Only the fields sent for a record change; an unknown id fails the whole request.
+    """
+    check_bulk_size(ndt_requests_in)
+    try:
+        updated = ndt_request_crud.update_many(db, bulk_changes(ndt_requests_in), chunk_size=settings.bulk_chunk_size)
+    except LookupError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc)
+        )
+    return schemas.BulkResult(count=len(updated), ids=[record.id for record in updated])
+
+@router.get("/{request_id}", response_model=schemas.NDTRequest)
+async def read_ndt_request(
+    request_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(get_current_active_user_async)
 ):
     """
     Get NDT request by ID.
     """
-    ndt_request = ndt_request_crud.get(db, id=request_id)
+    ndt_request = await ndt_request_async_crud.get(db, id=request_id)
     if not ndt_request:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
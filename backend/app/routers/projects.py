@@ -1,17 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
+from typing import Optional
 
 from .. import models, schemas
 from ..crud import project_crud
 from ..database import get_db
 from ..core.security import get_current_active_user, get_current_admin_user
+from ..utils.pagination import AFTER_DESCRIPTION, SORT_DESCRIPTION, set_next_cursor
 
 router = APIRouter()
 
 @router.get("/", response_model=list[schemas.Project])
 def read_projects(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    after: Optional[str] = Query(None, description=AFTER_DESCRIPTION),
+    sort: str = Query("id", description=SORT_DESCRIPTION),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user)
 ):
@@ -19,13 +24,23 @@ def read_projects(
     Retrieve projects.
     - Admin users see all projects
     - Non-admin users only see projects they are assigned to
+    Without `skip`, pages are read by cursor: the X-Next-Cursor response header
+    is passed back as `after` to get the next page.
     """
-    if current_user.role == "admin":
-        # Admin users can see all projects
-        projects = project_crud.get_multi(db, skip=skip, limit=limit)
-    else:
-        # Non-admin users only see projects they are assigned to
-        projects = project_crud.get_projects_by_user(db, user_id=current_user.id, skip=skip, limit=limit)
+    if skip and after:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="after cannot be combined with skip")
+    # Admin users see all projects, others only the projects they are assigned to
+    criteria = [] if current_user.role == "admin" else [project_crud.visible_to(current_user.id)]
+    try:
+        if skip:
+            return project_crud.get_multi_where(db, *criteria, skip=skip, limit=limit, sort=sort)
+        projects, next_cursor = project_crud.get_page(db, *criteria, after=after, limit=limit, sort=sort)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+    set_next_cursor(response, next_cursor)
     return projects
 
 @router.post("/", response_model=schemas.Project)
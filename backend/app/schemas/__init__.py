@@ -1,15 +1,17 @@
 from .projects import Project, ProjectCreate, ProjectUpdate
 from .user import User, UserCreate, UserUpdate, UserPasswordUpdate
-from .material import Material, MaterialCreate, MaterialUpdate
-from .fitup import Fitup, FitupCreate, FitupUpdate
-from .final_inspection import FinalInspection, FinalInspectionCreate, FinalInspectionUpdate
-from .ndt_request import NDTRequest, NDTRequestCreate, NDTRequestUpdate
+from .material import Material, MaterialCreate, MaterialUpdate, MaterialBulkUpdate, MaterialFilter
+from .fitup import Fitup, FitupCreate, FitupUpdate, FitupBulkUpdate, FitupFilter
+from .final_inspection import FinalInspection, FinalInspectionCreate, FinalInspectionUpdate, FinalInspectionBulkUpdate, FinalInspectionFilter
+from .ndt_request import NDTRequest, NDTRequestCreate, NDTRequestUpdate, NDTRequestBulkUpdate, NDTRequestFilter
+from .bulk import BulkResult
 
 __all__ = [
     "Project", "ProjectCreate", "ProjectUpdate",
     "User", "UserCreate", "UserUpdate",
-    "Material", "MaterialCreate", "MaterialUpdate",
-    "Fitup", "FitupCreate", "FitupUpdate",
-    "FinalInspection", "FinalInspectionCreate", "FinalInspectionUpdate",
-    "NDTRequest", "NDTRequestCreate", "NDTRequestUpdate"
+    "Material", "MaterialCreate", "MaterialUpdate", "MaterialBulkUpdate", "MaterialFilter",
+    "Fitup", "FitupCreate", "FitupUpdate", "FitupBulkUpdate", "FitupFilter",
+    "FinalInspection", "FinalInspectionCreate", "FinalInspectionUpdate", "FinalInspectionBulkUpdate", "FinalInspectionFilter",
+    "NDTRequest", "NDTRequestCreate", "NDTRequestUpdate", "NDTRequestBulkUpdate", "NDTRequestFilter",
+    "BulkResult"
 ]
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class BulkResult(BaseModel):
+    """Ids of the records created or updated by a bulk request, in request order."""
+    count: int
+    ids: List[int]
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from typing import List, Optional
-from datetime import date
+from datetime import date, datetime
 
 class PDFExportRequest(BaseModel):
     """Schema for PDF export requests"""
@@ -14,3 +14,32 @@ class PDFExportRequest(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class PDFBatchExportRequest(BaseModel):
+    """Schema for rendering one PDF per report number of a project"""
+    project_id: int
+    report_types: List[str] = ["fitup", "final"]
+    report_nos: Optional[List[str]] = None
+    location: str = ""
+    inspector: Optional[str] = None
+
+
+class ExportJobCreate(BaseModel):
+    """Schema for queuing a background Excel export"""
+    kind: str = "comprehensive"
+
+
+class ExportJob(BaseModel):
+    """Status of a background export job"""
+    id: str
+    kind: str
+    status: str
+    progress: float
+    rows_written: int
+    total_rows: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    download_url: Optional[str] = None
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from datetime import date
+from typing import Literal, Optional
+
+# Approval state of a fit-up or final inspection, as counted on the dashboard
+Approval = Literal["approved", "rejected", "pending"]
+
+class InspectionFilterBase(BaseModel):
+    """
+    Query-string filters of the inspection list endpoints. Unset fields do not
+    filter; `status` takes one status or several separated by commas.
+    """
+    project_id: Optional[int] = None
+    status: Optional[str] = None
+    created_from: Optional[date] = None
+    created_to: Optional[date] = None
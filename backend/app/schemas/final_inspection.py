@@ -2,6 +2,8 @@ from pydantic import BaseModel
 from datetime import date
 from typing import Optional
 
+from .filters import Approval, InspectionFilterBase
+
 class FinalInspectionBase(BaseModel):
     project_id: int
     drawing_no: Optional[str] = None
@@ -55,6 +57,9 @@ class FinalInspectionUpdate(BaseModel):
     status: Optional[str] = None
     is_approved: Optional[bool] = None
 
+class FinalInspectionBulkUpdate(FinalInspectionUpdate):
+    id: int
+
 class FinalInspection(FinalInspectionBase):
     id: int
     is_approved: bool
@@ -66,3 +71,12 @@ class FinalInspection(FinalInspectionBase):
 
     class Config:
         from_attributes = True
+
+class FinalInspectionFilter(InspectionFilterBase):
+    approval: Optional[Approval] = None
+    line_no: Optional[str] = None
+    spool_no: Optional[str] = None
+    joint_no: Optional[str] = None
+    welder_no: Optional[str] = None
+    inspection_from: Optional[date] = None
+    inspection_to: Optional[date] = None
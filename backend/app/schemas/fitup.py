@@ -2,6 +2,8 @@ from pydantic import BaseModel
 from datetime import date
 from typing import Optional
 
+from .filters import Approval, InspectionFilterBase
+
 class FitupBase(BaseModel):
     project_id: int
     drawing_no: Optional[str] = None
@@ -45,6 +47,9 @@ class FitupUpdate(BaseModel):
     status: Optional[str] = None
     is_approved: Optional[bool] = None
 
+class FitupBulkUpdate(FitupUpdate):
+    id: int
+
 class Fitup(FitupBase):
     id: int
     is_approved: bool
@@ -56,3 +61,11 @@ class Fitup(FitupBase):
 
     class Config:
         from_attributes = True
+
+class FitupFilter(InspectionFilterBase):
+    approval: Optional[Approval] = None
+    line_no: Optional[str] = None
+    spool_no: Optional[str] = None
+    joint_no: Optional[str] = None
+    inspection_from: Optional[date] = None
+    inspection_to: Optional[date] = None
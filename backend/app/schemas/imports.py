@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+class ImportRowError(BaseModel):
+    """A row of an uploaded spreadsheet that was not imported"""
+    row: int
+    column: Optional[str] = None
+    message: str
+
+
+class ImportJob(BaseModel):
+    """Status of a background spreadsheet import"""
+    id: str
+    kind: str
+    status: str
+    progress: float
+    # How far the upload has been read, in progress_unit: bytes of a CSV file, rows of an XLSX sheet
+    processed: int
+    total: Optional[int] = None
+    progress_unit: str
+    # Set once the import has finished
+    rows_processed: Optional[int] = None
+    inserted: Optional[int] = None
+    failed: Optional[int] = None
+    ignored_columns: List[str] = []
+    errors: List[ImportRowError] = []
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error_report_url: Optional[str] = None
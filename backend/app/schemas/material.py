@@ -2,6 +2,8 @@ from pydantic import BaseModel
 from datetime import date
 from typing import Optional
 
+from .filters import InspectionFilterBase
+
 class MaterialBase(BaseModel):
     project_id: int
     material_type: str
@@ -28,6 +30,9 @@ class MaterialUpdate(BaseModel):
     material_report_no: Optional[str] = None
     status: Optional[str] = None
 
+class MaterialBulkUpdate(MaterialUpdate):
+    id: int
+
 class Material(MaterialBase):
     id: int
     created_by: int
@@ -36,3 +41,9 @@ class Material(MaterialBase):
 
     class Config:
         from_attributes = True
+
+class MaterialFilter(InspectionFilterBase):
+    material_type: Optional[str] = None
+    heat_no: Optional[str] = None
+    inspection_from: Optional[date] = None
+    inspection_to: Optional[date] = None
@@ -2,6 +2,8 @@ from pydantic import BaseModel
 from datetime import date
 from typing import Optional
 
+from .filters import InspectionFilterBase
+
 class NDTRequestBase(BaseModel):
     project_id: int
     line_no: Optional[str] = None
@@ -31,6 +33,9 @@ class NDTRequestUpdate(BaseModel):
     status: Optional[str] = None
     is_completed: Optional[bool] = None
 
+class NDTRequestBulkUpdate(NDTRequestUpdate):
+    id: int
+
 class NDTRequest(NDTRequestBase):
     id: int
     is_completed: bool
@@ -42,3 +47,12 @@ class NDTRequest(NDTRequestBase):
 
     class Config:
         from_attributes = True
+
+class NDTRequestFilter(InspectionFilterBase):
+    line_no: Optional[str] = None
+    spool_no: Optional[str] = None
+    joint_no: Optional[str] = None
+    welder_no: Optional[str] = None
+    ndt_method: Optional[str] = None
+    requested_from: Optional[date] = None
+    requested_to: Optional[date] = None
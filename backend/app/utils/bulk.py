@@ -0,0 +1,26 @@
+"""
+Shared pieces of the bulk create/update endpoints (POST and PATCH /<table>/bulk).
+
+A bulk request is validated as a whole by its list schema, then written in one
+transaction through CRUDBase.create_many / update_many, so either every record
+is stored or none is.
+"""
+from typing import Any, Dict, List, Sequence, Tuple
+
+from fastapi import HTTPException, status
+
+from ..core.config import settings
+
+
+def check_bulk_size(items: Sequence[Any]):
+    """Reject bulk payloads larger than BULK_MAX_ITEMS."""
+    if len(items) > settings.bulk_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.bulk_max_items} records per bulk request"
+        )
+
+
+def bulk_changes(items: Sequence[Any]) -> List[Tuple[int, Dict[str, Any]]]:
+    """(id, fields sent for that record) pairs of a bulk update payload."""
+    return [(item.id, item.model_dump(exclude_unset=True, exclude={"id"})) for item in items]
@@ -0,0 +1,87 @@
+"""
+Streaming CSV, Parquet and Arrow IPC writers for bulk table extracts.
+
+Each writer consumes an iterable of row chunks (lists of tuples) and yields
+encoded byte chunks, so extracts are produced with bounded memory.
+"""
+import csv
+import io
+from typing import Any, Iterable, Iterator, List, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, Numeric, String, Text
+
+from .xlsx_stream import ChunkBuffer
+
+CSV_MEDIA_TYPE = "text/csv"
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+RowChunks = Iterable[Sequence[Tuple[Any, ...]]]
+
+
+def arrow_type(column_type) -> pa.DataType:
+    """Map a SQLAlchemy column type onto the matching Arrow type."""
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, (Float, Numeric)):
+        return pa.float64()
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(column_type, Date):
+        return pa.date32()
+    if isinstance(column_type, (String, Text)):
+        return pa.string()
+    return pa.string()
+
+
+def arrow_schema(fields: Sequence[Tuple[str, Any]]) -> pa.Schema:
+    """Build an Arrow schema from (name, SQLAlchemy column type) pairs."""
+    return pa.schema([pa.field(name, arrow_type(column_type)) for name, column_type in fields])
+
+
+def _record_batch(schema: pa.Schema, rows: Sequence[Tuple[Any, ...]]) -> pa.RecordBatch:
+    columns = list(zip(*rows)) if rows else [[] for _ in schema]
+    arrays = [pa.array(list(values), type=field.type) for values, field in zip(columns, schema)]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def stream_csv(headers: Sequence[str], chunks: RowChunks) -> Iterator[bytes]:
+    """Yield a CSV document, one encoded chunk per row chunk."""
+    text = io.StringIO()
+    writer = csv.writer(text)
+    writer.writerow(headers)
+    for rows in chunks:
+        writer.writerows(rows)
+        yield text.getvalue().encode("utf-8")
+        text.seek(0)
+        text.truncate()
+    if text.tell():
+        yield text.getvalue().encode("utf-8")
+
+
+def stream_arrow(schema: pa.Schema, chunks: RowChunks) -> Iterator[bytes]:
+    """Yield an Arrow IPC stream with one record batch per row chunk."""
+    sink = ChunkBuffer()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        for rows in chunks:
+            writer.write_batch(_record_batch(schema, rows))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def stream_parquet(schema: pa.Schema, chunks: RowChunks) -> Iterator[bytes]:
+    """Yield a Parquet file with one row group per row chunk; the footer comes last."""
+    sink = ChunkBuffer()
+    writer = pq.ParquetWriter(sink, schema, compression="snappy")
+    try:
+        for rows in chunks:
+            writer.write_batch(_record_batch(schema, rows))
+            if sink.pending:
+                yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
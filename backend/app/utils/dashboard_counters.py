@@ -0,0 +1,211 @@
+"""
+Incrementally maintained dashboard counters.
+
+Every flush that inserts, updates or deletes a project, material, fit-up, final
+inspection or NDT request adjusts the matching dashboard_counters rows inside the
+same transaction. Dashboard reads then scale with the number of projects and days
+instead of the number of records. rebuild_counters() recomputes the whole table,
+for backfills or after writes that bypassed the ORM.
+
+Once such a transaction commits, the listeners registered with
+add_change_listener() are told which projects changed, and those registered with
+add_delta_listener() receive the net counter changes.
+"""
+import logging
+from collections import Counter
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import delete, event, exists, inspect, insert, literal, select, func
+from sqlalchemy.orm import Session
+
+from ..models.dashboard_counter import DashboardCounter
+from ..models.fitup import Fitup
+from ..models.final_inspection import FinalInspection
+from ..models.ndt_request import NDTRequest
+from ..models.material import Material
+from ..models.project import Project
+from .sql_helpers import upsert_increment
+
+logger = logging.getLogger(__name__)
+
+_COUNTER_TABLE = DashboardCounter.__table__
+
+# session.info key collecting the counter changes of the current transaction
+_PENDING_DELTAS = "dashboard_counter_deltas"
+
+KEY_COLUMNS = ("project_id", "entity", "status", "approval", "day")
+
+# (project_id, entity, status, approval, day)
+CounterKey = Tuple[int, str, str, str, date]
+
+_change_listeners: List[Callable[[Set[int]], None]] = []
+_delta_listeners: List[Callable[[Dict[CounterKey, int]], None]] = []
+
+
+class CountedEntity(NamedTuple):
+    name: str
+    project_attr: str  # attribute holding the project id ("id" for projects themselves)
+    has_approval: bool
+
+
+COUNTED_MODELS = {
+    Project: CountedEntity("projects", "id", False),
+    Material: CountedEntity("materials", "project_id", False),
+    Fitup: CountedEntity("fitups", "project_id", True),
+    FinalInspection: CountedEntity("final_inspections", "project_id", True),
+    NDTRequest: CountedEntity("ndt_requests", "project_id", False),
+}
+
+
+def approval_label(is_approved: Optional[bool]) -> str:
+    if is_approved is None:
+        return "pending"
+    return "approved" if is_approved else "rejected"
+
+
+def counter_key(
+    entity: CountedEntity,
+    project_id: Optional[int],
+    status: Optional[str],
+    is_approved: Optional[bool],
+    created_at: Any,
+) -> CounterKey:
+    day = created_at.date() if isinstance(created_at, datetime) else created_at
+    return (
+        project_id or 0,
+        entity.name,
+        status or "",
+        approval_label(is_approved) if entity.has_approval else "",
+        day or date.min,
+    )
+
+
+def _tracked_attrs(entity: CountedEntity):
+    # The models map these columns with active_history=True, so their previous value
+    # is loaded when they are set, even on an expired instance
+    attrs = [entity.project_attr, "status", "created_at"]
+    if entity.has_approval:
+        attrs.append("is_approved")
+    return attrs
+
+
+def _object_key(obj, entity: CountedEntity, previous: bool = False) -> CounterKey:
+    """Counter key of an object's current values, or of its values before this flush."""
+    state = inspect(obj)
+    values = {}
+    for attr in _tracked_attrs(entity):
+        history = state.attrs[attr].history
+        if previous and history.deleted:
+            values[attr] = history.deleted[0]
+        else:
+            values[attr] = getattr(obj, attr)
+    return counter_key(
+        entity, values[entity.project_attr], values["status"], values.get("is_approved"), values["created_at"]
+    )
+
+
+def _counter_deltas(session: Session) -> Dict[CounterKey, int]:
+    deltas: Counter = Counter()
+    for obj in session.new:
+        entity = COUNTED_MODELS.get(type(obj))
+        if entity:
+            deltas[_object_key(obj, entity)] += 1
+    for obj in session.deleted:
+        entity = COUNTED_MODELS.get(type(obj))
+        if entity:
+            deltas[_object_key(obj, entity, previous=True)] -= 1
+    for obj in session.dirty:
+        entity = COUNTED_MODELS.get(type(obj))
+        if entity and session.is_modified(obj, include_collections=False):
+            old_key = _object_key(obj, entity, previous=True)
+            new_key = _object_key(obj, entity)
+            if old_key != new_key:
+                deltas[old_key] -= 1
+                deltas[new_key] += 1
+    return {key: delta for key, delta in deltas.items() if delta}
+
+
+@event.listens_for(Session, "after_flush")
+def _update_dashboard_counters(session: Session, flush_context):
+    deltas = _counter_deltas(session)
+    if not deltas:
+        return
+    connection = session.connection()
+    # Sorted so concurrent transactions take the row locks in the same order
+    for key in sorted(deltas):
+        upsert_increment(connection, _COUNTER_TABLE, dict(zip(KEY_COLUMNS, key)), "count", amount=deltas[key])
+    session.info.setdefault(_PENDING_DELTAS, Counter()).update(deltas)
+
+
+def add_change_listener(listener: Callable[[Set[int]], None]):
+    """
+    Call `listener` with the ids of the projects whose dashboard figures changed,
+    after every commit that changed any.
+    """
+    _change_listeners.append(listener)
+
+
+def add_delta_listener(listener: Callable[[Dict[CounterKey, int]], None]):
+    """
+    Call `listener` with the net counter changes ({counter key: delta}) of every
+    commit that changed any.
+    """
+    _delta_listeners.append(listener)
+
+
+def _notify(listeners, argument):
+    for listener in listeners:
+        try:
+            listener(argument)
+        except Exception:
+            logger.exception("Dashboard change listener %r failed", listener)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_change_listeners(session: Session):
+    pending = session.info.pop(_PENDING_DELTAS, None)
+    deltas = {key: delta for key, delta in (pending or {}).items() if delta}
+    if not deltas:
+        return
+    _notify(_change_listeners, {key[0] for key in deltas})
+    _notify(_delta_listeners, deltas)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_deltas(session: Session):
+    session.info.pop(_PENDING_DELTAS, None)
+
+
+def rebuild_counters(db: Session) -> int:
+    """
+    Recompute dashboard_counters from the source tables and commit.
+    Returns the number of counter rows written.
+    """
+    totals: Counter = Counter()
+    for model, entity in COUNTED_MODELS.items():
+        project_column = getattr(model, entity.project_attr)
+        grouped = [project_column, model.status, model.created_at]
+        if entity.has_approval:
+            grouped.append(model.is_approved)
+        approval = model.is_approved if entity.has_approval else literal(None)
+        stmt = select(project_column, model.status, approval, model.created_at, func.count()).group_by(*grouped)
+        for project_id, status, is_approved, created_at, count in db.execute(stmt):
+            totals[counter_key(entity, project_id, status, is_approved, created_at)] += count
+
+    db.execute(delete(DashboardCounter))
+    rows = [{**dict(zip(KEY_COLUMNS, key)), "count": count} for key, count in sorted(totals.items()) if count]
+    if rows:
+        db.execute(insert(DashboardCounter), rows)
+    db.commit()
+    return len(rows)
+
+
+def counters_need_rebuild(db: Session) -> bool:
+    """True when the counters table is empty although there are records to count."""
+    if db.execute(select(exists().select_from(DashboardCounter))).scalar():
+        return False
+    return any(
+        db.execute(select(exists().select_from(model))).scalar()
+        for model in COUNTED_MODELS
+    )
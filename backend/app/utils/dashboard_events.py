@@ -0,0 +1,117 @@
+"""
+In-process publish/subscribe for live dashboard updates.
+
+Each committed change to the dashboard counters is turned into one event and
+fanned out to every subscriber (one per open /dashboard/stream connection), so a
+write costs the same however many dashboards are watching. Recent events are kept
+for clients that reconnect with a Last-Event-ID header.
+
+Event ids are "<stream id>:<sequence>", where the stream id is unique to this
+broker. An id from another process or from before a restart cannot be resumed
+from; such clients get a "reset" event and reload the full statistics, as do
+clients that fell further behind than the replay buffer or their queue allows.
+"""
+import asyncio
+import json
+import threading
+import uuid
+from collections import deque
+from typing import Any, Deque, List, NamedTuple, Optional, Set, Tuple
+
+
+class ServerSentEvent(NamedTuple):
+    id: str
+    event: str
+    data: str
+
+    def encode(self) -> str:
+        return f"id: {self.id}\nevent: {self.event}\ndata: {self.data}\n\n"
+
+
+class Subscription:
+    """Queue of events for one subscriber, fed from any thread."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_queue: int, last_id: str):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(max_queue)
+        # Set when events had to be dropped because the subscriber fell behind
+        self.overflowed = False
+        # Id of the last event delivered or skipped, for reset events
+        self.last_id = last_id
+
+    def _put(self, event: ServerSentEvent):
+        # Runs on the subscriber's event loop
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    def drain(self) -> str:
+        """Drop the queued events; returns the id the subscriber is now at."""
+        while not self.queue.empty():
+            self.last_id = self.queue.get_nowait().id
+        self.overflowed = False
+        return self.last_id
+
+
+class EventBroker:
+    def __init__(self, replay_size: int = 1000, max_queue: int = 1000):
+        self.stream_id = uuid.uuid4().hex[:8]
+        self.max_queue = max_queue
+        self._sequence = 0
+        self._history: Deque[Tuple[int, ServerSentEvent]] = deque(maxlen=replay_size)
+        self._subscribers: Set[Subscription] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def last_event_id(self) -> str:
+        return f"{self.stream_id}:{self._sequence}"
+
+    def publish(self, event: str, payload: Any) -> str:
+        """Broadcast an event to every subscriber; safe to call from any thread."""
+        data = json.dumps(payload, default=str)
+        # The id is assigned and the event queued under one lock, so concurrent
+        # publishers reach every subscriber in id order
+        with self._lock:
+            self._sequence += 1
+            sse = ServerSentEvent(f"{self.stream_id}:{self._sequence}", event, data)
+            self._history.append((self._sequence, sse))
+            for subscription in list(self._subscribers):
+                try:
+                    subscription.loop.call_soon_threadsafe(subscription._put, sse)
+                except RuntimeError:
+                    # The subscriber's event loop is closed
+                    self._subscribers.discard(subscription)
+        return sse.id
+
+    def _sequence_of(self, event_id: Optional[str]) -> Optional[int]:
+        stream_id, _, sequence = (event_id or "").partition(":")
+        if stream_id != self.stream_id or not sequence.isdigit():
+            return None
+        return int(sequence)
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Tuple[Subscription, Optional[List[ServerSentEvent]]]:
+        """
+        Register a subscriber on the running event loop. Returns the subscription
+        and the events to replay first: those after `last_event_id`, or None when
+        they can no longer be replayed and the client must reload.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            subscription = Subscription(loop, self.max_queue, self.last_event_id)
+            self._subscribers.add(subscription)
+            if last_event_id is None:
+                return subscription, []
+            sequence = self._sequence_of(last_event_id)
+            if sequence is None or sequence > self._sequence:
+                return subscription, None
+            if sequence < self._sequence and (not self._history or self._history[0][0] > sequence + 1):
+                return subscription, None
+            return subscription, [sse for number, sse in self._history if number > sequence]
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
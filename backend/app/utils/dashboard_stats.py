@@ -0,0 +1,453 @@
+"""
+Dashboard statistics.
+
+By default the figures come from the incrementally maintained dashboard_counters
+table (see dashboard_counters.py), so a request reads a few rows per project
+rather than every record. With DASHBOARD_USE_COUNTERS off, each table is read in a
+single pass instead: conditional aggregates (SUM(CASE ...)) give the status and
+approval breakdowns and the recent-activity counts, and grouping the same scan by
+month gives the trend series.
+
+Trend series are bucketed with range predicates on created_at (CASE WHEN
+created_at < <edge> ...) whose edges are computed here, so the same SQL runs on
+SQLite and PostgreSQL and the date filter can use the created_at indexes.
+"""
+from bisect import bisect_right
+from collections import Counter
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import DateTime, case, func, null, select
+from sqlalchemy.orm import Session
+
+from ..models.fitup import Fitup
+from ..models.final_inspection import FinalInspection
+from ..models.ndt_request import NDTRequest
+from ..models.material import Material
+from ..models.project import Project
+from ..models.dashboard_counter import DashboardCounter
+from ..core.config import settings
+from .dashboard_counters import COUNTED_MODELS
+
+NDT_STATUSES = ["pending", "in_progress", "completed", "failed"]
+MATERIAL_STATUSES = ["available", "reserved", "used"]
+PROJECT_STATUSES = ["active", "completed", "on_hold"]
+APPROVAL_LABELS = ["approved", "rejected", "pending"]
+
+ENTITY_STATUSES = {
+    "ndt_requests": NDT_STATUSES,
+    "materials": MATERIAL_STATUSES,
+    "projects": PROJECT_STATUSES,
+}
+
+RECENT_ACTIVITY_DAYS = 7
+TREND_DAYS = 90
+
+GRANULARITIES = ("day", "week", "month")
+TREND_ENTITIES = ("fitups", "final_inspections", "ndt_requests")
+# Upper bound on the buckets of one trend request (a year of days)
+MAX_TREND_BUCKETS = 366
+
+ENTITY_MODELS = {entity.name: model for model, entity in COUNTED_MODELS.items()}
+
+
+def _count_if(condition):
+    return func.sum(case((condition, 1), else_=0))
+
+
+def _approval_measures(model) -> Dict[str, Any]:
+    return {
+        "approved": _count_if(model.is_approved == True),
+        "rejected": _count_if(model.is_approved == False),
+        "pending": _count_if(model.is_approved == None),
+    }
+
+
+def _status_measures(model, statuses: List[str]) -> Dict[str, Any]:
+    return {status: _count_if(model.status == status) for status in statuses}
+
+
+def bucket_start(day: date, granularity: str) -> date:
+    """First day of the day / ISO week (Monday) / month bucket holding `day`."""
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _next_bucket(start: date, granularity: str) -> date:
+    if granularity == "week":
+        return start + timedelta(days=7)
+    if granularity == "month":
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def trend_buckets(start: date, end: date, granularity: str) -> Tuple[List[date], List[date]]:
+    """
+    Buckets covering the days `start`..`end` (inclusive). Returns (labels, edges):
+    labels are the bucket start days, and bucket i holds start <= day < edges[i + 1]
+    clipped to the requested range, i.e. edges[0] is `start` and edges[-1] the day
+    after `end`. Raises ValueError for an invalid range or granularity.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity '{granularity}'. Available: {', '.join(GRANULARITIES)}")
+    if start > end:
+        raise ValueError("'from' must not be after 'to'")
+    labels = [bucket_start(start, granularity)]
+    while _next_bucket(labels[-1], granularity) <= end:
+        labels.append(_next_bucket(labels[-1], granularity))
+        if len(labels) > MAX_TREND_BUCKETS:
+            raise ValueError(f"Too many {granularity} buckets; at most {MAX_TREND_BUCKETS} are allowed")
+    edges = [start, *labels[1:], end + timedelta(days=1)]
+    return labels, edges
+
+
+def _edge_value(model, day: date):
+    """Bucket edge comparable with `model.created_at` (Date or DateTime)."""
+    if isinstance(model.created_at.type, DateTime):
+        return datetime.combine(day, time.min)
+    return day
+
+
+def _bucket_index(model, edges: Sequence[date]):
+    """
+    SQL expression giving the index of the bucket holding `model.created_at`, or
+    NULL outside edges[0]..edges[-1]. Only range comparisons are used.
+    """
+    column = model.created_at
+    whens = [(column < _edge_value(model, edges[0]), null())]
+    whens += [(column < _edge_value(model, edge), index) for index, edge in enumerate(edges[1:])]
+    return case(*whens, else_=null())
+
+
+def _table_pass(
+    db: Session,
+    model,
+    measures: Dict[str, Any],
+    trend_edges: Optional[Sequence[date]] = None,
+    where=None,
+) -> Tuple[Dict[str, int], Dict[int, int]]:
+    """
+    Run one aggregate query over `model` (restricted by `where`, if given).
+    Returns the totals of every measure (plus `total`) and, when `trend_edges` is
+    given, the number of rows created in each bucket, keyed by bucket index.
+    """
+    columns = [func.count(model.id).label("total")]
+    columns += [expression.label(name) for name, expression in measures.items()]
+    stmt = select(*columns)
+    if trend_edges is not None:
+        bucket = _bucket_index(model, trend_edges).label("bucket")
+        stmt = select(bucket, *columns).group_by(bucket)
+    if where is not None:
+        stmt = stmt.where(where)
+
+    totals = {name: 0 for name in ["total", *measures]}
+    buckets = {}
+    for row in db.execute(stmt):
+        values = row._mapping
+        for name in totals:
+            totals[name] += values[name] or 0
+        if trend_edges is not None and values["bucket"] is not None:
+            buckets[values["bucket"]] = values["total"]
+    return totals, buckets
+
+
+def _scan_results(
+    db: Session, recent: date, trend_edges: Sequence[date]
+) -> Dict[str, Tuple[Dict[str, int], Dict[int, int]]]:
+    """Per-entity totals and trend buckets computed directly from the record tables."""
+    def recent_measure(model):
+        return {"recent": _count_if(model.created_at >= recent)}
+
+    return {
+        "fitups": _table_pass(
+            db, Fitup, {**_approval_measures(Fitup), **recent_measure(Fitup)}, trend_edges
+        ),
+        "final_inspections": _table_pass(
+            db, FinalInspection, {**_approval_measures(FinalInspection), **recent_measure(FinalInspection)}, trend_edges
+        ),
+        "ndt_requests": _table_pass(
+            db, NDTRequest, {**_status_measures(NDTRequest, NDT_STATUSES), **recent_measure(NDTRequest)}, trend_edges
+        ),
+        "materials": _table_pass(
+            db, Material, {**_status_measures(Material, MATERIAL_STATUSES), **recent_measure(Material)}
+        ),
+        "projects": _table_pass(db, Project, _status_measures(Project, PROJECT_STATUSES)),
+    }
+
+
+def _counter_results(
+    db: Session,
+    recent: Optional[date] = None,
+    trend_edges: Optional[Sequence[date]] = None,
+) -> Dict[str, Tuple[Dict[str, int], Dict[int, int]]]:
+    """
+    The same totals and trend buckets as _scan_results, read from dashboard_counters
+    in one query. Only days from the start of the trend window on are kept apart;
+    older counters are summed by the database.
+    """
+    columns = [DashboardCounter.entity, DashboardCounter.status, DashboardCounter.approval]
+    if trend_edges is not None:
+        columns.append(
+            case((DashboardCounter.day >= trend_edges[0], DashboardCounter.day), else_=None).label("day")
+        )
+    stmt = select(*columns, func.sum(DashboardCounter.count).label("count")).group_by(*columns)
+
+    results = {}
+    for entity in COUNTED_MODELS.values():
+        names = APPROVAL_LABELS if entity.has_approval else ENTITY_STATUSES.get(entity.name, [])
+        results[entity.name] = ({name: 0 for name in ["total", "recent", *names]}, Counter())
+
+    for row in db.execute(stmt):
+        if row.entity not in results or not row.count:
+            continue
+        totals, buckets = results[row.entity]
+        totals["total"] += row.count
+        label = row.approval or row.status
+        if label in totals and label not in ("total", "recent"):
+            totals[label] += row.count
+        day = row.day if trend_edges is not None else None
+        if day is not None:
+            if recent is not None and day >= recent:
+                totals["recent"] += row.count
+            if day < trend_edges[-1]:
+                buckets[bisect_right(trend_edges, day) - 1] += row.count
+    return results
+
+
+def _series(labels: List[date], edges: Sequence[date], buckets: Dict[int, int]) -> List[Dict[str, Any]]:
+    """Every bucket in order, empty ones included, with its clipped date range."""
+    return [
+        {
+            "start": max(label, edges[0]).isoformat(),
+            "end": (edges[index + 1] - timedelta(days=1)).isoformat(),
+            "count": buckets.get(index, 0),
+        }
+        for index, label in enumerate(labels)
+    ]
+
+
+def trends(
+    db: Session,
+    granularity: str = "month",
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    entities: Sequence[str] = TREND_ENTITIES,
+    project_id: Optional[int] = None,
+    use_counters: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """
+    Number of records created per day, week or month between `start` and `end`
+    (inclusive; by default the last TREND_DAYS days), one series per entity.
+    Every bucket of the range is returned, including empty ones. Raises
+    ValueError for an unknown entity or granularity or an invalid range.
+    """
+    unknown = [name for name in entities if name not in ENTITY_MODELS]
+    if unknown:
+        raise ValueError(f"Unknown entity '{unknown[0]}'. Available: {', '.join(ENTITY_MODELS)}")
+    if use_counters is None:
+        use_counters = settings.dashboard_use_counters
+    end = end or datetime.now().date()
+    start = start or end - timedelta(days=TREND_DAYS)
+    labels, edges = trend_buckets(start, end, granularity)
+
+    if use_counters:
+        day = DashboardCounter.day
+        stmt = (
+            select(DashboardCounter.entity, day, func.sum(DashboardCounter.count).label("count"))
+            .where(DashboardCounter.entity.in_(entities), day >= edges[0], day < edges[-1])
+            .group_by(DashboardCounter.entity, day)
+        )
+        if project_id is not None:
+            stmt = stmt.where(DashboardCounter.project_id == project_id)
+        buckets = {name: Counter() for name in entities}
+        for row in db.execute(stmt):
+            buckets[row.entity][bisect_right(edges, row.day) - 1] += row.count or 0
+    else:
+        buckets = {}
+        for name in entities:
+            model = ENTITY_MODELS[name]
+            bucket = _bucket_index(model, edges).label("bucket")
+            stmt = (
+                select(bucket, func.count(model.id))
+                .where(model.created_at >= _edge_value(model, edges[0]), model.created_at < _edge_value(model, edges[-1]))
+                .group_by(bucket)
+            )
+            if project_id is not None:
+                stmt = stmt.where(getattr(model, COUNTED_MODELS[model].project_attr) == project_id)
+            buckets[name] = {index: count for index, count in db.execute(stmt) if index is not None}
+
+    return {
+        "granularity": granularity,
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "project_id": project_id,
+        "series": {name: _series(labels, edges, buckets[name]) for name in entities},
+    }
+
+
+def _rate(part: int, total: int) -> float:
+    return round(part / total * 100, 2) if total > 0 else 0
+
+
+def dashboard_stats(db: Session, use_counters: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Statistics for the main dashboard. Read from dashboard_counters unless
+    DASHBOARD_USE_COUNTERS is off, in which case every table is scanned once.
+    """
+    if use_counters is None:
+        use_counters = settings.dashboard_use_counters
+    today = datetime.now().date()
+    recent = today - timedelta(days=RECENT_ACTIVITY_DAYS)
+    months, edges = trend_buckets(today - timedelta(days=TREND_DAYS), today, "month")
+
+    if use_counters:
+        results = _counter_results(db, recent, edges)
+    else:
+        results = _scan_results(db, recent, edges)
+
+    def monthly(buckets: Dict[int, int]) -> List[Dict[str, Any]]:
+        return [
+            {"month": month.strftime('%Y-%m'), "count": buckets[index]}
+            for index, month in enumerate(months) if buckets.get(index)
+        ]
+
+    fitups, fitup_trend = results["fitups"][0], monthly(results["fitups"][1])
+    finals, final_trend = results["final_inspections"][0], monthly(results["final_inspections"][1])
+    ndt, ndt_trend = results["ndt_requests"][0], monthly(results["ndt_requests"][1])
+    materials, _ = results["materials"]
+    projects, _ = results["projects"]
+
+    return {
+        "overview": {
+            "total_projects": projects["total"],
+            "total_materials": materials["total"],
+            "total_fitups": fitups["total"],
+            "total_final_inspections": finals["total"],
+            "total_ndt_requests": ndt["total"]
+        },
+        "acceptance_rates": {
+            "fitup": {
+                "approved": fitups["approved"],
+                "rejected": fitups["rejected"],
+                "pending": fitups["pending"],
+                "rate": _rate(fitups["approved"], fitups["total"])
+            },
+            "final_inspection": {
+                "approved": finals["approved"],
+                "rejected": finals["rejected"],
+                "pending": finals["pending"],
+                "rate": _rate(finals["approved"], finals["total"])
+            }
+        },
+        "status_breakdown": {
+            "ndt": {
+                **{status: ndt[status] for status in NDT_STATUSES},
+                "completion_rate": _rate(ndt["completed"], ndt["total"])
+            },
+            "materials": {status: materials[status] for status in MATERIAL_STATUSES},
+            "projects": {status: projects[status] for status in PROJECT_STATUSES}
+        },
+        "recent_activity": {
+            "last_7_days": {
+                "materials": materials["recent"],
+                "fitups": fitups["recent"],
+                "final_inspections": finals["recent"],
+                "ndt_requests": ndt["recent"]
+            }
+        },
+        "monthly_trends": {
+            "fitups": fitup_trend,
+            "final_inspections": final_trend,
+            "ndt_requests": ndt_trend
+        }
+    }
+
+
+def _project_payload(project_id: int, fitups: Dict[str, int], finals: Dict[str, int], ndt: Dict[str, int]) -> Dict[str, Any]:
+    return {
+        "project_id": project_id,
+        "counts": {
+            "fitups": fitups["total"],
+            "final_inspections": finals["total"],
+            "ndt_requests": ndt["total"]
+        },
+        "acceptance_rates": {
+            "fitup": _rate(fitups["approved"], fitups["total"]),
+            "final_inspection": _rate(finals["approved"], finals["total"])
+        },
+        "pending_ndt": ndt["pending"]
+    }
+
+
+# Per-project figures: entity -> approval or status counted besides the total
+PROJECT_MEASURES = {
+    "fitups": "approved",
+    "final_inspections": "approved",
+    "ndt_requests": "pending",
+}
+
+
+def projects_stats(
+    db: Session, project_ids: Sequence[int], use_counters: Optional[bool] = None
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Statistics for many projects at once, keyed by project id in the order given.
+    Read from dashboard_counters in one query, or with one GROUP BY project_id
+    query per inspection table when DASHBOARD_USE_COUNTERS is off.
+    """
+    if use_counters is None:
+        use_counters = settings.dashboard_use_counters
+    project_ids = list(dict.fromkeys(project_ids))
+    totals = {
+        project_id: {name: {"total": 0, measure: 0} for name, measure in PROJECT_MEASURES.items()}
+        for project_id in project_ids
+    }
+    if project_ids:
+        if use_counters:
+            stmt = (
+                select(
+                    DashboardCounter.project_id, DashboardCounter.entity, DashboardCounter.status,
+                    DashboardCounter.approval, func.sum(DashboardCounter.count).label("count")
+                )
+                .where(DashboardCounter.project_id.in_(project_ids), DashboardCounter.entity.in_(PROJECT_MEASURES))
+                .group_by(
+                    DashboardCounter.project_id, DashboardCounter.entity,
+                    DashboardCounter.status, DashboardCounter.approval
+                )
+            )
+            for row in db.execute(stmt):
+                measure = PROJECT_MEASURES[row.entity]
+                entity_totals = totals[row.project_id][row.entity]
+                entity_totals["total"] += row.count or 0
+                if (row.approval or row.status) == measure:
+                    entity_totals[measure] += row.count or 0
+        else:
+            conditions = {
+                "fitups": Fitup.is_approved == True,
+                "final_inspections": FinalInspection.is_approved == True,
+                "ndt_requests": NDTRequest.status == "pending",
+            }
+            for name, measure in PROJECT_MEASURES.items():
+                model = ENTITY_MODELS[name]
+                stmt = (
+                    select(model.project_id, func.count(model.id), _count_if(conditions[name]))
+                    .where(model.project_id.in_(project_ids))
+                    .group_by(model.project_id)
+                )
+                for project_id, total, counted in db.execute(stmt):
+                    totals[project_id][name] = {"total": total, measure: counted or 0}
+
+    return {
+        project_id: _project_payload(
+            project_id, figures["fitups"], figures["final_inspections"], figures["ndt_requests"]
+        )
+        for project_id, figures in totals.items()
+    }
+
+
+def project_stats(db: Session, project_id: int, use_counters: Optional[bool] = None) -> Dict[str, Any]:
+    """Statistics for one project, from dashboard_counters or one query per inspection table."""
+    return projects_stats(db, [project_id], use_counters)[project_id]
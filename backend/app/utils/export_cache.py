@@ -0,0 +1,105 @@
+"""
+Disk cache for rendered export artifacts.
+
+Artifacts are keyed by an ETag derived from the export parameters and the write
+counters of the tables the export reads, so any committed write to those tables
+produces a new key. Least recently used artifacts are evicted once the cache
+grows past its size limit.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def make_etag(kind: str, params: Dict[str, Any], versions: Dict[str, int]) -> str:
+    """Build a strong ETag (including the quotes) for an export."""
+    payload = json.dumps(
+        {"kind": kind, "params": params, "versions": versions},
+        sort_keys=True,
+        default=str,
+    )
+    return '"' + hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate an If-None-Match header against an ETag (weak comparison, as RFC 9110 requires)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = {tag.strip() for tag in if_none_match.split(",")}
+    return etag in {tag[2:] if tag.startswith("W/") else tag for tag in tags}
+
+
+class ExportCache:
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _path(self, etag: str) -> Path:
+        return self.directory / (etag.strip('"') + ".bin")
+
+    def open(self, etag: str) -> Optional[BinaryIO]:
+        """
+        Open the cached artifact for this ETag for reading, marking it as recently used.
+        It is opened under the eviction lock, so the returned file stays readable
+        to the end even if the artifact is evicted while it is being sent.
+        """
+        path = self._path(etag)
+        with self._lock:
+            try:
+                os.utime(path)
+                return open(path, "rb")
+            except FileNotFoundError:
+                return None
+
+    def store_stream(self, etag: str, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Pass `chunks` through unchanged while also writing them to the cache.
+        The artifact only becomes visible once the stream has been fully consumed;
+        an abandoned or failed stream leaves nothing behind.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        partial = self.directory / f"{uuid.uuid4().hex}.part"
+        complete = False
+        try:
+            with open(partial, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    yield chunk
+            complete = True
+        finally:
+            if complete:
+                os.replace(partial, self._path(etag))
+                self._evict()
+            elif partial.exists():
+                partial.unlink()
+
+    def _evict(self):
+        """Delete least recently used artifacts until the cache fits in max_bytes."""
+        with self._lock:
+            entries = []
+            for path in self.directory.glob("*.bin"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    path.unlink()
+                    total -= size
+                except OSError:
+                    # Already gone, or (on Windows) still open for a download
+                    pass
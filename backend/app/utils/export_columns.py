@@ -0,0 +1,173 @@
+"""
+Registry of the columns each model contributes to exports.
+
+Excel sheets, CSV/Parquet/Arrow extracts and PDF reports all take their columns
+from here and select only those columns, so large exports read plain row tuples
+instead of building full ORM objects.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple, Type
+
+from sqlalchemy import Select, select
+
+from ..database import Base
+from ..models import Project, Material, Fitup, FinalInspection, NDTRequest
+
+
+class ExportProjection:
+    def __init__(
+        self,
+        model: Type[Base],
+        columns: Sequence[Tuple[str, str]],
+        report_fields: Sequence[str] = (),
+    ):
+        """
+        * `columns`: (header label, model attribute) pairs, in export order
+        * `report_fields`: attributes used by the model's PDF report table, if it has one
+        """
+        self.model = model
+        self.columns = list(columns)
+        self.report_fields = list(report_fields)
+
+    @property
+    def headers(self) -> List[str]:
+        return [label for label, _ in self.columns]
+
+    @property
+    def attrs(self) -> List[str]:
+        return [attr for _, attr in self.columns]
+
+    def sql_columns(self, attrs: Optional[Sequence[str]] = None) -> list:
+        return [getattr(self.model, attr) for attr in (attrs or self.attrs)]
+
+    def select(self, attrs: Optional[Sequence[str]] = None) -> Select:
+        """Column-only SELECT of the export columns (or `attrs`), returning row tuples."""
+        return select(*self.sql_columns(attrs))
+
+
+_projections: Dict[Type[Base], ExportProjection] = {}
+
+
+def register_projection(
+    model: Type[Base],
+    columns: Sequence[Tuple[str, str]],
+    report_fields: Sequence[str] = (),
+) -> ExportProjection:
+    projection = ExportProjection(model, columns, report_fields)
+    _projections[model] = projection
+    return projection
+
+
+def get_projection(model: Type[Base]) -> ExportProjection:
+    try:
+        return _projections[model]
+    except KeyError:
+        raise KeyError(f"No export columns registered for {model.__name__}") from None
+
+
+register_projection(Project, [
+    ("ID", "id"),
+    ("Project Number", "project_number"),
+    ("Project Name", "project_name"),
+    ("Client", "client"),
+    ("Project Manager", "project_manager"),
+    ("Start Date", "start_date"),
+    ("End Date", "end_date"),
+    ("Status", "status"),
+    ("Description", "description"),
+    ("Created At", "created_at"),
+    ("Updated At", "updated_at"),
+])
+
+register_projection(Material, [
+    ("ID", "id"),
+    ("Project ID", "project_id"),
+    ("Material Type", "material_type"),
+    ("Material Grade", "material_grade"),
+    ("Thickness", "thickness"),
+    ("Size", "size"),
+    ("Heat No", "heat_no"),
+    ("Inspection Date", "material_inspection_date"),
+    ("Inspection Result", "material_inspection_result"),
+    ("Report No", "material_report_no"),
+    ("Status", "status"),
+    ("Created At", "created_at"),
+    ("Updated At", "updated_at"),
+])
+
+register_projection(Fitup, [
+    ("ID", "id"),
+    ("Project ID", "project_id"),
+    ("Drawing No", "drawing_no"),
+    ("Line No", "line_no"),
+    ("Spool No", "spool_no"),
+    ("Joint No", "joint_no"),
+    ("Weld Type", "weld_type"),
+    ("Part 1 Thickness", "part1_thickness"),
+    ("Part 1 Grade", "part1_grade"),
+    ("Part 1 Size", "part1_size"),
+    ("Part 2 Thickness", "part2_thickness"),
+    ("Part 2 Grade", "part2_grade"),
+    ("Part 2 Size", "part2_size"),
+    ("Joint Type", "joint_type"),
+    ("Work Site", "work_site"),
+    ("Fit-up Date", "fitup_inspection_date"),
+    ("Report No", "fitup_report_no"),
+    ("Result", "fitup_result"),
+    ("Status", "status"),
+    ("Is Approved", "is_approved"),
+    ("Created At", "created_at"),
+], report_fields=[
+    "line_no", "spool_no", "joint_no",
+    "part1_grade", "part1_size", "part2_grade", "part2_size",
+    "joint_type", "part1_thickness", "fitup_result",
+])
+
+register_projection(FinalInspection, [
+    ("ID", "id"),
+    ("Project ID", "project_id"),
+    ("Drawing No", "drawing_no"),
+    ("Line No", "line_no"),
+    ("Spool No", "spool_no"),
+    ("Joint No", "joint_no"),
+    ("Weld Type", "weld_type"),
+    ("Part 1 Thickness", "part1_thickness"),
+    ("Part 1 Grade", "part1_grade"),
+    ("Part 1 Size", "part1_size"),
+    ("Part 2 Thickness", "part2_thickness"),
+    ("Part 2 Grade", "part2_grade"),
+    ("Part 2 Size", "part2_size"),
+    ("Joint Type", "joint_type"),
+    ("Work Site", "work_site"),
+    ("WPS No", "wps_no"),
+    ("Welder No", "welder_no"),
+    ("Weld Process", "weld_process"),
+    ("Welding Completion Date", "welding_completion_date"),
+    ("Weld Length", "weld_length"),
+    ("Final Inspection Date", "final_inspection_date"),
+    ("Final Report No", "final_report_no"),
+    ("Final Result", "final_result"),
+    ("Status", "status"),
+    ("Is Approved", "is_approved"),
+    ("Created At", "created_at"),
+], report_fields=[
+    "line_no", "spool_no", "joint_no",
+    "part1_grade", "part1_size", "part2_grade", "part2_size",
+    "joint_type", "part1_thickness", "wps_no", "welder_no", "final_result",
+])
+
+register_projection(NDTRequest, [
+    ("ID", "id"),
+    ("Project ID", "project_id"),
+    ("Line No", "line_no"),
+    ("Spool No", "spool_no"),
+    ("Joint No", "joint_no"),
+    ("Weld Process", "weld_process"),
+    ("Welder No", "welder_no"),
+    ("Weld Length", "weld_length"),
+    ("NDT Request Date", "ndt_request_date"),
+    ("NDT Method", "ndt_method"),
+    ("NDT Result", "ndt_result"),
+    ("Status", "status"),
+    ("Is Completed", "is_completed"),
+    ("Created At", "created_at"),
+])
@@ -0,0 +1,91 @@
+import os
+import re
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, Union
+from urllib.parse import quote
+
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+
+# Size of each read when streaming a file from disk
+FILE_CHUNK_SIZE = 64 * 1024
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^\x20-\x7e]|["\\]')
+
+
+def content_disposition(filename: str) -> str:
+    """
+    An `attachment` Content-Disposition for `filename`: a quoted ASCII fallback for
+    old clients plus the RFC 5987 `filename*` form, so non-ASCII names survive intact
+    (headers are Latin-1, so the bare name would fail to encode).
+    """
+    fallback = _UNSAFE_FILENAME_CHARS.sub("_", filename)
+    return f'attachment; filename="{fallback}"; filename*=UTF-8\'\'{quote(filename, safe="")}'
+
+
+def _iter_file(f: BinaryIO, start: int, length: int) -> Iterator[bytes]:
+    with f:
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            data = f.read(min(FILE_CHUNK_SIZE, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
+
+
+def ranged_file_response(
+    path: Union[Path, BinaryIO],
+    media_type: str,
+    filename: str,
+    range_header: Optional[str] = None,
+    headers: Optional[dict] = None,
+) -> StreamingResponse:
+    """
+    Serve a file from disk, honouring a single-range `Range: bytes=start-end` header
+    so interrupted downloads of large artifacts can be resumed.
+    `path` may also be a file already opened in binary mode; the response closes it.
+    """
+    f = path if hasattr(path, "read") else open(path, "rb")
+    try:
+        file_size = os.fstat(f.fileno()).st_size
+        response_headers = {
+            "Accept-Ranges": "bytes",
+            "Content-Disposition": content_disposition(filename),
+        }
+        if headers:
+            response_headers.update(headers)
+
+        start, end = 0, file_size - 1
+        status_code = status.HTTP_200_OK
+        match = _RANGE_PATTERN.match(range_header.strip()) if range_header else None
+        if match and (match.group(1) or match.group(2)):
+            first, last = match.groups()
+            if first:
+                start = int(first)
+                end = min(int(last), file_size - 1) if last else file_size - 1
+            else:
+                # Suffix range: the last N bytes
+                start = max(file_size - int(last), 0)
+            if start > end or start >= file_size:
+                raise HTTPException(
+                    status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                    detail="Requested range not satisfiable",
+                    headers={"Content-Range": f"bytes */{file_size}"},
+                )
+            status_code = status.HTTP_206_PARTIAL_CONTENT
+            response_headers["Content-Range"] = f"bytes {start}-{end}/{file_size}"
+
+        length = end - start + 1 if file_size else 0
+        response_headers["Content-Length"] = str(length)
+        return StreamingResponse(
+            _iter_file(f, start, length),
+            status_code=status_code,
+            media_type=media_type,
+            headers=response_headers,
+        )
+    except BaseException:
+        f.close()
+        raise
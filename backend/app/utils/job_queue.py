@@ -0,0 +1,164 @@
+"""
+In-process background job queue for long-running file renders (exports, imports).
+
+Jobs run on a local thread pool and write their artifact to disk. Submitting a job
+with the same key as one that is still queued or running returns the existing job,
+so identical concurrent requests share a single render. Finished jobs are forgotten,
+and their artifacts deleted, once they are older than the queue's TTL.
+"""
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Called by a render function as work advances: (units done, total units if known);
+# the unit is the job's progress_unit
+ProgressCallback = Callable[[int, Optional[int]], None]
+# Render function: writes the artifact to the given path and may return a result payload
+RenderFunction = Callable[[Path, ProgressCallback], Any]
+
+
+class JobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class Job:
+    def __init__(
+        self,
+        key: str,
+        kind: str,
+        filename: str,
+        media_type: str,
+        created_by: Optional[int] = None,
+        progress_unit: str = "rows",
+    ):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.kind = kind
+        self.filename = filename
+        self.media_type = media_type
+        self.created_by = created_by
+        # Users who submitted this job: its creator and those whose identical request attached to it
+        self.requested_by: Set[int] = {created_by} if created_by is not None else set()
+        self.status = JobStatus.QUEUED
+        self.progress_unit = progress_unit
+        self.done = 0
+        self.total: Optional[int] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.path: Optional[Path] = None
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self._finished_monotonic: Optional[float] = None
+
+    @property
+    def progress(self) -> float:
+        if self.status == JobStatus.COMPLETED:
+            return 1.0
+        if not self.total:
+            return 0.0
+        return min(self.done / self.total, 1.0)
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in (JobStatus.QUEUED, JobStatus.RUNNING)
+
+
+class JobQueue:
+    def __init__(self, directory: Path, max_workers: int = 2, ttl_seconds: int = 3600):
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job-worker")
+        self._jobs: Dict[str, Job] = {}
+        self._active_by_key: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        key: str,
+        kind: str,
+        filename: str,
+        media_type: str,
+        render: RenderFunction,
+        created_by: Optional[int] = None,
+        progress_unit: str = "rows",
+    ) -> Job:
+        """
+        Queue a render, or return the queued/running job that already has this key.
+        """
+        self._purge_expired()
+        with self._lock:
+            active_id = self._active_by_key.get(key)
+            if active_id and self._jobs[active_id].is_active:
+                job = self._jobs[active_id]
+                if created_by is not None:
+                    job.requested_by.add(created_by)
+                return job
+
+            job = Job(key, kind, filename, media_type, created_by=created_by, progress_unit=progress_unit)
+            self._jobs[job.id] = job
+            self._active_by_key[key] = job.id
+
+        self._executor.submit(self._run, job, render)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._purge_expired()
+        return self._jobs.get(job_id)
+
+    def _run(self, job: Job, render: RenderFunction):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        final_path = self.directory / f"{job.id}_{job.filename}"
+        partial_path = final_path.with_name(final_path.name + ".part")
+
+        def progress(done: int, total: Optional[int] = None):
+            job.done = done
+            if total is not None:
+                job.total = total
+
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.utcnow()
+        try:
+            job.result = render(partial_path, progress)
+            if partial_path.exists():
+                os.replace(partial_path, final_path)
+                job.path = final_path
+            job.status = JobStatus.COMPLETED
+        except Exception as e:
+            logger.exception("Background job %s (%s) failed", job.id, job.kind)
+            job.error = str(e)
+            job.status = JobStatus.FAILED
+            if partial_path.exists():
+                partial_path.unlink()
+        finally:
+            job.finished_at = datetime.utcnow()
+            job._finished_monotonic = time.monotonic()
+            with self._lock:
+                if self._active_by_key.get(job.key) == job.id:
+                    del self._active_by_key[job.key]
+
+    def _purge_expired(self):
+        """Forget finished jobs older than the TTL and delete their artifacts."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                job for job in self._jobs.values()
+                if job._finished_monotonic is not None
+                and now - job._finished_monotonic > self.ttl_seconds
+            ]
+            for job in expired:
+                del self._jobs[job.id]
+        for job in expired:
+            if job.path and job.path.exists():
+                job.path.unlink()
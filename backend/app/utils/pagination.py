@@ -0,0 +1,116 @@
+"""
+Keyset (cursor) pagination.
+
+A page is read with `WHERE (sort_key, id) > (last sort_key, last id)` instead of
+OFFSET, so every page costs the same however deep the client has paged. The
+cursor handed to the client is opaque: URL-safe base64 of the sort key name and
+the (sort value, id) of the last row of the previous page. List endpoints send
+it in the X-Next-Cursor header and accept it back as `after`.
+"""
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, tuple_
+
+# Response header carrying the cursor of the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Columns a page can be ordered by; prefix with "-" for descending order.
+# Both are NOT NULL on every table, which keyset comparisons rely on.
+SORT_KEYS = ("id", "created_at")
+
+# Query parameter descriptions shared by the list endpoints
+AFTER_DESCRIPTION = f"Cursor from the {NEXT_CURSOR_HEADER} header of the previous page"
+SORT_DESCRIPTION = "Cursor page order: id or created_at, prefix with '-' for descending"
+
+
+def _parse_sort(sort: str) -> Tuple[str, bool]:
+    descending = sort.startswith("-")
+    name = sort[1:] if descending else sort
+    if name not in SORT_KEYS:
+        raise ValueError(f"sort must be one of {', '.join(SORT_KEYS)}, optionally prefixed with '-'")
+    return name, descending
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"date": value.isoformat()}
+    return value
+
+
+def _load_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "datetime" in value:
+            return datetime.fromisoformat(value["datetime"])
+        if "date" in value:
+            return date.fromisoformat(value["date"])
+        raise ValueError("Invalid cursor")
+    return value
+
+
+def encode_cursor(sort: str, value: Any, id: int) -> str:
+    payload = json.dumps([sort, _dump_value(value), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, int]:
+    """(sort value, id) stored in `cursor`; ValueError if it is malformed or was issued for another sort."""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, value, id = json.loads(payload)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if cursor_sort != sort:
+        raise ValueError("Cursor was issued for a different sort order")
+    if not isinstance(id, int):
+        raise ValueError("Invalid cursor")
+    return _load_value(value), id
+
+
+def keyset_select(stmt: Select, model: Any, *, sort: str = "id", after: Optional[str] = None, limit: int = 100) -> Select:
+    """
+    Order `stmt` by (sort key, id), start after the `after` cursor and fetch
+    one row more than `limit`, which tells split_page() whether a next page exists.
+    """
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    name, descending = _parse_sort(sort)
+    column = getattr(model, name)
+
+    if after:
+        value, last_id = decode_cursor(after, sort)
+        if name == "id":
+            stmt = stmt.where(model.id < last_id if descending else model.id > last_id)
+        else:
+            position = tuple_(column, model.id)
+            stmt = stmt.where(position < (value, last_id) if descending else position > (value, last_id))
+
+    return order_by_sort(stmt, model, sort).limit(limit + 1)
+
+
+def order_by_sort(stmt: Select, model: Any, sort: str = "id") -> Select:
+    """Order `stmt` by (sort key, id), both ascending or both descending."""
+    name, descending = _parse_sort(sort)
+    keys = [model.id] if name == "id" else [getattr(model, name), model.id]
+    return stmt.order_by(*[key.desc() if descending else key for key in keys])
+
+
+def split_page(rows: Sequence[Any], *, sort: str = "id", limit: int = 100) -> Tuple[List[Any], Optional[str]]:
+    """Rows of the page and the cursor of the next page (None on the last page)."""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    name, _ = _parse_sort(sort)
+    last = rows[-1]
+    return rows, encode_cursor(sort, getattr(last, name), last.id)
+
+
+def set_next_cursor(response: Any, next_cursor: Optional[str]):
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
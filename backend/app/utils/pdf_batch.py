@@ -0,0 +1,110 @@
+"""
+Parallel rendering of many PDF reports into a single streamed ZIP archive.
+
+reportlab layout is CPU-bound and holds the GIL, so reports are rendered in a
+process pool. Each PDF is added to the archive as soon as its worker finishes.
+"""
+import logging
+import multiprocessing
+import re
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+from .xlsx_stream import ChunkBuffer
+
+logger = logging.getLogger(__name__)
+
+ZIP_MEDIA_TYPE = "application/zip"
+
+REPORT_FITUP = "fitup"
+REPORT_FINAL = "final"
+
+
+class ReportSpec(NamedTuple):
+    kind: str  # REPORT_FITUP or REPORT_FINAL
+    report_no: str
+    records: List[Dict[str, Any]]
+    operator_data: Dict[str, str]
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Return the shared report rendering pool, creating it on first use.
+    Workers are spawned rather than forked so they do not inherit the API's
+    threads or open database connections.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def render_report(kind: str, records: List[Dict[str, Any]], operator_data: Dict[str, str]) -> bytes:
+    """Render one report to PDF bytes. Runs inside a pool worker."""
+    from .pdf_generator import pdf_generator
+
+    if kind == REPORT_FITUP:
+        buffer = pdf_generator.generate_fitup_report(records, operator_data)
+    elif kind == REPORT_FINAL:
+        buffer = pdf_generator.generate_final_inspection_report(records, operator_data)
+    else:
+        raise ValueError(f"Unknown report kind '{kind}'")
+    return buffer.getvalue()
+
+
+def _archive_name(spec: ReportSpec, used: set) -> str:
+    safe = re.sub(r"[^A-Za-z0-9._-]+", "_", spec.report_no).strip("_") or "report"
+    name = f"{spec.kind}/{safe}.pdf"
+    suffix = 1
+    while name in used:
+        suffix += 1
+        name = f"{spec.kind}/{safe}_{suffix}.pdf"
+    used.add(name)
+    return name
+
+
+def stream_reports_zip(specs: List[ReportSpec], max_workers: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Render every report in the process pool and yield a ZIP archive containing them,
+    adding each PDF as soon as it is ready. Reports that fail to render are listed
+    in ERRORS.txt at the end of the archive instead of aborting the download.
+    """
+    pool = get_pool(max_workers)
+    futures = {
+        pool.submit(render_report, spec.kind, spec.records, spec.operator_data): spec
+        for spec in specs
+    }
+
+    buffer = ChunkBuffer()
+    used_names: set = set()
+    errors: List[str] = []
+    try:
+        # PDFs are already compressed, so they are stored as-is
+        with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED) as archive:
+            for future in as_completed(futures):
+                spec = futures[future]
+                try:
+                    pdf_bytes = future.result()
+                except Exception as e:
+                    logger.exception("Failed to render %s report %s", spec.kind, spec.report_no)
+                    errors.append(f"{spec.kind} report {spec.report_no}: {e}")
+                    continue
+                archive.writestr(_archive_name(spec, used_names), pdf_bytes)
+                yield buffer.drain()
+            if errors:
+                archive.writestr("ERRORS.txt", "\n".join(errors) + "\n")
+        yield buffer.drain()
+    finally:
+        # Client went away: drop reports that have not started yet
+        for future in futures:
+            future.cancel()
@@ -8,12 +8,21 @@ from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from datetime import datetime
 from typing import List, Dict, Any
+from xml.sax.saxutils import escape
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Data table layout, matching the TableStyle applied in _data_table
+TABLE_FONT_SIZE = 8
+CELL_H_PADDING = 6  # reportlab default LEFTPADDING / RIGHTPADDING
+CELL_V_PADDING = 3  # reportlab default TOPPADDING / BOTTOMPADDING
+MAX_CELL_HEIGHT = 10000
+
 class PDFGenerator:
-    def __init__(self):
+    def __init__(self, fast_tables: bool = True):
+        # fast_tables=False lays out every cell as a Paragraph in one long table
+        self.fast_tables = fast_tables
         self.styles = getSampleStyleSheet()
         self._setup_custom_styles()
     
@@ -49,210 +58,189 @@ class PDFGenerator:
             alignment=1
         ))
     
-    def generate_fitup_report(self, records: List[Dict[str, Any]], operator_data: Dict[str, str]) -> BytesIO:
-        """Generate Fit-Up Inspection Report PDF"""
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=landscape(A4))
-        
-        elements = []
-        
-        # Header Section
-        elements.append(Paragraph("Project - FIT UP INSPECTION REPORT", self.styles['Header']))
-        elements.append(Spacer(1, 10))
-        
-        # Project and Location
-        project_info = [
-            [Paragraph("Project:", self.styles['SubHeader']), Paragraph(operator_data.get('project', ''), self.styles['SubHeader'])],
-            [Paragraph("Location:", self.styles['SubHeader']), Paragraph(operator_data.get('location', ''), self.styles['SubHeader'])],
-            [Paragraph("Date:", self.styles['SubHeader']), Paragraph(operator_data.get('date', datetime.now().strftime('%Y-%m-%d')), self.styles['SubHeader'])],
-            [Paragraph("Report No:", self.styles['SubHeader']), Paragraph(operator_data.get('report_no', ''), self.styles['SubHeader'])],
-            [Paragraph("Drawing No:", self.styles['SubHeader']), Paragraph(operator_data.get('drawing_no', ''), self.styles['SubHeader'])]
-        ]
-        
-        project_table = Table(project_info, colWidths=[1.5*inch, 3*inch])
-        project_table.setStyle(TableStyle([
+    def _operator_value(self, operator_data: Dict[str, str], key: str, default: str = '') -> str:
+        value = operator_data.get(key)
+        return default if value is None else str(value)
+
+    def _info_table(self, rows: List[List[str]]) -> Table:
+        """Two-column label/value block used for the report header and footer"""
+        info_table = Table(
+            [[Paragraph(label, self.styles['SubHeader']), Paragraph(value, self.styles['SubHeader'])] for label, value in rows],
+            colWidths=[1.5*inch, 3*inch]
+        )
+        info_table.setStyle(TableStyle([
             ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
             ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
             ('FONTSIZE', (0, 0), (-1, -1), 10),
             ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
         ]))
-        elements.append(project_table)
-        elements.append(Spacer(1, 15))
-        
-        # Data Table
-        table_data = []
-        
-        # Table Headers
-        headers = [
-            "S/NO", "LINE NO", "SPOOL NO", "JOINT NO", 
-            "MATERIAL -A", "MATERIAL-B", "JOINT TYPE", 
-            "THICKNESS", "RESULT", "REMARK"
-        ]
-        table_data.append([Paragraph(header, self.styles['TableHeader']) for header in headers])
-        
-        # Table Rows
-        for i, record in enumerate(records, 1):
-            material_a = f"{record.get('part1_grade', '')} {record.get('part1_size', '')}".strip()
-            material_b = f"{record.get('part2_grade', '')} {record.get('part2_size', '')}".strip()
-            
-            row = [
-                Paragraph(str(i), self.styles['TableCell']),
-                Paragraph(str(record.get('line_no', '')), self.styles['TableCell']),
-                Paragraph(str(record.get('spool_no', '')), self.styles['TableCell']),
-                Paragraph(str(record.get('joint_no', '')), self.styles['TableCell']),
-                Paragraph(material_a, self.styles['TableCell']),
-                Paragraph(material_b, self.styles['TableCell']),
-                Paragraph(str(record.get('joint_type', '')), self.styles['TableCell']),
-                Paragraph(str(record.get('part1_thickness', '')), self.styles['TableCell']),
-                Paragraph(str(record.get('fitup_result', '')).upper(), self.styles['TableCell']),
-                Paragraph("", self.styles['TableCell'])  # Empty remark column
-            ]
-            table_data.append(row)
-        
-        # Create table with appropriate column widths
-        col_widths = [0.4*inch, 0.8*inch, 0.8*inch, 0.8*inch, 1.5*inch, 1.5*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch]
+        return info_table
+
+    def _cell(self, text: str, width: float):
+        """
+        Plain strings are laid out by the table itself at a fraction of the cost of a
+        Paragraph; only text that would overflow its column is wrapped in one.
+        """
+        if '\n' not in text and pdfmetrics.stringWidth(text, 'Helvetica', TABLE_FONT_SIZE) <= width - 2 * CELL_H_PADDING:
+            return text
+        return Paragraph(escape(text), self.styles['TableCell'])
+
+    def _data_table(self, table_data: List[list], col_widths: List[float]) -> Table:
         data_table = Table(table_data, colWidths=col_widths, repeatRows=1)
-        
-        # Table styling
-        table_style = TableStyle([
+        data_table.setStyle(TableStyle([
             ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4472C4')),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
             ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
             ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 8),
+            ('FONTSIZE', (0, 0), (-1, -1), TABLE_FONT_SIZE),
             ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
             ('BACKGROUND', (0, 1), (-1, -1), colors.white),
             ('GRID', (0, 0), (-1, -1), 1, colors.black),
             ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ])
-        
-        data_table.setStyle(table_style)
-        elements.append(data_table)
-        elements.append(Spacer(1, 20))
-        
-        # Footer Section
-        footer_data = [
-            [Paragraph("INSPECTION BY", self.styles['SubHeader']), Paragraph(operator_data.get('inspector', ''), self.styles['SubHeader'])],
-            [Paragraph("NAME /SIGNATURE", self.styles['SubHeader']), Paragraph("", self.styles['SubHeader'])],
-            [Paragraph("DATE", self.styles['SubHeader']), Paragraph(operator_data.get('date', datetime.now().strftime('%Y-%m-%d')), self.styles['SubHeader'])]
-        ]
-        
-        footer_table = Table(footer_data, colWidths=[1.5*inch, 3*inch])
-        footer_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
         ]))
-        elements.append(footer_table)
-        
-        # Build PDF
-        doc.build(elements)
-        buffer.seek(0)
-        return buffer
-    
-    def generate_final_inspection_report(self, records: List[Dict[str, Any]], operator_data: Dict[str, str]) -> BytesIO:
-        """Generate Final Inspection Report PDF"""
+        return data_table
+
+    def _row_height(self, row: list, col_widths: List[float], bottom_padding: float = CELL_V_PADDING) -> float:
+        """Height the table will give this row, computed the same way reportlab does"""
+        content = self.styles['TableCell'].leading
+        for cell, width in zip(row, col_widths):
+            if isinstance(cell, Paragraph):
+                content = max(content, cell.wrap(width - 2 * CELL_H_PADDING, MAX_CELL_HEIGHT)[1])
+        return content + CELL_V_PADDING + bottom_padding
+
+    def _fast_data_tables(self, headers: List[str], col_widths: List[float], rows: List[List[str]],
+                          first_page_space: float, page_space: float) -> List[Table]:
+        """
+        Split the rows into one table per page. reportlab re-measures every remaining
+        row each time it splits a table across a page, so a single long table costs
+        O(rows x pages); page-sized tables are each measured once.
+        """
+        header_row = [Paragraph(header, self.styles['TableHeader']) for header in headers]
+        header_height = self._row_height(header_row, col_widths, bottom_padding=12)
+
+        tables = []
+        chunk: List[list] = []
+        space = first_page_space
+        used = header_height
+        for row in rows:
+            cells = [self._cell(text, width) for text, width in zip(row, col_widths)]
+            height = self._row_height(cells, col_widths)
+            if chunk and used + height > space:
+                tables.append(self._data_table([header_row] + chunk, col_widths))
+                chunk = []
+                space = page_space
+                used = header_height
+            chunk.append(cells)
+            used += height
+        if chunk or not tables:
+            tables.append(self._data_table([header_row] + chunk, col_widths))
+        return tables
+
+    def _build_report(self, title: str, headers: List[str], col_widths: List[float],
+                      rows: List[List[str]], operator_data: Dict[str, str]) -> BytesIO:
         buffer = BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=landscape(A4))
-        
+        report_date = self._operator_value(operator_data, 'date', datetime.now().strftime('%Y-%m-%d'))
+
         elements = []
-        
+
         # Header Section
-        elements.append(Paragraph("Project - Final Inspection", self.styles['Header']))
+        elements.append(Paragraph(title, self.styles['Header']))
         elements.append(Spacer(1, 10))
-        
+
         # Project and Location
-        project_info = [
-            [Paragraph("Project:", self.styles['SubHeader']), Paragraph(operator_data.get('project', ''), self.styles['SubHeader'])],
-            [Paragraph("Location:", self.styles['SubHeader']), Paragraph(operator_data.get('location', ''), self.styles['SubHeader'])],
-            [Paragraph("Date:", self.styles['SubHeader']), Paragraph(operator_data.get('date', datetime.now().strftime('%Y-%m-%d')), self.styles['SubHeader'])],
-            [Paragraph("Report No:", self.styles['SubHeader']), Paragraph(operator_data.get('report_no', ''), self.styles['SubHeader'])],
-            [Paragraph("Drawing No:", self.styles['SubHeader']), Paragraph(operator_data.get('drawing_no', ''), self.styles['SubHeader'])]
-        ]
-        
-        project_table = Table(project_info, colWidths=[1.5*inch, 3*inch])
-        project_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        elements.append(self._info_table([
+            ["Project:", self._operator_value(operator_data, 'project')],
+            ["Location:", self._operator_value(operator_data, 'location')],
+            ["Date:", report_date],
+            ["Report No:", self._operator_value(operator_data, 'report_no')],
+            ["Drawing No:", self._operator_value(operator_data, 'drawing_no')],
         ]))
-        elements.append(project_table)
         elements.append(Spacer(1, 15))
-        
+
         # Data Table
-        table_data = []
-        
-        # Table Headers for Final Inspection
-        headers = [
-            "S/NO", "LINE NO", "SPOOL NO", "JOINT NO", 
-            "MATERIAL -A", "MATERIAL-B", "JOINT TYPE", 
-            "THICKNESS", "WPS", "WELDER", "RESULT"
-        ]
-        table_data.append([Paragraph(header, self.styles['TableHeader']) for header in headers])
-        
-        # Table Rows
-        for i, record in enumerate(records, 1):
-            material_a = f"{record.get('part1_grade', '')} {record.get('part1_size', '')}".strip()
-            material_b = f"{record.get('part2_grade', '')} {record.get('part2_size', '')}".strip()
-            
-            row = [
-                Paragraph(str(i), self.styles['TableCell']),
-                Paragraph(str(record.get('line_no', '')), self.styles['TableCell']),
-                Paragraph(str(record.get('spool_no', '')), self.styles['TableCell']),
-                Paragraph(str(record.get('joint_no', '')), self.styles['TableCell']),
-                Paragraph(material_a, self.styles['TableCell']),
-                Paragraph(material_b, self.styles['TableCell']),
-                Paragraph(str(record.get('joint_type', '')), self.styles['TableCell']),
-                Paragraph(str(record.get('part1_thickness', '')), self.styles['TableCell']),
-                Paragraph(str(record.get('wps_no', '')), self.styles['TableCell']),
-                Paragraph(str(record.get('welder_no', '')), self.styles['TableCell']),
-                Paragraph(str(record.get('final_result', '')).upper(), self.styles['TableCell'])
-            ]
-            table_data.append(row)
-        
-        # Create table with appropriate column widths
-        col_widths = [0.4*inch, 0.8*inch, 0.8*inch, 0.8*inch, 1.2*inch, 1.2*inch, 0.8*inch, 0.7*inch, 0.8*inch, 0.8*inch, 0.8*inch]
-        data_table = Table(table_data, colWidths=col_widths, repeatRows=1)
-        
-        # Table styling
-        table_style = TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4472C4')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ])
-        
-        data_table.setStyle(table_style)
-        elements.append(data_table)
+        if self.fast_tables:
+            # Usable frame area: page minus margins minus the frame's own 6pt padding
+            frame_width = doc.width - 12
+            page_space = doc.height - 12
+            first_page_space = page_space
+            for index, element in enumerate(elements):
+                first_page_space -= element.wrap(frame_width, page_space)[1] + element.getSpaceAfter()
+                if index:
+                    first_page_space -= element.getSpaceBefore()
+            elements.extend(self._fast_data_tables(headers, col_widths, rows, first_page_space, page_space))
+        else:
+            table_data = [[Paragraph(header, self.styles['TableHeader']) for header in headers]]
+            for row in rows:
+                table_data.append([Paragraph(text, self.styles['TableCell']) for text in row])
+            elements.append(self._data_table(table_data, col_widths))
         elements.append(Spacer(1, 20))
-        
+
         # Footer Section
-        footer_data = [
-            [Paragraph("INSPECTION BY", self.styles['SubHeader']), Paragraph(operator_data.get('inspector', ''), self.styles['SubHeader'])],
-            [Paragraph("NAME /SIGNATURE", self.styles['SubHeader']), Paragraph("", self.styles['SubHeader'])],
-            [Paragraph("DATE", self.styles['SubHeader']), Paragraph(operator_data.get('date', datetime.now().strftime('%Y-%m-%d')), self.styles['SubHeader'])]
-        ]
-        
-        footer_table = Table(footer_data, colWidths=[1.5*inch, 3*inch])
-        footer_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        elements.append(self._info_table([
+            ["INSPECTION BY", self._operator_value(operator_data, 'inspector')],
+            ["NAME /SIGNATURE", ""],
+            ["DATE", report_date],
         ]))
-        elements.append(footer_table)
-        
+
         # Build PDF
         doc.build(elements)
         buffer.seek(0)
         return buffer
 
+    def _materials(self, record: Dict[str, Any]) -> List[str]:
+        material_a = f"{record.get('part1_grade', '')} {record.get('part1_size', '')}".strip()
+        material_b = f"{record.get('part2_grade', '')} {record.get('part2_size', '')}".strip()
+        return [material_a, material_b]
+
+    def generate_fitup_report(self, records: List[Dict[str, Any]], operator_data: Dict[str, str]) -> BytesIO:
+        """Generate Fit-Up Inspection Report PDF"""
+        headers = [
+            "S/NO", "LINE NO", "SPOOL NO", "JOINT NO", 
+            "MATERIAL -A", "MATERIAL-B", "JOINT TYPE", 
+            "THICKNESS", "RESULT", "REMARK"
+        ]
+        rows = [
+            [
+                str(i),
+                str(record.get('line_no', '')),
+                str(record.get('spool_no', '')),
+                str(record.get('joint_no', '')),
+                *self._materials(record),
+                str(record.get('joint_type', '')),
+                str(record.get('part1_thickness', '')),
+                str(record.get('fitup_result', '')).upper(),
+                ""  # Empty remark column
+            ]
+            for i, record in enumerate(records, 1)
+        ]
+        col_widths = [0.4*inch, 0.8*inch, 0.8*inch, 0.8*inch, 1.5*inch, 1.5*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.8*inch]
+        return self._build_report("Project - FIT UP INSPECTION REPORT", headers, col_widths, rows, operator_data)
+    
+    def generate_final_inspection_report(self, records: List[Dict[str, Any]], operator_data: Dict[str, str]) -> BytesIO:
+        """Generate Final Inspection Report PDF"""
+        headers = [
+            "S/NO", "LINE NO", "SPOOL NO", "JOINT NO", 
+            "MATERIAL -A", "MATERIAL-B", "JOINT TYPE", 
+            "THICKNESS", "WPS", "WELDER", "RESULT"
+        ]
+        rows = [
+            [
+                str(i),
+                str(record.get('line_no', '')),
+                str(record.get('spool_no', '')),
+                str(record.get('joint_no', '')),
+                *self._materials(record),
+                str(record.get('joint_type', '')),
+                str(record.get('part1_thickness', '')),
+                str(record.get('wps_no', '')),
+                str(record.get('welder_no', '')),
+                str(record.get('final_result', '')).upper()
+            ]
+            for i, record in enumerate(records, 1)
+        ]
+        col_widths = [0.4*inch, 0.8*inch, 0.8*inch, 0.8*inch, 1.2*inch, 1.2*inch, 0.8*inch, 0.7*inch, 0.8*inch, 0.8*inch, 0.8*inch]
+        return self._build_report("Project - Final Inspection", headers, col_widths, rows, operator_data)
+
 # Global instance
 pdf_generator = PDFGenerator()
@@ -0,0 +1,212 @@
+"""
+Per-request SQL instrumentation.
+
+Cursor execute hooks on every engine time each statement. While a request is
+being served (see QueryStatsMiddleware) the statements are added up for that
+request: the totals go out in the Server-Timing header and in one structured
+log line per request, and a statement repeated more than QUERY_REPEAT_THRESHOLD
+times is reported as a likely N+1 pattern. Statements slower than
+SLOW_QUERY_THRESHOLD_MS go to the slow-query log with the shape of their
+parameters (types only; values are never logged), whether or not they ran
+inside a request.
+"""
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("app.slow_queries")
+
+# Longest statement text kept in log lines
+MAX_STATEMENT_LENGTH = 500
+
+_current: ContextVar[Optional["RequestQueries"]] = ContextVar("request_queries", default=None)
+
+
+def _truncate(statement: str) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= MAX_STATEMENT_LENGTH else statement[:MAX_STATEMENT_LENGTH] + "..."
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> Any:
+    """Type names of the bound parameters, e.g. {"id": "int"} or ["str", "NoneType"]."""
+    if executemany:
+        rows = list(parameters or [])
+        return {"rows": len(rows), "row": parameter_shape(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+class RequestQueries:
+    """Statements executed while serving one request."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, seconds: float):
+        with self._lock:
+            self.count += 1
+            self.seconds += seconds
+            self.statements[statement] += 1
+            if seconds >= self.slowest_seconds:
+                self.slowest_seconds = seconds
+                self.slowest_statement = statement
+
+    def repeated(self, threshold: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Statements run more than `threshold` times, most repeated first."""
+        threshold = settings.query_repeat_threshold if threshold is None else threshold
+        with self._lock:
+            return [
+                {"statement": _truncate(statement), "count": count}
+                for statement, count in self.statements.most_common()
+                if count > threshold
+            ]
+
+    def server_timing(self) -> str:
+        with self._lock:
+            return (
+                f'db;dur={self.seconds * 1000:.1f};desc="{self.count} queries", '
+                f'db-slowest;dur={self.slowest_seconds * 1000:.1f}'
+            )
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            summary = {
+                "queries": self.count,
+                "db_ms": round(self.seconds * 1000, 3),
+                "slowest_ms": round(self.slowest_seconds * 1000, 3),
+                "slowest_statement": _truncate(self.slowest_statement) if self.slowest_statement else None,
+            }
+        summary["repeated"] = self.repeated()
+        return summary
+
+
+def current_queries() -> Optional[RequestQueries]:
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - conn.info.pop("query_started", time.perf_counter())
+    queries = _current.get()
+    if queries is not None:
+        queries.record(statement, seconds)
+    if settings.slow_query_threshold_ms >= 0 and seconds * 1000 >= settings.slow_query_threshold_ms:
+        slow_query_logger.warning(json.dumps({
+            "event": "slow_query",
+            "duration_ms": round(seconds * 1000, 3),
+            "statement": _truncate(statement),
+            "parameters": parameter_shape(parameters, executemany),
+            "database": conn.engine.url.database,
+        }))
+
+
+def instrument(engine: Engine):
+    """Time every statement run on `engine` (the sync_engine of an AsyncEngine)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def configure_slow_query_log():
+    """
+    Called once at startup. Sends the per-request query lines (INFO, or WARNING
+    when a statement repeats) to stderr at QUERY_LOG_LEVEL and the slow-query
+    log to stderr, and also to SLOW_QUERY_LOG_FILE when it is set.
+    """
+    level = logging.getLevelName(settings.query_log_level)
+    for query_logger in (logger, slow_query_logger):
+        if not query_logger.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(levelname)s %(message)s"))
+            query_logger.addHandler(handler)
+            # Handled here; the root logger would print the lines a second time once configured
+            query_logger.propagate = False
+        query_logger.disabled = False
+    logger.setLevel(level)
+    slow_query_logger.setLevel(logging.WARNING)
+    if settings.slow_query_log_file and not any(
+        isinstance(handler, logging.FileHandler) for handler in slow_query_logger.handlers
+    ):
+        settings.slow_query_log_file.parent.mkdir(parents=True, exist_ok=True)
+        handler = logging.FileHandler(settings.slow_query_log_file)
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        slow_query_logger.addHandler(handler)
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware collecting the statements of each HTTP request. The
+    Server-Timing entries are appended to any the endpoint set itself and cover
+    the statements run before the response headers went out; the log line is
+    written once the whole body has been sent, so it includes streamed bodies.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.query_stats_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries()
+        token = _current.set(queries)
+        started = time.perf_counter()
+        status_code = None
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                timing = queries.server_timing()
+                for index, (name, value) in enumerate(headers):
+                    if name.lower() == b"server-timing":
+                        headers[index] = (name, value + b", " + timing.encode("latin-1"))
+                        break
+                else:
+                    headers.append((b"server-timing", timing.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            self._log(scope, status_code, queries, time.perf_counter() - started)
+
+    @staticmethod
+    def _log(scope, status_code, queries: RequestQueries, seconds: float):
+        summary = queries.summary()
+        line = {
+            "event": "request_queries",
+            "method": scope["method"],
+            "path": scope["path"],
+            "status": status_code,
+            "duration_ms": round(seconds * 1000, 3),
+            **summary,
+        }
+        if summary["repeated"]:
+            logger.warning(json.dumps(line))
+        else:
+            logger.info(json.dumps(line))
@@ -0,0 +1,233 @@
+"""
+Streaming spreadsheet import.
+
+Rows are read one at a time from a CSV or XLSX file (openpyxl read-only mode, so
+memory does not grow with the file; CSV files are read in a single pass), mapped onto a Create schema by header name,
+validated a batch at a time and inserted through CRUDBase.create_many with one
+transaction per batch. A row that fails validation is reported with its
+spreadsheet row number and skipped; the other rows of its batch are stored.
+"""
+import codecs
+import csv
+import os
+from datetime import date, datetime, time
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Type, Union
+
+from openpyxl import load_workbook
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+IMPORT_EXTENSIONS = (".csv", ".xlsx", ".xlsm")
+
+# Row errors returned with the job status; every error is in the error report
+ERRORS_IN_RESULT = 100
+
+ERROR_REPORT_HEADER = ("row", "column", "error")
+
+
+def normalize_header(name: Any) -> str:
+    """'Joint No.' -> 'joint_no'"""
+    text = str(name or "").strip().lower()
+    for separator in "-./#":
+        text = text.replace(separator, " ")
+    return "_".join(text.split())
+
+
+def progress_unit(path: Union[str, Path]) -> str:
+    """Unit in which SheetReader measures how far it has read this file."""
+    return "bytes" if Path(path).suffix.lower() == ".csv" else "rows"
+
+
+class SheetReader:
+    """
+    Header and data rows of a CSV file or of the first sheet of an XLSX file,
+    read lazily. Use as a context manager; iterating yields
+    (spreadsheet row number, cell values), skipping blank rows.
+
+    `position` out of `total` tells how far the file has been read, in the
+    unit given by progress_unit(): bytes of a CSV file, so no extra pass is
+    needed to count its rows, or data rows of an XLSX sheet.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.header: List[Any] = []
+        self.position = 0
+        # None for XLSX files that do not record the size of their sheet
+        self.total: Optional[int] = None
+        self._close: Callable[[], None] = lambda: None
+        self._rows: Iterator[Sequence[Any]] = iter(())
+
+    def __enter__(self) -> "SheetReader":
+        suffix = self.path.suffix.lower()
+        if suffix not in IMPORT_EXTENSIONS:
+            raise ValueError(f"Unsupported file type '{suffix}'. Use {', '.join(IMPORT_EXTENSIONS)}")
+        if suffix == ".csv":
+            f = open(self.path, "rb")
+            self._close = f.close
+            self.total = os.fstat(f.fileno()).st_size
+            # Lines are kept with their line endings, as csv expects of a file opened with newline=""
+            self._rows = csv.reader(codecs.iterdecode(self._count_bytes(f), "utf-8-sig"))
+        else:
+            workbook = load_workbook(self.path, read_only=True, data_only=True)
+            self._close = workbook.close
+            sheet = workbook.worksheets[0]
+            self.total = max(sheet.max_row - 1, 0) if sheet.max_row else None
+            self._rows = sheet.iter_rows(values_only=True)
+        self.header = list(next(self._rows, ()))
+        return self
+
+    def __exit__(self, *exc):
+        self._close()
+
+    def _count_bytes(self, f: BinaryIO) -> Iterator[bytes]:
+        for line in f:
+            self.position += len(line)
+            yield line
+
+    def __iter__(self) -> Iterator[Tuple[int, Sequence[Any]]]:
+        counting_rows = progress_unit(self.path) == "rows"
+        for row_number, values in enumerate(self._rows, start=2):
+            if counting_rows:
+                self.position = row_number - 1
+            if any(value is not None and str(value).strip() for value in values):
+                yield row_number, values
+
+
+def _clean(value: Any, text: bool) -> Any:
+    """Cell value as the schema expects it; None for blank cells."""
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, datetime) and value.time() == time():
+        value = value.date()
+    if text and value is not None:
+        return value.isoformat() if isinstance(value, (date, datetime)) else str(value)
+    return value
+
+
+class ColumnMap:
+    """Maps the header of a sheet onto the fields of a Create schema."""
+
+    def __init__(self, schema: Type[BaseModel], header: Sequence[Any], aliases: Dict[str, str]):
+        fields = schema.model_fields
+        text_fields = {name for name, field in fields.items() if field.annotation in (str, Optional[str])}
+        self.columns: List[Tuple[int, str, bool]] = []
+        self.ignored: List[str] = []
+        for index, name in enumerate(header):
+            key = normalize_header(name)
+            key = aliases.get(key, key)
+            if key in fields and key not in self.fields:
+                self.columns.append((index, key, key in text_fields))
+            elif name is not None and str(name).strip():
+                self.ignored.append(str(name).strip())
+
+    @property
+    def fields(self) -> Set[str]:
+        return {field for _, field, _ in self.columns}
+
+    def record(self, values: Sequence[Any]) -> Dict[str, Any]:
+        """Field values of one row; blank cells are left out, so schema defaults apply."""
+        record = {}
+        for index, field, text in self.columns:
+            value = _clean(values[index], text) if index < len(values) else None
+            if value is not None:
+                record[field] = value
+        return record
+
+
+def _row_errors(row_number: int, error: ValidationError) -> List[Tuple[int, str, str]]:
+    return [(row_number, ".".join(map(str, item["loc"])), item["msg"]) for item in error.errors()]
+
+
+def import_rows(
+    db: Session,
+    crud: Any,
+    schema: Type[BaseModel],
+    path: Union[str, Path],
+    *,
+    errors_path: Union[str, Path],
+    aliases: Optional[Dict[str, str]] = None,
+    defaults: Optional[Dict[str, Any]] = None,
+    values: Optional[Dict[str, Any]] = None,
+    project_ids: Optional[Set[int]] = None,
+    batch_size: int = 1000,
+    progress: Optional[Callable[[int, Optional[int]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Import the rows of a CSV/XLSX file into `crud`'s table.
+
+    `defaults` fill fields that are missing or blank in a row (e.g. project_id
+    of a per-project upload); `values` are set on every record (e.g.
+    created_by). With `project_ids`, rows of unknown projects are rejected.
+    Every row error goes to a CSV error report at `errors_path`. `progress`
+    is called after every batch with SheetReader's position and total.
+    Returns a summary with the counts, ignored columns and the first errors.
+    Raises ValueError when the file cannot be imported at all.
+    """
+    defaults = defaults or {}
+    summary: Dict[str, Any] = {"rows": 0, "inserted": 0, "failed": 0, "ignored_columns": [], "errors": []}
+
+    with SheetReader(path) as sheet, open(errors_path, "w", newline="", encoding="utf-8") as report:
+        columns = ColumnMap(schema, sheet.header, aliases or {})
+        missing = [
+            name for name, field in schema.model_fields.items()
+            if field.is_required() and name not in columns.fields and name not in defaults
+        ]
+        if missing:
+            raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+        summary["ignored_columns"] = columns.ignored
+        writer = csv.writer(report)
+        writer.writerow(ERROR_REPORT_HEADER)
+
+        def fail(errors: List[Tuple[int, str, str]]):
+            writer.writerows(errors)
+            summary["failed"] += len({row for row, _, _ in errors})
+            room = ERRORS_IN_RESULT - len(summary["errors"])
+            summary["errors"].extend(
+                {"row": row, "column": column or None, "message": message} for row, column, message in errors[:room]
+            )
+
+        def store(batch: List[Tuple[int, Dict[str, Any]]]):
+            valid: List[Tuple[int, BaseModel]] = []
+            errors: List[Tuple[int, str, str]] = []
+            for row_number, record in batch:
+                try:
+                    obj_in = schema.model_validate({**defaults, **record})
+                except ValidationError as e:
+                    errors.extend(_row_errors(row_number, e))
+                    continue
+                if project_ids is not None and obj_in.project_id not in project_ids:
+                    errors.append((row_number, "project_id", f"Project {obj_in.project_id} does not exist"))
+                    continue
+                valid.append((row_number, obj_in))
+            if valid:
+                try:
+                    crud.create_many(db, [obj_in for _, obj_in in valid], chunk_size=batch_size, **(values or {}))
+                    summary["inserted"] += len(valid)
+                except SQLAlchemyError as e:
+                    # create_many rolled the batch back: none of its rows is stored
+                    message = f"Not stored: {getattr(e, 'orig', None) or e}"
+                    errors.extend((row_number, "", message) for row_number, _ in valid)
+            if errors:
+                fail(sorted(errors))
+            summary["rows"] += len(batch)
+            if progress:
+                progress(sheet.position, sheet.total)
+
+        if progress:
+            progress(sheet.position, sheet.total)
+        batch: List[Tuple[int, Dict[str, Any]]] = []
+        for row_number, row in sheet:
+            batch.append((row_number, columns.record(row)))
+            if len(batch) >= batch_size:
+                store(batch)
+                batch = []
+        if batch:
+            store(batch)
+
+    return summary
@@ -0,0 +1,45 @@
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Table
+from sqlalchemy.engine import Connection
+
+
+def upsert_increment(
+    connection: Connection,
+    table: Table,
+    keys: Dict[str, Any],
+    column: str,
+    amount: int = 1,
+    values: Optional[Dict[str, Any]] = None,
+):
+    """
+    Atomically add `amount` to `column` of the row identified by `keys`, inserting the
+    row (with `column` = `amount`) if it does not exist yet. `keys` must match a
+    unique constraint and must not contain NULLs.
+    Uses INSERT ... ON CONFLICT on SQLite and PostgreSQL.
+    """
+    values = values or {}
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        insert = None
+
+    if insert is not None:
+        stmt = insert(table).values(**keys, **values, **{column: amount})
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={column: table.c[column] + amount, **values},
+        )
+        connection.execute(stmt)
+        return
+
+    # Generic fallback: update, then insert if nothing was updated
+    condition = [table.c[name] == value for name, value in keys.items()]
+    result = connection.execute(
+        table.update().where(*condition).values({column: table.c[column] + amount, **values})
+    )
+    if result.rowcount == 0:
+        connection.execute(table.insert().values(**keys, **values, **{column: amount}))
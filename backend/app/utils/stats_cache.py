@@ -0,0 +1,238 @@
+"""
+Short-lived cache for dashboard statistics.
+
+Wall dashboards poll the stats endpoints every few seconds, so identical requests
+share one computation for up to the TTL. Entries are also dropped as soon as a
+commit changes the figures of a project (see dashboard_counters.add_change_listener):
+the project's own entry and the global dashboard entry are invalidated.
+
+The default backend lives in process memory. The file backend stores entries in a
+local directory, so every worker process on the host shares them and sees the
+invalidations made by the others.
+
+Each backend also keeps an invalidation generation per key. A value is only stored
+if the generation of its key did not change while it was being computed, so a
+computation that overlapped a write is never cached, even when another worker
+made the write.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_KEY = "dashboard"
+
+
+def project_key(project_id: int) -> str:
+    return f"project:{project_id}"
+
+
+class MemoryBackend:
+    name = "memory"
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: str, value: Any, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def generation(self, key: str) -> int:
+        with self._lock:
+            return self._generations.get(key, 0)
+
+    def bump_generation(self, key: str):
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class FileBackend:
+    """JSON files in a local directory, shared by all processes on the host."""
+    name = "file"
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str, suffix: str = ".json") -> Path:
+        return self.directory / (hashlib.sha1(key.encode("utf-8")).hexdigest() + suffix)
+
+    def _write(self, path: Path, text: str):
+        partial = self.directory / f"{uuid.uuid4().hex}.part"
+        with open(partial, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(partial, path)
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        if entry["expires"] <= time.time():
+            return None
+        return entry["value"]
+
+    def set(self, key: str, value: Any, ttl: float):
+        self._write(self._path(key), json.dumps({"expires": time.time() + ttl, "value": value}))
+
+    def delete(self, key: str):
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def generation(self, key: str) -> str:
+        try:
+            return self._path(key, ".generation").read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return ""
+
+    def bump_generation(self, key: str):
+        # A fresh token rather than a counter: replacing the file is atomic across
+        # processes, a read-increment-write would not be
+        self._write(self._path(key, ".generation"), uuid.uuid4().hex)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.directory.glob("*.json"))
+
+
+class StatsCache:
+    def __init__(self, backend, ttl_seconds: float, enabled: bool = True):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+        # key -> [lock, number of callers holding or waiting for it]
+        self._key_locks: Dict[str, list] = {}
+
+    @contextmanager
+    def _key_lock(self, key: str) -> Iterator[None]:
+        """Hold the lock of `key`; it is dropped once nobody holds or waits for it."""
+        with self._lock:
+            entry = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._key_locks[key]
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Return (value, cache hit). On a miss only one caller per key computes the
+        value; concurrent callers wait for it and are served from the cache.
+        """
+        if not self.enabled:
+            return compute(), False
+
+        value = self.backend.get(key)
+        if value is not None:
+            self._count(True)
+            return value, True
+
+        with self._key_lock(key):
+            value = self.backend.get(key)
+            if value is not None:
+                self._count(True)
+                return value, True
+            self._count(False)
+            generation = self.backend.generation(key)
+            value = compute()
+            if self.backend.generation(key) == generation:
+                self.backend.set(key, value, self.ttl_seconds)
+            return value, False
+
+    def get_or_compute_many(
+        self, keys: List[str], compute: Callable[[List[str]], Dict[str, Any]]
+    ) -> Tuple[Dict[str, Any], int]:
+        """
+        Return ({key: value}, number of cache hits). The missing keys are computed
+        together by compute(missing_keys), which returns a value per key.
+        """
+        if not self.enabled:
+            return compute(keys), 0
+
+        values = {}
+        missing = []
+        for key in keys:
+            value = self.backend.get(key)
+            if value is None:
+                missing.append(key)
+            else:
+                values[key] = value
+        with self._lock:
+            self.hits += len(values)
+            self.misses += len(missing)
+        generations = {key: self.backend.generation(key) for key in missing}
+
+        if missing:
+            computed = compute(missing)
+            for key, value in computed.items():
+                if key in generations and self.backend.generation(key) == generations[key]:
+                    self.backend.set(key, value, self.ttl_seconds)
+            values.update(computed)
+        return values, len(keys) - len(missing)
+
+    def invalidate(self, keys: Iterable[str]):
+        for key in keys:
+            self.backend.bump_generation(key)
+            with self._lock:
+                self.invalidations += 1
+            self.backend.delete(key)
+
+    def invalidate_projects(self, project_ids: Iterable[int]):
+        """Drop the entries affected by a write to these projects."""
+        self.invalidate([DASHBOARD_KEY, *(project_key(project_id) for project_id in project_ids)])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "backend": self.backend.name,
+            "ttl_seconds": self.ttl_seconds,
+            "entries": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
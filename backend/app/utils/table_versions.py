@@ -0,0 +1,96 @@
+"""
+Per-table write counters.
+
+Flushes that insert, update or delete rows record the affected tables on the
+session; once the transaction commits, their counters are bumped in a short
+transaction of their own. The writer's transaction never touches the counter rows,
+so concurrent writers do not queue behind each other's row locks on them. They are
+cheap to read and make good cache validators: a reader that sees the new data
+before the bump lands caches it under the old counter, which is never asked for
+again once the bump is visible.
+
+Only writes made through ORM flushes are counted. Raw SQL, Core bulk statements
+(`session.execute(update(...))`), migrations and other applications writing to the
+database never bump a counter, so caches keyed on them are not invalidated.
+"""
+import logging
+from datetime import datetime
+from itertools import chain
+from typing import Dict, Iterable
+
+from sqlalchemy import event, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from ..models.table_version import TableVersion
+from .sql_helpers import upsert_increment
+
+logger = logging.getLogger(__name__)
+
+_VERSION_TABLE = TableVersion.__table__
+# session.info key collecting the tables written by the current transaction
+_PENDING_TABLES = "table_versions_pending"
+
+
+def _changed_tables(session: Session) -> set:
+    changed = chain(
+        session.new,
+        session.deleted,
+        (obj for obj in session.dirty if session.is_modified(obj, include_collections=False)),
+    )
+    tables = {obj.__table__.name for obj in changed if hasattr(obj, "__table__")}
+    tables.discard(_VERSION_TABLE.name)
+    return tables
+
+
+@event.listens_for(Session, "after_flush")
+def _record_changed_tables(session: Session, flush_context):
+    tables = _changed_tables(session)
+    if tables:
+        session.info.setdefault(_PENDING_TABLES, set()).update(tables)
+
+
+def _bump(connection: Connection, tables: Iterable[str]):
+    now = datetime.utcnow()
+    # Sorted so concurrent bumps take the row locks in the same order
+    for table_name in sorted(tables):
+        upsert_increment(
+            connection,
+            _VERSION_TABLE,
+            {"table_name": table_name},
+            "version",
+            values={"updated_at": now},
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_table_versions(session: Session):
+    tables = session.info.pop(_PENDING_TABLES, None)
+    if not tables:
+        return
+    bind = session.get_bind()
+    try:
+        if isinstance(bind, Engine):
+            with bind.begin() as connection:
+                _bump(connection, tables)
+        else:
+            # Session bound to a connection: the caller owns its transaction
+            _bump(bind, tables)
+    except Exception:
+        logger.exception("Could not bump the write counters of %s", ", ".join(sorted(tables)))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_tables(session: Session):
+    session.info.pop(_PENDING_TABLES, None)
+
+
+def current_versions(db: Session, table_names: Iterable[str]) -> Dict[str, int]:
+    """Return the write counter of each table (0 for tables never written through the ORM)."""
+    names = list(table_names)
+    rows = db.execute(
+        select(TableVersion.table_name, TableVersion.version).where(TableVersion.table_name.in_(names))
+    ).all()
+    versions = {name: 0 for name in names}
+    versions.update({name: version for name, version in rows})
+    return versions
@@ -0,0 +1,344 @@
+"""
+Constant-memory XLSX writer.
+
+Rows are serialized straight into a zip stream and handed back as byte chunks,
+so a worksheet never has to be held in memory and the first bytes can be sent
+to the client while later rows are still being read from the database.
+"""
+import contextvars
+import math
+import re
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import Executor, Future, as_completed
+from datetime import date, datetime
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+# (sheet name, header labels, row iterable)
+Sheet = Tuple[str, Sequence[str], Iterable[Sequence[Any]]]
+# Called on a worker thread to build one sheet; its rows are consumed on that thread
+SheetProducer = Callable[[], Sheet]
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Bytes buffered before a chunk is handed to the caller
+DEFAULT_FLUSH_SIZE = 64 * 1024
+
+# Serialized sheet XML kept in memory by a concurrent producer before spilling to disk
+SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+
+_EXCEL_EPOCH = datetime(1899, 12, 30)
+_ILLEGAL_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# Style indexes into the cellXfs table of _STYLES_XML
+_STYLE_HEADER = 1
+_STYLE_DATE = 2
+_STYLE_DATETIME = 3
+
+_XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+_STYLES_XML = (
+    _XML_HEADER
+    + f'<styleSheet xmlns="{_MAIN_NS}">'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="4">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="22" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+_ROOT_RELS_XML = (
+    _XML_HEADER
+    + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+
+class ChunkBuffer:
+    """Write-only, non-seekable file object whose contents are drained in chunks."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._size = 0
+        self._position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._size += len(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    @property
+    def closed(self) -> bool:
+        return False
+
+    @property
+    def pending(self) -> int:
+        return self._size
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        self._size = 0
+        return data
+
+
+def _column_letter(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _cell_xml(ref: str, value: Any, style: int = 0) -> str:
+    if value is None:
+        return ""
+    style_attr = f' s="{style}"' if style else ""
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"{style_attr}><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)) and math.isfinite(value):
+        return f'<c r="{ref}"{style_attr}><v>{value!r}</v></c>'
+    if isinstance(value, datetime):
+        delta = value.replace(tzinfo=None) - _EXCEL_EPOCH
+        serial = delta.days + delta.seconds / 86400 + delta.microseconds / 86400000000
+        return f'<c r="{ref}" s="{_STYLE_DATETIME}"><v>{serial!r}</v></c>'
+    if isinstance(value, date):
+        serial = (value - _EXCEL_EPOCH.date()).days
+        return f'<c r="{ref}" s="{_STYLE_DATE}"><v>{serial}</v></c>'
+    text = escape(_ILLEGAL_XML_CHARS.sub("", str(value)))
+    return f'<c r="{ref}" t="inlineStr"{style_attr}><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _row_xml(row_number: int, letters: List[str], values: Sequence[Any], style: int = 0) -> str:
+    while len(letters) < len(values):
+        letters.append(_column_letter(len(letters)))
+    cells = "".join(
+        _cell_xml(f"{letters[i]}{row_number}", value, style)
+        for i, value in enumerate(values)
+    )
+    return f'<row r="{row_number}">{cells}</row>'
+
+
+def _workbook_xml(sheet_names: List[str]) -> str:
+    sheets = "".join(
+        f'<sheet name="{escape(name, {chr(34): "&quot;"})}" sheetId="{i}" r:id="rId{i}"/>'
+        for i, name in enumerate(sheet_names, 1)
+    )
+    return (
+        _XML_HEADER
+        + f'<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}"><sheets>{sheets}</sheets></workbook>'
+    )
+
+
+def _workbook_rels_xml(sheet_count: int) -> str:
+    rels = "".join(
+        f'<Relationship Id="rId{i}" Type="{_REL_NS}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+        for i in range(1, sheet_count + 1)
+    )
+    rels += (
+        f'<Relationship Id="rId{sheet_count + 1}" Type="{_REL_NS}/styles" Target="styles.xml"/>'
+    )
+    return (
+        _XML_HEADER
+        + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        + rels
+        + "</Relationships>"
+    )
+
+
+def _content_types_xml(sheet_count: int) -> str:
+    overrides = "".join(
+        f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        for i in range(1, sheet_count + 1)
+    )
+    return (
+        _XML_HEADER
+        + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        + overrides
+        + "</Types>"
+    )
+
+
+def _sheet_name(name: str, used: set) -> str:
+    # Excel limits sheet names to 31 characters and forbids a few symbols
+    clean = re.sub(r"[\[\]:*?/\\]", "_", name)[:31] or "Sheet"
+    candidate, suffix = clean, 1
+    while candidate.lower() in used:
+        suffix += 1
+        candidate = f"{clean[:31 - len(str(suffix)) - 1]}_{suffix}"
+    used.add(candidate.lower())
+    return candidate
+
+
+def _sheet_xml(headers: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[bytes]:
+    """Serialize one worksheet part, one row at a time."""
+    letters: List[str] = []
+    yield (_XML_HEADER + f'<worksheet xmlns="{_MAIN_NS}"><sheetData>').encode("utf-8")
+    yield _row_xml(1, letters, list(headers), _STYLE_HEADER).encode("utf-8")
+    for row_number, row in enumerate(rows, 2):
+        yield _row_xml(row_number, letters, row).encode("utf-8")
+    yield b"</sheetData></worksheet>"
+
+
+def _write_entry(
+    archive: zipfile.ZipFile, index: int, parts: Iterable[bytes], buffer: ChunkBuffer, flush_size: int
+) -> Iterator[bytes]:
+    with archive.open(f"xl/worksheets/sheet{index}.xml", mode="w", force_zip64=True) as entry:
+        for data in parts:
+            entry.write(data)
+            if buffer.pending >= flush_size:
+                yield buffer.drain()
+    if buffer.pending:
+        yield buffer.drain()
+
+
+def _write_workbook(archive: zipfile.ZipFile, names: List[str]):
+    used_names: set = set()
+    sheet_names = [_sheet_name(name, used_names) for name in names]
+    archive.writestr("xl/workbook.xml", _workbook_xml(sheet_names))
+    archive.writestr("xl/_rels/workbook.xml.rels", _workbook_rels_xml(len(sheet_names)))
+    archive.writestr("xl/styles.xml", _STYLES_XML)
+    archive.writestr("_rels/.rels", _ROOT_RELS_XML)
+    archive.writestr("[Content_Types].xml", _content_types_xml(len(sheet_names)))
+
+
+def stream_xlsx(sheets: Iterable[Sheet], flush_size: int = DEFAULT_FLUSH_SIZE) -> Iterator[bytes]:
+    """
+    Serialize worksheets into an XLSX file, yielding it as a sequence of byte chunks.
+
+    ``sheets`` is consumed lazily, so each sheet's rows are only fetched once the
+    writer reaches that sheet. Memory use is bounded by ``flush_size`` plus the
+    compressor window, regardless of the number of rows.
+    """
+    buffer = ChunkBuffer()
+    names: List[str] = []
+
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for index, (name, headers, rows) in enumerate(sheets, 1):
+            names.append(name)
+            yield from _write_entry(archive, index, _sheet_xml(headers, rows), buffer, flush_size)
+        _write_workbook(archive, names)
+
+    yield buffer.drain()
+
+
+class _WriterStopped(Exception):
+    """Raised on a producer thread once the writer has stopped consuming sheets."""
+
+
+def _produce_sheet(producer: SheetProducer, stopped: threading.Event) -> Tuple[str, IO[bytes], float]:
+    """Run a producer and serialize its sheet into a spooled temporary file."""
+    started = time.perf_counter()
+    name, headers, rows = producer()
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    try:
+        for data in _sheet_xml(headers, rows):
+            # Stop reading rows as soon as nobody is going to write the sheet
+            if stopped.is_set():
+                raise _WriterStopped()
+            spool.write(data)
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+    return name, spool, time.perf_counter() - started
+
+
+def _close_spool(future: Future):
+    if not future.cancelled() and future.exception() is None:
+        future.result()[1].close()
+
+
+def _read_blocks(spool: IO[bytes]) -> Iterator[bytes]:
+    while True:
+        data = spool.read(DEFAULT_FLUSH_SIZE)
+        if not data:
+            return
+        yield data
+
+
+def stream_xlsx_concurrent(
+    producers: Sequence[SheetProducer],
+    executor: Executor,
+    trailing_sheets: Optional[Callable[[], Iterable[Sheet]]] = None,
+    timings: Optional[Dict[str, float]] = None,
+    flush_size: int = DEFAULT_FLUSH_SIZE,
+) -> Iterator[bytes]:
+    """
+    Serialize worksheets into an XLSX file, producing the sheets concurrently.
+
+    Each producer runs on ``executor`` and its rows are serialized there into a
+    temporary file. The calling thread is the only writer: it adds every sheet to
+    the archive as soon as it is ready, so the total time approaches that of the
+    slowest sheet. Sheets keep the order of ``producers`` in the workbook.
+
+    ``trailing_sheets`` is called once all produced sheets have been written and
+    its sheets are appended after them. When ``timings`` is given, the seconds
+    each producer took are recorded under its sheet name.
+    """
+    stopped = threading.Event()
+    # Each producer runs in a copy of the caller's context, so per-request state
+    # such as the SQL statistics follows it onto the worker thread
+    futures = {
+        executor.submit(contextvars.copy_context().run, _produce_sheet, producer, stopped): index
+        for index, producer in enumerate(producers, 1)
+    }
+    names: Dict[int, str] = {}
+    buffer = ChunkBuffer()
+    try:
+        with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for future in as_completed(futures):
+                index = futures[future]
+                name, spool, elapsed = future.result()
+                with spool:
+                    yield from _write_entry(archive, index, _read_blocks(spool), buffer, flush_size)
+                names[index] = name
+                if timings is not None:
+                    timings[name] = elapsed
+
+            index = len(producers)
+            for name, headers, rows in (trailing_sheets() if trailing_sheets else []):
+                index += 1
+                names[index] = name
+                yield from _write_entry(archive, index, _sheet_xml(headers, rows), buffer, flush_size)
+            _write_workbook(archive, [names[i] for i in sorted(names)])
+
+        yield buffer.drain()
+    finally:
+        # If the writer stopped early: drop sheets that have not started, tell running producers
+        # to stop, and close every spool once its producer is done with it
+        stopped.set()
+        for future in futures:
+            if not future.cancel():
+                future.add_done_callback(_close_spool)
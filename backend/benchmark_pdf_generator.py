@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark PDF report rendering: the original all-Paragraph layout against the
+fast table path. Prints rows/sec for each mode.
+
+Usage: python benchmark_pdf_generator.py [rows ...]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.utils.pdf_generator import PDFGenerator
+
+DEFAULT_ROW_COUNTS = [200, 1000, 2000]
+
+
+def make_records(count):
+    records = []
+    for i in range(count):
+        records.append({
+            "line_no": f"L-{i // 50:04d}",
+            "spool_no": f"SP-{i // 10:05d}",
+            "joint_no": f"J{i:05d}",
+            "part1_grade": "A106-B",
+            "part1_size": "6\"",
+            "part2_grade": "A234-WPB" if i % 7 else "A234-WPB LONG RADIUS ELBOW 90 DEG SCH 40",
+            "part2_size": "6\"",
+            "joint_type": "BW",
+            "part1_thickness": "7.11",
+            "wps_no": "WPS-001",
+            "welder_no": f"W{i % 12:02d}",
+            "fitup_result": "accepted",
+            "final_result": "accepted",
+        })
+    return records
+
+
+def run(generator, method, records, operator_data):
+    started = time.perf_counter()
+    buffer = getattr(generator, method)(records, operator_data)
+    elapsed = time.perf_counter() - started
+    return elapsed, len(buffer.getvalue())
+
+
+def main():
+    row_counts = [int(arg) for arg in sys.argv[1:]] or DEFAULT_ROW_COUNTS
+    operator_data = {
+        "project": "Benchmark",
+        "location": "Yard 1",
+        "report_no": "BENCH-001",
+        "drawing_no": "DWG-001",
+        "inspector": "QC",
+    }
+    modes = [("paragraph", PDFGenerator(fast_tables=False)), ("fast", PDFGenerator(fast_tables=True))]
+
+    print(f"{'report':<8} {'rows':>6} {'mode':<10} {'seconds':>8} {'rows/sec':>10} {'bytes':>10}")
+    for method, label in [("generate_fitup_report", "fitup"), ("generate_final_inspection_report", "final")]:
+        for count in row_counts:
+            records = make_records(count)
+            timings = {}
+            for mode, generator in modes:
+                elapsed, size = run(generator, method, records, operator_data)
+                timings[mode] = elapsed
+                print(f"{label:<8} {count:>6} {mode:<10} {elapsed:>8.2f} {count / elapsed:>10.0f} {size:>10}")
+            print(f"{'':<8} {'':>6} speedup    {timings['paragraph'] / timings['fast']:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark mixed read/write throughput on a SQLite file with the default settings
+against SQLITE_PERFORMANCE_PROFILE (WAL, synchronous=NORMAL, cache, mmap, busy
+timeout). Writer threads insert fit-ups and commit, like the fit-up router;
+reader threads list fit-ups and compute the dashboard statistics. Prints
+operations/sec and "database is locked" errors for each mode.
+
+Usage: python benchmark_sqlite_profile.py [seconds] [writers] [readers]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.database import Base, make_engine
+from app import models
+from app.utils.dashboard_stats import dashboard_stats
+
+SEED_FITUPS = 2000
+
+
+def seed(Session):
+    db = Session()
+    user = models.User(username="bench", email="bench@example.com", hashed_password="-", role="admin")
+    db.add(user)
+    db.flush()
+    project = models.Project(project_number="BENCH", project_name="Benchmark", client="Client",
+                             project_manager="PM", start_date=date.today(), created_by=user.id)
+    db.add(project)
+    db.flush()
+    db.add_all(
+        models.Fitup(project_id=project.id, joint_no=f"S{i}", line_no=f"L{i % 40}", created_by=user.id)
+        for i in range(SEED_FITUPS)
+    )
+    db.commit()
+    ids = project.id, user.id
+    db.close()
+    return ids
+
+
+def worker(Session, operation, deadline, results, key):
+    ops = errors = 0
+    while time.perf_counter() < deadline:
+        db = Session()
+        try:
+            operation(db)
+            ops += 1
+        except OperationalError:
+            errors += 1
+            db.rollback()
+        finally:
+            db.close()
+    with results["lock"]:
+        results[key] += ops
+        results["errors"] += errors
+
+
+def run_mode(profile: bool, seconds: float, writers: int, readers: int):
+    settings.sqlite_performance_profile = profile
+    with tempfile.TemporaryDirectory() as directory:
+        engine = make_engine(f"sqlite:///{directory}/bench.db")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        project_id, user_id = seed(Session)
+
+        def write(db):
+            db.add(models.Fitup(project_id=project_id, joint_no="W", line_no="L0", created_by=user_id))
+            db.commit()
+
+        def read(db):
+            db.query(models.Fitup).filter(models.Fitup.line_no == "L7").limit(50).all()
+            dashboard_stats(db)
+
+        results = {"lock": threading.Lock(), "writes": 0, "reads": 0, "errors": 0}
+        deadline = time.perf_counter() + seconds
+        threads = [threading.Thread(target=worker, args=(Session, write, deadline, results, "writes"))
+                   for _ in range(writers)]
+        threads += [threading.Thread(target=worker, args=(Session, read, deadline, results, "reads"))
+                    for _ in range(readers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with engine.connect() as connection:
+            journal_mode = connection.exec_driver_sql("PRAGMA journal_mode").scalar()
+        engine.dispose()
+    return journal_mode, results
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    writers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    readers = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+
+    print(f"{seconds:g}s, {writers} writer and {readers} reader threads")
+    print(f"{'mode':<10} {'journal':<8} {'writes/s':>9} {'reads/s':>9} {'locked':>7}")
+    for label, profile in [("default", False), ("profile", True)]:
+        journal_mode, results = run_mode(profile, seconds, writers, readers)
+        print(f"{label:<10} {journal_mode:<8} {results['writes'] / seconds:>9.1f} "
+              f"{results['reads'] / seconds:>9.1f} {results['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Script to rebuild the dashboard_counters summary table from the record tables.
+
+Run it after importing data with raw SQL, or whenever the dashboard figures look off.
+`alembic upgrade head` fills empty counters of databases that predate them on its own.
+"""
+
+import sys
+import os
+
+# Add the project root directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.app.database import SessionLocal, engine, Base
+from backend.app.utils.dashboard_counters import rebuild_counters
+
+def main():
+    # Create database tables if they don't exist
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    try:
+        rows = rebuild_counters(db)
+        print(f"✅ Rebuilt dashboard counters: {rows} counter rows")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Tests for the asyncio database path: the aiosqlite engine and session factory,
+AsyncCRUDBase against the sync CRUD objects, and the async list/get endpoints
+of the fit-up, final inspection, NDT and material routers with a real token.
+
+Uses a temporary SQLite file, so no database server is needed:
+    python test_async_db.py    (or: pytest test_async_db.py)
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app.core.security import create_access_token, get_password_hash
+from app.database import (
+    Base, InstrumentedAsyncQueuePool, async_database_url, get_async_db, get_db, make_async_engine, make_engine
+)
+from app import models
+from app.crud import (
+    fitup_crud, final_inspection_crud, ndt_request_crud, material_crud,
+    fitup_async_crud, final_inspection_async_crud, ndt_request_async_crud, material_async_crud,
+)
+from app.routers import fitup, final, ndt, material
+
+PAIRS = [
+    (fitup_crud, fitup_async_crud),
+    (final_inspection_crud, final_inspection_async_crud),
+    (ndt_request_crud, ndt_request_async_crud),
+    (material_crud, material_async_crud),
+]
+
+
+@contextmanager
+def seeded_database(rows=30):
+    """Sync and async session factories on one temporary SQLite file with two projects."""
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{directory}/async.db"
+        engine, async_engine = make_engine(url), make_async_engine(async_database_url(url))
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        AsyncSession = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+        db = Session()
+        user = models.User(username="reader", email="reader@example.com",
+                           hashed_password=get_password_hash("secret"), role="admin")
+        db.add(user)
+        db.flush()
+        projects = [
+            models.Project(project_number=f"P{i}", project_name=f"Project {i}", client="Client",
+                           project_manager="PM", start_date=date.today(), created_by=user.id)
+            for i in (1, 2)
+        ]
+        db.add_all(projects)
+        db.flush()
+        for i in range(rows):
+            project_id, status = projects[i % 2].id, ("pending", "approved")[i % 3 == 0]
+            db.add(models.Fitup(project_id=project_id, joint_no=f"J{i}", status=status, created_by=user.id))
+            db.add(models.FinalInspection(project_id=project_id, joint_no=f"J{i}", status=status,
+                                          created_by=user.id))
+            db.add(models.NDTRequest(project_id=project_id, joint_no=f"J{i}", ndt_method=("RT", "UT")[i % 2],
+                                     status=status, created_by=user.id))
+            db.add(models.Material(project_id=project_id, material_type="pipe", heat_no=f"H{i}",
+                                   status=status, created_by=user.id))
+        project_ids = [project.id for project in projects]
+        db.commit()
+        db.close()
+        try:
+            yield Session, AsyncSession, project_ids
+        finally:
+            asyncio.run(async_engine.dispose())
+            engine.dispose()
+
+
+def ids(objs):
+    return sorted(obj.id for obj in objs)
+
+
+def test_async_url_and_pool():
+    assert async_database_url("sqlite:///./fabrication_app.db") == "sqlite+aiosqlite:///./fabrication_app.db"
+    assert async_database_url("postgresql://u:pw@db:5432/app") == "postgresql+asyncpg://u:pw@db:5432/app"
+    assert async_database_url("sqlite+aiosqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+    with tempfile.TemporaryDirectory() as directory:
+        async_engine = make_async_engine(f"sqlite+aiosqlite:///{directory}/pool.db")
+        assert isinstance(async_engine.pool, InstrumentedAsyncQueuePool)
+        asyncio.run(async_engine.dispose())
+
+
+def test_async_crud_matches_sync():
+    with seeded_database() as (Session, AsyncSession, project_ids):
+        async def compare():
+            db = Session()
+            async with AsyncSession() as adb:
+                for crud, async_crud in PAIRS:
+                    assert await async_crud.count(adb) == crud.count(db)
+                    assert ids(await async_crud.get_multi(adb, skip=5, limit=10)) == \
+                        ids(crud.get_multi(db, skip=5, limit=10))
+                    assert ids(await async_crud.get_by_project(adb, project_id=project_ids[1])) == \
+                        ids(crud.get_by_project(db, project_id=project_ids[1]))
+                    assert ids(await async_crud.get_by_status(adb, status="approved")) == \
+                        ids(crud.get_by_status(db, status="approved"))
+                    first = crud.get_multi(db, limit=1)[0]
+                    assert (await async_crud.get(adb, first.id)).id == first.id
+                    assert await async_crud.get(adb, 10_000) is None
+                    assert [obj.id for obj in await async_crud.get_many(adb, [3, 1, 999, 2])] == [3, 1, 2]
+                assert ids(await ndt_request_async_crud.get_by_ndt_method(adb, "UT")) == \
+                    ids(ndt_request_crud.get_by_ndt_method(db, "UT"))
+            db.close()
+
+        asyncio.run(compare())
+
+
+def test_async_endpoints():
+    with seeded_database() as (Session, AsyncSession, project_ids):
+        app = FastAPI()
+        for router, prefix in ((fitup.router, "/fitup"), (final.router, "/final"),
+                               (ndt.router, "/ndt"), (material.router, "/material")):
+            app.include_router(router, prefix=prefix)
+
+        def override_db():
+            db = Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        async def override_async_db():
+            async with AsyncSession() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = override_db
+        app.dependency_overrides[get_async_db] = override_async_db
+        client = TestClient(app)
+
+        assert client.get("/fitup/").status_code == 401
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': 'reader'})}"}
+        assert client.get("/fitup/", headers={"Authorization": "Bearer bad"}).status_code == 401
+
+        for prefix, crud in (("/fitup", fitup_crud), ("/final", final_inspection_crud),
+                             ("/ndt", ndt_request_crud), ("/material", material_crud)):
+            response = client.get(f"{prefix}/", params={"limit": 7, "skip": 2}, headers=headers)
+            assert response.status_code == 200, response.text
+            with Session() as db:
+                expected = crud.get_multi(db, skip=2, limit=7)
+            assert sorted(item["id"] for item in response.json()) == ids(expected)
+
+            item = response.json()[0]
+            response = client.get(f"{prefix}/{item['id']}", headers=headers)
+            assert response.status_code == 200 and response.json() == item
+            assert client.get(f"{prefix}/10000", headers=headers).status_code == 404
+
+        response = client.get("/fitup/", params={"project_id": project_ids[0]}, headers=headers)
+        assert {item["project_id"] for item in response.json()} == {project_ids[0]}
+        response = client.get("/material/", params={"status": "approved"}, headers=headers)
+        assert response.json() and {item["status"] for item in response.json()} == {"approved"}
+
+        # Writes still use the sync session; the async reads see them
+        created = client.post("/fitup/", json={"project_id": project_ids[0], "joint_no": "NEW"}, headers=headers)
+        assert created.status_code == 200, created.text
+        response = client.get(f"/fitup/{created.json()['id']}", headers=headers)
+        assert response.json()["joint_no"] == "NEW"
+
+
+if __name__ == "__main__":
+    test_async_url_and_pool()
+    test_async_crud_matches_sync()
+    test_async_endpoints()
+    print("✅ Async database tests passed")
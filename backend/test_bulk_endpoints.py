@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Tests for the bulk create/update endpoints (POST and PATCH /<table>/bulk) and
+CRUDBase.create_many / update_many: ids in request order, one transaction per
+request, all-or-nothing failures and dashboard counters kept in step.
+
+Uses a temporary SQLite file, so no database server is needed:
+    python test_bulk_endpoints.py    (or: pytest test_bulk_endpoints.py)
+"""
+
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event, func
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.security import create_access_token, get_password_hash
+from app.crud import fitup_crud
+from app.database import Base, get_db, make_engine
+from app import models
+from app.routers import final, fitup, material, ndt
+from app.utils import dashboard_counters  # noqa: F401  (registers the session listeners)
+
+ROWS = 1000
+
+
+@contextmanager
+def bulk_client():
+    with tempfile.TemporaryDirectory() as directory:
+        engine = make_engine(f"sqlite:///{directory}/bulk.db")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        db = Session()
+        user = models.User(username="admin", email="admin@example.com",
+                           hashed_password=get_password_hash("secret"), role="admin")
+        db.add(user)
+        db.flush()
+        project = models.Project(project_number="P1", project_name="Project 1", client="Client",
+                                 project_manager="PM", start_date=date.today(), created_by=user.id)
+        db.add(project)
+        db.commit()
+        project_id = project.id
+        db.close()
+
+        app = FastAPI()
+        for router, prefix in ((fitup.router, "/fitup"), (final.router, "/final"),
+                               (ndt.router, "/ndt"), (material.router, "/material")):
+            app.include_router(router, prefix=prefix)
+
+        def override_db():
+            session = Session()
+            try:
+                yield session
+            finally:
+                session.close()
+
+        app.dependency_overrides[get_db] = override_db
+        client = TestClient(app)
+        client.headers["Authorization"] = f"Bearer {create_access_token({'sub': 'admin'})}"
+        try:
+            yield client, engine, Session, project_id
+        finally:
+            engine.dispose()
+
+
+@contextmanager
+def count_commits(engine):
+    counted = []
+
+    def commit(conn):
+        counted.append(conn)
+
+    event.listen(engine, "commit", commit)
+    try:
+        yield counted
+    finally:
+        event.remove(engine, "commit", commit)
+
+
+def fitup_payload(project_id, count):
+    return [{"project_id": project_id, "line_no": f"L{i % 7}", "joint_no": f"J{i}",
+             "fitup_inspection_date": "2024-05-01", "status": ("pending", "approved")[i % 2]}
+            for i in range(count)]
+
+
+def counter_total(db, entity):
+    return db.query(func.coalesce(func.sum(models.DashboardCounter.count), 0)).filter(
+        models.DashboardCounter.entity == entity
+    ).scalar()
+
+
+def test_bulk_create():
+    with bulk_client() as (client, engine, Session, project_id):
+        with count_commits(engine) as commits:
+            response = client.post("/fitup/bulk", json=fitup_payload(project_id, ROWS))
+        assert response.status_code == 200, response.text
+        result = response.json()
+        assert result["count"] == ROWS and len(set(result["ids"])) == ROWS
+        # One transaction for the whole batch, then the table write counter bump
+        # (besides the user lookup's session)
+        assert len(commits) == 2, len(commits)
+
+        with Session() as db:
+            by_id = {f.id: f for f in db.query(models.Fitup)}
+            assert [by_id[id].joint_no for id in result["ids"]] == [f"J{i}" for i in range(ROWS)]
+            first = by_id[result["ids"][0]]
+            assert first.fitup_inspection_date == date(2024, 5, 1) and first.created_by == 1
+            # Session listeners ran: dashboard counters include every new record
+            assert counter_total(db, "fitups") == ROWS
+
+        for path, record in (
+            ("/final/bulk", {"project_id": project_id, "joint_no": "J1", "welder_no": "W1",
+                             "final_inspection_date": "2024-05-02"}),
+            ("/ndt/bulk", {"project_id": project_id, "joint_no": "J1", "ndt_method": "RT"}),
+            ("/material/bulk", {"project_id": project_id, "material_type": "pipe", "heat_no": "H1"}),
+        ):
+            response = client.post(path, json=[record, record])
+            assert response.status_code == 200 and response.json()["count"] == 2, (path, response.text)
+
+        assert client.post("/fitup/bulk", json=[]).json() == {"count": 0, "ids": []}
+
+
+def test_bulk_create_is_all_or_nothing():
+    with bulk_client() as (client, engine, Session, project_id):
+        payload = fitup_payload(project_id, 5)
+        payload[3]["part1_thickness"] = "thick"
+        response = client.post("/fitup/bulk", json=payload)
+        assert response.status_code == 422
+
+        # A failure in a later chunk rolls back the chunks already flushed
+        records = [{**record, "fitup_inspection_date": date(2024, 5, 1)} for record in fitup_payload(project_id, 30)]
+        records.append({"project_id": project_id, "no_such_column": 1})
+        with Session() as db:
+            try:
+                fitup_crud.create_many(db, records, chunk_size=10, created_by=1)
+                assert False, "invalid record accepted"
+            except TypeError:
+                pass
+        with Session() as db:
+            assert db.query(models.Fitup).count() == 0
+            assert counter_total(db, "fitups") == 0
+
+        saved = settings.bulk_max_items
+        settings.bulk_max_items = 3
+        try:
+            assert client.post("/fitup/bulk", json=fitup_payload(project_id, 4)).status_code == 413
+        finally:
+            settings.bulk_max_items = saved
+
+
+def test_bulk_update():
+    with bulk_client() as (client, engine, Session, project_id):
+        ids = client.post("/fitup/bulk", json=fitup_payload(project_id, 20)).json()["ids"]
+
+        changes = [{"id": id, "status": "approved", "is_approved": True} for id in ids[:10]]
+        changes.append({"id": ids[10], "fitup_result": "accepted"})
+        response = client.patch("/fitup/bulk", json=changes)
+        assert response.status_code == 200, response.text
+        assert response.json() == {"count": 11, "ids": ids[:11]}
+
+        with Session() as db:
+            by_id = {f.id: f for f in db.query(models.Fitup)}
+            assert all(by_id[id].status == "approved" and by_id[id].is_approved for id in ids[:10])
+            # Fields that were not sent keep their values
+            assert by_id[ids[0]].joint_no == "J0" and by_id[ids[0]].fitup_inspection_date == date(2024, 5, 1)
+            assert by_id[ids[10]].fitup_result == "accepted" and by_id[ids[10]].status == "pending"
+            assert counter_total(db, "fitups") == 20
+
+        # An unknown id fails the whole request
+        response = client.patch("/fitup/bulk", json=[{"id": ids[11], "status": "rejected"}, {"id": 99999}])
+        assert response.status_code == 404 and "99999" in response.json()["detail"]
+        with Session() as db:
+            assert db.get(models.Fitup, ids[11]).status == "approved"
+
+        material_ids = client.post("/material/bulk", json=[{"project_id": project_id, "material_type": "pipe"}]).json()["ids"]
+        response = client.patch("/material/bulk", json=[{"id": material_ids[0], "status": "approved"}])
+        assert response.json()["ids"] == material_ids
+
+
+if __name__ == "__main__":
+    test_bulk_create()
+    test_bulk_create_is_all_or_nothing()
+    test_bulk_update()
+    print("✅ Bulk endpoint tests passed")
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for the live dashboard event broker: fan-out from writer threads, resuming
+from Last-Event-ID, overflow handling, and the counter deltas published on commit.
+
+No server is needed:
+    python test_dashboard_events.py    (or: pytest test_dashboard_events.py)
+"""
+
+import asyncio
+import os
+import sys
+import threading
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app import models
+from app.utils.dashboard_counters import add_delta_listener
+from app.utils.dashboard_events import EventBroker
+
+
+def test_fan_out_and_resume():
+    async def scenario():
+        broker = EventBroker(replay_size=3)
+        first, _ = broker.subscribe()
+        second, _ = broker.subscribe()
+
+        # Published from a worker thread, like the commit of a sync endpoint
+        writer = threading.Thread(target=broker.publish, args=("counters", {"n": 1}))
+        writer.start()
+        writer.join()
+        events = [await asyncio.wait_for(subscription.queue.get(), 1) for subscription in (first, second)]
+        assert events[0] == events[1] and events[0].data == '{"n": 1}'
+        broker.unsubscribe(first)
+        broker.unsubscribe(second)
+
+        for n in range(2, 6):
+            broker.publish("counters", {"n": n})
+        resumed, backlog = broker.subscribe(f"{broker.stream_id}:3")
+        assert [event.data for event in backlog] == ['{"n": 4}', '{"n": 5}']
+        # Event 1 has left the replay buffer, and ids of another stream are unknown
+        assert broker.subscribe(f"{broker.stream_id}:1")[1] is None
+        assert broker.subscribe("0123abcd:4")[1] is None
+        assert broker.subscribe(broker.last_event_id)[1] == []
+        broker.unsubscribe(resumed)
+
+    asyncio.run(scenario())
+
+
+def test_overflow_marks_subscription():
+    async def scenario():
+        broker = EventBroker(max_queue=2)
+        subscription, _ = broker.subscribe()
+        for n in range(4):
+            broker.publish("counters", {"n": n})
+        await asyncio.sleep(0)
+        assert subscription.overflowed
+        assert subscription.drain() == f"{broker.stream_id}:2"
+        assert subscription.queue.empty() and not subscription.overflowed
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_publishers_keep_id_order():
+    async def scenario():
+        broker = EventBroker(max_queue=10000)
+        subscription, _ = broker.subscribe()
+        writers = [
+            threading.Thread(target=lambda: [broker.publish("counters", {"n": n}) for n in range(500)])
+            for _ in range(4)
+        ]
+        # Switch threads as often as possible, so publishers interleave
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for writer in writers:
+                writer.start()
+            for writer in writers:
+                writer.join()
+        finally:
+            sys.setswitchinterval(interval)
+        received = [await asyncio.wait_for(subscription.queue.get(), 1) for _ in range(2000)]
+        assert [int(sse.id.partition(":")[2]) for sse in received] == list(range(1, 2001))
+
+    asyncio.run(scenario())
+
+
+def test_commit_publishes_net_deltas():
+    published = []
+    add_delta_listener(published.append)
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    project = models.Project(project_number="P1", project_name="Project", client="Client",
+                             project_manager="PM", start_date=date.today(), created_by=1)
+    db.add(project)
+    db.commit()
+    published.clear()
+
+    ndt = models.NDTRequest(project_id=project.id, joint_no="1", created_by=1)
+    db.add(ndt)
+    db.flush()
+    ndt.status = "completed"
+    db.commit()
+    assert published == [{(project.id, "ndt_requests", "completed", "", date.today()): 1}]
+
+    # Changes that cancel out within a transaction publish nothing
+    ndt.status = "failed"
+    db.flush()
+    ndt.status = "completed"
+    db.commit()
+    assert len(published) == 1
+    db.close()
+
+
+if __name__ == "__main__":
+    test_fan_out_and_resume()
+    test_overflow_marks_subscription()
+    test_concurrent_publishers_keep_id_order()
+    test_commit_publishes_net_deltas()
+    print("✅ Dashboard event tests passed")
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Query-count and dashboard counter regression tests for the dashboard statistics.
+
+Runs against an in-memory SQLite database, so no server is needed:
+    python test_dashboard_queries.py    (or: pytest test_dashboard_queries.py)
+"""
+
+import os
+import sys
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, event, func
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app import models
+from app.utils.dashboard_stats import dashboard_stats, project_stats, projects_stats, trends
+from app.utils.dashboard_counters import rebuild_counters
+
+# Table scans: one aggregate query per table (projects, materials, fitups, final inspections, NDT requests)
+MAX_DASHBOARD_SCAN_QUERIES = 5
+# Table scans: one aggregate query per inspection table
+MAX_PROJECT_SCAN_QUERIES = 3
+# dashboard_counters: a single query
+MAX_COUNTER_QUERIES = 1
+
+
+def make_session():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    return engine, sessionmaker(bind=engine)()
+
+
+def seed(db, rows=60):
+    projects = [
+        models.Project(
+            project_number=f"P{i}", project_name=f"Project {i}", client="Client",
+            project_manager="PM", start_date=date.today(), status=status, created_by=1
+        )
+        for i, status in enumerate(["active", "completed", "on_hold", "active"])
+    ]
+    db.add_all(projects)
+    db.flush()
+    for i in range(rows):
+        created = date.today() - timedelta(days=i * 3)
+        project_id = projects[i % 2].id
+        approval = [True, False, None][i % 3]
+        db.add(models.Fitup(project_id=project_id, joint_no=str(i), is_approved=approval, created_by=1, created_at=created))
+        db.add(models.FinalInspection(project_id=project_id, joint_no=str(i), is_approved=approval, created_by=1, created_at=created))
+        db.add(models.NDTRequest(
+            project_id=project_id, joint_no=str(i), status=["pending", "in_progress", "completed", "failed"][i % 4],
+            created_by=1, created_at=created
+        ))
+        db.add(models.Material(
+            project_id=project_id, material_type="pipe", heat_no=f"H{i}", status=["available", "reserved", "used"][i % 3],
+            created_by=1, created_at=created
+        ))
+    db.commit()
+    return projects
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+
+def count(db, model, *conditions):
+    return db.query(func.count(model.id)).filter(*conditions).scalar()
+
+
+def check_dashboard_stats(db, stats):
+    """Compare dashboard figures with plain per-condition counts"""
+    recent = date.today() - timedelta(days=7)
+    trend_since = date.today() - timedelta(days=90)
+    assert stats["overview"]["total_fitups"] == count(db, models.Fitup)
+    assert stats["overview"]["total_projects"] == count(db, models.Project)
+    assert stats["acceptance_rates"]["fitup"]["approved"] == count(db, models.Fitup, models.Fitup.is_approved == True)
+    assert stats["acceptance_rates"]["fitup"]["rejected"] == count(db, models.Fitup, models.Fitup.is_approved == False)
+    assert stats["acceptance_rates"]["final_inspection"]["pending"] == count(
+        db, models.FinalInspection, models.FinalInspection.is_approved == None
+    )
+    for status in ["pending", "in_progress", "completed", "failed"]:
+        assert stats["status_breakdown"]["ndt"][status] == count(db, models.NDTRequest, models.NDTRequest.status == status)
+    assert stats["status_breakdown"]["materials"]["used"] == count(db, models.Material, models.Material.status == "used")
+    for status in ["active", "completed", "on_hold"]:
+        assert stats["status_breakdown"]["projects"][status] == count(db, models.Project, models.Project.status == status)
+    assert stats["recent_activity"]["last_7_days"]["fitups"] == count(db, models.Fitup, models.Fitup.created_at >= recent)
+    assert sum(point["count"] for point in stats["monthly_trends"]["ndt_requests"]) == count(
+        db, models.NDTRequest, models.NDTRequest.created_at >= trend_since
+    )
+
+
+def test_dashboard_stats_query_count():
+    engine, db = make_session()
+    seed(db)
+
+    with QueryCounter(engine) as counter:
+        scanned = dashboard_stats(db, use_counters=False)
+    assert len(counter.statements) <= MAX_DASHBOARD_SCAN_QUERIES, counter.statements
+    check_dashboard_stats(db, scanned)
+
+    with QueryCounter(engine) as counter:
+        from_counters = dashboard_stats(db, use_counters=True)
+    assert len(counter.statements) <= MAX_COUNTER_QUERIES, counter.statements
+    assert from_counters == scanned
+    db.close()
+
+
+def test_project_stats_query_count():
+    engine, db = make_session()
+    projects = seed(db)
+    project_id = projects[0].id
+
+    with QueryCounter(engine) as counter:
+        scanned = project_stats(db, project_id, use_counters=False)
+    assert len(counter.statements) <= MAX_PROJECT_SCAN_QUERIES, counter.statements
+
+    assert scanned["counts"]["fitups"] == count(db, models.Fitup, models.Fitup.project_id == project_id)
+    assert scanned["pending_ndt"] == count(
+        db, models.NDTRequest, models.NDTRequest.project_id == project_id, models.NDTRequest.status == "pending"
+    )
+
+    with QueryCounter(engine) as counter:
+        from_counters = project_stats(db, project_id, use_counters=True)
+    assert len(counter.statements) <= MAX_COUNTER_QUERIES, counter.statements
+    assert from_counters == scanned
+    db.close()
+
+
+def test_projects_stats_query_count():
+    engine, db = make_session()
+    project_ids = [project.id for project in seed(db)]
+
+    with QueryCounter(engine) as counter:
+        scanned = projects_stats(db, project_ids, use_counters=False)
+    # One GROUP BY project_id query per inspection table, however many projects
+    assert len(counter.statements) <= MAX_PROJECT_SCAN_QUERIES, counter.statements
+
+    with QueryCounter(engine) as counter:
+        from_counters = projects_stats(db, project_ids, use_counters=True)
+    assert len(counter.statements) <= MAX_COUNTER_QUERIES, counter.statements
+
+    assert list(scanned) == project_ids
+    assert from_counters == scanned
+    for project_id in project_ids:
+        assert scanned[project_id] == project_stats(db, project_id, use_counters=False)
+    # Projects without records still get an entry
+    assert scanned[project_ids[2]]["counts"] == {"fitups": 0, "final_inspections": 0, "ndt_requests": 0}
+    db.close()
+
+
+def counter_rows(db):
+    return sorted(
+        (row.project_id, row.entity, row.status, row.approval, row.day, row.count)
+        for row in db.query(models.DashboardCounter).filter(models.DashboardCounter.count != 0)
+    )
+
+
+def test_counters_follow_writes():
+    engine, db = make_session()
+    projects = seed(db, rows=30)
+
+    # Update an expired instance, the way the routers do after a commit
+    fitup = db.query(models.Fitup).first()
+    db.commit()
+    fitup.is_approved = None
+    fitup.project_id = projects[1].id
+    db.commit()
+
+    ndt = db.query(models.NDTRequest).filter(models.NDTRequest.status == "pending").first()
+    ndt.status = "completed"
+    db.add(models.NDTRequest(project_id=projects[2].id, joint_no="new", created_by=1))
+    db.delete(db.query(models.Material).first())
+    db.commit()
+
+    projects[3].status = "completed"
+    db.delete(db.query(models.FinalInspection).first())
+    db.commit()
+
+    maintained = counter_rows(db)
+    rebuild_counters(db)
+    assert maintained == counter_rows(db)
+    check_dashboard_stats(db, dashboard_stats(db, use_counters=True))
+    db.close()
+
+
+def test_trends():
+    engine, db = make_session()
+    projects = seed(db)
+    end = date.today()
+    start = end - timedelta(days=100)
+
+    for granularity, buckets in (("day", 101), ("week", None), ("month", None)):
+        with QueryCounter(engine) as counter:
+            scanned = trends(db, granularity, start, end, use_counters=False)
+        # Range predicates only, so the query is portable and can use the created_at index
+        assert not any("strftime" in statement for statement in counter.statements)
+        assert trends(db, granularity, start, end, use_counters=True) == scanned
+
+        series = scanned["series"]["fitups"]
+        if buckets:
+            assert len(series) == buckets
+        # Contiguous buckets covering the whole range, empty ones included
+        assert series[0]["start"] == start.isoformat() and series[-1]["end"] == end.isoformat()
+        for previous, following in zip(series, series[1:]):
+            assert date.fromisoformat(previous["end"]) + timedelta(days=1) == date.fromisoformat(following["start"])
+        assert any(point["count"] == 0 for point in series) or granularity != "day"
+        assert sum(point["count"] for point in series) == count(db, models.Fitup, models.Fitup.created_at >= start)
+
+    weekly = trends(db, "week", start, end, entities=["ndt_requests"], project_id=projects[0].id, use_counters=False)
+    assert all(date.fromisoformat(point["start"]).weekday() == 0 for point in weekly["series"]["ndt_requests"][1:])
+    assert sum(point["count"] for point in weekly["series"]["ndt_requests"]) == count(
+        db, models.NDTRequest, models.NDTRequest.project_id == projects[0].id, models.NDTRequest.created_at >= start
+    )
+    db.close()
+
+
+if __name__ == "__main__":
+    test_dashboard_stats_query_count()
+    test_project_stats_query_count()
+    test_projects_stats_query_count()
+    test_counters_follow_writes()
+    test_trends()
+    print("✅ Dashboard statistics tests passed")
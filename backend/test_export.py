@@ -0,0 +1,665 @@
+#!/usr/bin/env python3
+"""
+Tests for the export subsystem:
+- the streaming XLSX writer and the per-table Excel endpoints
+- keyset-chunked full-table reads
+- the CSV, Parquet and Arrow extracts with their filters
+- background export jobs with ranged downloads
+- the ETag artifact cache
+- single-query loading of PDF report records
+- the batch PDF ZIP
+- the fast PDF table path
+- the export column registry
+- concurrent sheet production for the comprehensive workbook
+
+Uses a temporary SQLite file, so no database server is needed:
+    python test_export.py    (or: pytest test_export.py)
+"""
+
+import csv
+import io
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from openpyxl import load_workbook
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.security import create_access_token, get_password_hash
+from app.crud import fitup_crud
+from app.database import Base, get_db, make_engine
+from app import models
+from app.routers import export
+from app.utils.export_cache import ExportCache
+from app.utils.export_columns import get_projection, register_projection
+from app.utils.job_queue import JobQueue, JobStatus
+from app.utils.pdf_generator import PDFGenerator
+from app.utils.table_versions import current_versions
+from app.utils import xlsx_stream
+from app.utils.xlsx_stream import stream_xlsx, stream_xlsx_concurrent
+
+
+ROWS = 45
+TODAY = date(2024, 5, 20)
+
+
+def fitup_row(i):
+    return dict(
+        project=i % 2, status=("pending", "approved", "rejected")[i % 3], joint_no=f"J{i}",
+        created_at=TODAY - timedelta(days=i % 9), part1_thickness=6.35 + i, is_approved=i % 4 == 1,
+        fitup_inspection_date=TODAY - timedelta(days=i % 5), fitup_report_no=f"FR-{i % 3}" if i % 5 else None,
+    )
+
+
+@contextmanager
+def export_client():
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        engine = make_engine(f"sqlite:///{directory}/export.db")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        db = Session()
+        admin = models.User(username="admin", email="admin@example.com",
+                            hashed_password=get_password_hash("secret"), role="admin")
+        db.add(admin)
+        db.add_all([
+            models.User(username=name, email=f"{name}@example.com",
+                        hashed_password=get_password_hash("secret"), role="inspector")
+            for name in ("inspector", "other-inspector")
+        ])
+        db.flush()
+        project_list = [
+            models.Project(project_number=f"P{i}", project_name=f"Project {i}", client="Client",
+                           project_manager="PM", start_date=TODAY, created_by=admin.id)
+            for i in range(2)
+        ]
+        db.add_all(project_list)
+        db.flush()
+        project_ids = [project.id for project in project_list]
+        for i in range(ROWS):
+            row = fitup_row(i)
+            project_id = project_ids[row["project"]]
+            db.add(models.Fitup(
+                project_id=project_id, line_no=f"L{i % 4}", spool_no=f"S{i % 3}", joint_no=row["joint_no"],
+                part1_grade="A106", part1_size='6"', part1_thickness=row["part1_thickness"],
+                fitup_inspection_date=row["fitup_inspection_date"], fitup_report_no=row["fitup_report_no"],
+                fitup_result="accepted", status=row["status"], is_approved=row["is_approved"],
+                created_at=row["created_at"], created_by=admin.id,
+            ))
+            db.add(models.FinalInspection(
+                project_id=project_id, joint_no=row["joint_no"], welder_no=f"W{i % 6}",
+                final_inspection_date=row["fitup_inspection_date"], final_report_no=f"FN-{i % 2}",
+                final_result="accepted", created_at=row["created_at"], created_by=admin.id,
+            ))
+            db.add(models.NDTRequest(project_id=project_id, joint_no=row["joint_no"], ndt_method="RT",
+                                     created_by=admin.id))
+            db.add(models.Material(project_id=project_id, material_type="pipe", heat_no=f"H{i}",
+                                   created_by=admin.id))
+        db.commit()
+        db.close()
+
+        saved = (settings.export_dir, settings.export_cache_enabled, export.SessionLocal,
+                 export.export_cache, export.export_jobs)
+        settings.export_dir = directory / "exports"
+        settings.export_cache_enabled = True
+        export.SessionLocal = Session
+        export.export_cache = ExportCache(directory / "cache", max_bytes=64 * 1024 * 1024)
+        export.export_jobs = JobQueue(directory / "jobs", max_workers=1)
+        try:
+            app = FastAPI()
+            app.include_router(export.router, prefix="/export")
+
+            def override_db():
+                session = Session()
+                try:
+                    yield session
+                finally:
+                    session.close()
+
+            app.dependency_overrides[get_db] = override_db
+            client = TestClient(app)
+            client.headers["Authorization"] = f"Bearer {create_access_token({'sub': 'admin'})}"
+            yield client, Session, project_ids
+        finally:
+            (settings.export_dir, settings.export_cache_enabled, export.SessionLocal,
+             export.export_cache, export.export_jobs) = saved
+            engine.dispose()
+
+
+def workbook(content):
+    return load_workbook(io.BytesIO(content))
+
+
+def sheet_values(sheet):
+    return [list(row) for row in sheet.iter_rows(values_only=True)]
+
+
+# Streaming XLSX writer and per-table Excel exports
+
+def test_xlsx_writer():
+    rows = [
+        [1, 2.5, True, None, "a & <b>", date(2024, 5, 1), datetime(2024, 5, 1, 13, 30)],
+        [2, -1.0, False, "x", "bell\x07 removed", None, None],
+    ]
+    sheets = [
+        ("Fit-ups: P1/P2", ["ID", "Value"], iter([[1, "one"]])),
+        ("A" * 40, ["ID"], iter([])),
+        ("Data", ["ID", "Float", "Bool", "Empty", "Text", "Date", "Datetime"], iter(rows)),
+        ("data", ["ID"], iter([[3]])),
+    ]
+    content = b"".join(stream_xlsx(sheets, flush_size=64))
+    book = workbook(content)
+    # Forbidden characters replaced, names cut to 31 characters and deduplicated case-insensitively
+    assert book.sheetnames == ["Fit-ups_ P1_P2", "A" * 31, "Data", "data_2"]
+    assert sheet_values(book["Fit-ups_ P1_P2"]) == [["ID", "Value"], [1, "one"]]
+    assert sheet_values(book["A" * 31]) == [["ID"]]
+    assert sheet_values(book["Data"]) == [
+        ["ID", "Float", "Bool", "Empty", "Text", "Date", "Datetime"],
+        [1, 2.5, True, None, "a & <b>", datetime(2024, 5, 1), datetime(2024, 5, 1, 13, 30)],
+        [2, -1, False, "x", "bell removed", None, None],
+    ]
+
+
+def test_excel_exports():
+    with export_client() as (client, Session, project_ids):
+        response = client.get("/export/excel/fitups")
+        assert response.status_code == 200, response.text
+        assert response.headers["content-type"] == export.XLSX_MEDIA_TYPE
+        projection = get_projection(models.Fitup)
+        with Session() as db:
+            expected = db.execute(projection.select().order_by(models.Fitup.id)).all()
+        book = workbook(response.content)
+        assert book.sheetnames == ["Fit-ups"]
+        values = sheet_values(book["Fit-ups"])
+        assert values[0] == projection.headers and len(values) == ROWS + 1
+        # Dates come back from Excel as midnight datetimes
+        assert values[1:] == [
+            [datetime.combine(v, datetime.min.time()) if isinstance(v, date) else v for v in row]
+            for row in expected
+        ]
+
+        for path, sheet_name in (("materials", "Materials"), ("final-inspections", "Final Inspections"),
+                                 ("ndt-requests", "NDT Requests")):
+            book = workbook(client.get(f"/export/excel/{path}").content)
+            assert book.sheetnames == [sheet_name] and len(sheet_values(book[sheet_name])) == ROWS + 1
+
+
+# Keyset-chunked full-table reads
+
+def test_chunked_iteration():
+    with export_client() as (client, Session, project_ids):
+        with Session() as db:
+            chunks = list(fitup_crud.iter_chunks(db, chunk_size=20))
+            assert [len(chunk) for chunk in chunks] == [20, 20, 5]
+            objects = [obj for chunk in chunks for obj in chunk]
+            assert [obj.joint_no for obj in objects] == [f"J{i}" for i in range(ROWS)]
+            # Chunks are expunged once the caller moves on, so the session does not grow with the table
+            assert not any(obj in db for obj in objects)
+
+            chunks = list(fitup_crud.iter_chunks(db, chunk_size=20, columns=["id", "joint_no", "status"]))
+            rows = [row for chunk in chunks for row in chunk]
+            assert all(type(row) is tuple and len(row) == 3 for row in rows)
+            assert [row[1] for row in rows] == [f"J{i}" for i in range(ROWS)]
+            assert [row[0] for row in rows] == sorted(row[0] for row in rows)
+
+        # Exports read every row in chunks, not just the first page of get_multi
+        saved = export.EXPORT_CHUNK_SIZE
+        export.EXPORT_CHUNK_SIZE = 10
+        try:
+            book = workbook(client.get("/export/excel/fitups").content)
+        finally:
+            export.EXPORT_CHUNK_SIZE = saved
+        joint = get_projection(models.Fitup).headers.index("Joint No")
+        assert [row[joint] for row in sheet_values(book["Fit-ups"])[1:]] == [f"J{i}" for i in range(ROWS)]
+
+
+# CSV, Parquet and Arrow extracts
+
+def test_columnar_exports():
+    with export_client() as (client, Session, project_ids):
+        filters = {"project_id": project_ids[1], "status": "approved",
+                   "from_date": (TODAY - timedelta(days=6)).isoformat(), "to_date": (TODAY - timedelta(days=1)).isoformat()}
+        expected = [f"J{i}" for i in range(ROWS) if (
+            fitup_row(i)["project"] == 1 and fitup_row(i)["status"] == "approved"
+            and TODAY - timedelta(days=6) <= fitup_row(i)["created_at"] <= TODAY - timedelta(days=1)
+        )]
+        assert expected
+
+        response = client.get("/export/fitups.csv", params=filters)
+        assert response.status_code == 200 and response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["joint_no"] for row in rows] == expected
+        assert list(rows[0]) == get_projection(models.Fitup).attrs
+
+        response = client.get("/export/fitups.parquet", params=filters)
+        assert response.status_code == 200, response.text
+        table = pq.read_table(io.BytesIO(response.content))
+        schema = table.schema
+        assert schema.names == get_projection(models.Fitup).attrs
+        assert (schema.field("id").type, schema.field("part1_thickness").type, schema.field("is_approved").type,
+                schema.field("fitup_inspection_date").type, schema.field("joint_no").type) == \
+            (pa.int64(), pa.float64(), pa.bool_(), pa.date32(), pa.string())
+        assert table.column("joint_no").to_pylist() == expected
+
+        response = client.get("/export/fitups.arrow", params={"project_id": project_ids[0]})
+        assert response.status_code == 200, response.text
+        table = pa.ipc.open_stream(response.content).read_all()
+        assert table.schema.field("created_at").type == pa.date32()
+        assert table.column("joint_no").to_pylist() == [f"J{i}" for i in range(ROWS) if fitup_row(i)["project"] == 0]
+
+        response = client.get("/export/ndt-requests.parquet", params={"status": "no-such-status"})
+        assert pq.read_table(io.BytesIO(response.content)).num_rows == 0
+        assert client.get("/export/welders.csv").status_code == 404
+
+
+# Background export jobs
+
+def auth(username):
+    return {"Authorization": f"Bearer {create_access_token({'sub': username})}"}
+
+
+def wait_for(job, timeout=10):
+    deadline = time.monotonic() + timeout
+    while job.is_active:
+        assert time.monotonic() < deadline, "job did not finish"
+        time.sleep(0.02)
+    return job
+
+
+def test_export_jobs():
+    with export_client() as (client, Session, project_ids):
+        response = client.post("/export/jobs", json={"kind": "fitups"})
+        assert response.status_code == 202, response.text
+        job = wait_for(export.export_jobs.get(response.json()["id"]))
+
+        status = client.get(f"/export/jobs/{job.id}").json()
+        assert status["status"] == JobStatus.COMPLETED and status["progress"] == 1.0
+        assert status["rows_written"] == status["total_rows"] == ROWS
+        assert status["download_url"] == f"/export/jobs/{job.id}/download"
+
+        download = client.get(status["download_url"])
+        assert download.status_code == 200 and download.headers["accept-ranges"] == "bytes"
+        book = workbook(download.content)
+        assert len(sheet_values(book["Fit-ups"])) == ROWS + 1
+
+        size = len(download.content)
+        partial = client.get(status["download_url"], headers={"Range": "bytes=100-"})
+        assert partial.status_code == 206 and partial.content == download.content[100:]
+        assert partial.headers["content-range"] == f"bytes 100-{size - 1}/{size}"
+        suffix = client.get(status["download_url"], headers={"Range": "bytes=-50"})
+        assert suffix.status_code == 206 and suffix.content == download.content[-50:]
+        assert client.get(status["download_url"], headers={"Range": f"bytes={size}-"}).status_code == 416
+
+        assert client.post("/export/jobs", json={"kind": "welders"}).status_code == 400
+        assert client.get("/export/jobs/unknown").status_code == 404
+        assert client.get("/export/jobs/unknown/download").status_code == 404
+
+        # Only the users who submitted a job, and admins, can see or download it
+        response = client.post("/export/jobs", json={"kind": "materials"}, headers=auth("inspector"))
+        job = wait_for(export.export_jobs.get(response.json()["id"]))
+        for username, status_code in (("inspector", 200), ("admin", 200), ("other-inspector", 404)):
+            headers = auth(username)
+            assert client.get(f"/export/jobs/{job.id}", headers=headers).status_code == status_code, username
+            assert client.get(f"/export/jobs/{job.id}/download", headers=headers).status_code == status_code
+
+
+def test_job_queue():
+    with tempfile.TemporaryDirectory() as directory:
+        jobs = JobQueue(Path(directory), max_workers=1, ttl_seconds=0)
+        started, release = threading.Event(), threading.Event()
+
+        def render(path, progress):
+            progress(0, 4)
+            started.set()
+            assert release.wait(5)
+            progress(3)
+            path.write_bytes(b"done")
+            return {"rows": 4}
+
+        job = jobs.submit("report", "report", "report.txt", "text/plain", render, created_by=1)
+        assert started.wait(5)
+        assert (job.status, job.done, job.total, job.progress) == (JobStatus.RUNNING, 0, 4, 0.0)
+        # An identical request attaches to the running job
+        assert jobs.submit("report", "report", "report.txt", "text/plain", render, created_by=2) is job
+        assert job.requested_by == {1, 2}
+        release.set()
+        wait_for(job)
+        assert (job.status, job.result, job.progress, job.path.read_bytes()) == \
+            (JobStatus.COMPLETED, {"rows": 4}, 1.0, b"done")
+
+        def fail(path, progress):
+            path.write_bytes(b"partial")
+            raise RuntimeError("render failed")
+
+        failed = wait_for(jobs.submit("broken", "report", "broken.txt", "text/plain", fail))
+        assert (failed.status, failed.error, failed.path) == (JobStatus.FAILED, "render failed", None)
+        assert not list(Path(directory).glob("*.part"))
+
+        # Finished jobs past the TTL are forgotten on the next submit, artifacts included
+        path = job.path
+        time.sleep(0.01)
+        other = jobs.submit("other", "report", "other.txt", "text/plain", lambda path, progress: path.write_bytes(b"1"))
+        assert jobs.get(job.id) is None and not path.exists() and jobs.get(other.id) is other
+        # ... and on status lookups
+        wait_for(other)
+        time.sleep(0.01)
+        assert jobs.get(other.id) is None and not other.path.exists()
+
+
+# ETag artifact cache
+
+def test_export_cache_validation():
+    with export_client() as (client, Session, project_ids):
+        response = client.get("/export/fitups.csv")
+        etag = response.headers["etag"]
+        assert response.status_code == 200 and etag.startswith('"')
+
+        response = client.get("/export/fitups.csv", headers={"If-None-Match": etag})
+        assert response.status_code == 304 and response.content == b""
+        assert client.get("/export/fitups.csv", headers={"If-None-Match": f'"other", W/{etag}'}).status_code == 304
+        # Other filters are another artifact
+        assert client.get("/export/fitups.csv", params={"status": "pending"}).headers["etag"] != etag
+
+        cached = client.get("/export/fitups.csv")
+        assert cached.headers["etag"] == etag and cached.headers["accept-ranges"] == "bytes"
+        partial = client.get("/export/fitups.csv", headers={"Range": "bytes=0-9"})
+        assert partial.status_code == 206 and partial.content == cached.content[:10]
+        assert partial.headers["content-range"] == f"bytes 0-9/{len(cached.content)}"
+
+        # A committed write to the table changes the ETag
+        with Session() as db:
+            db.add(models.Fitup(project_id=project_ids[0], joint_no="J-new", created_by=1))
+            db.commit()
+        response = client.get("/export/fitups.csv", headers={"If-None-Match": etag})
+        assert response.status_code == 200 and response.headers["etag"] != etag
+        assert "J-new" in response.text
+        # Writes to other tables leave it alone
+        etag = response.headers["etag"]
+        with Session() as db:
+            db.add(models.Material(project_id=project_ids[0], material_type="plate", created_by=1))
+            db.commit()
+        assert client.get("/export/fitups.csv", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_table_versions_bumped_after_commit():
+    with export_client() as (client, Session, project_ids):
+        with Session() as db:
+            before = current_versions(db, ["fitups"])["fitups"]
+        with Session() as db, Session() as reader:
+            db.add(models.Fitup(project_id=project_ids[0], joint_no="J-flushed", created_by=1))
+            db.flush()
+            # The writer's transaction does not touch the counters
+            assert current_versions(db, ["fitups"])["fitups"] == before
+            db.rollback()
+            assert current_versions(reader, ["fitups"])["fitups"] == before
+            reader.rollback()
+
+            db.add(models.Fitup(project_id=project_ids[0], joint_no="J-committed", created_by=1))
+            db.commit()
+            assert current_versions(reader, ["fitups"])["fitups"] == before + 1
+
+
+def test_export_cache_eviction():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ExportCache(Path(directory), max_bytes=250)
+        for etag in ('"a"', '"b"'):
+            assert b"".join(cache.store_stream(etag, [b"x" * 50, b"y" * 50])) == b"x" * 50 + b"y" * 50
+            time.sleep(0.01)
+        # Reading an artifact marks it as recently used
+        cache.open('"a"').close()
+        time.sleep(0.01)
+        list(cache.store_stream('"c"', [b"z" * 100]))
+        assert cache.open('"b"') is None
+        with cache.open('"a"') as f:
+            assert f.read() == b"x" * 50 + b"y" * 50
+
+        # An abandoned stream leaves nothing behind
+        stream = cache.store_stream('"d"', iter([b"1", b"2"]))
+        next(stream)
+        stream.close()
+        assert cache.open('"d"') is None and not list(Path(directory).glob("*.part"))
+
+
+# Single-query loading of PDF report records
+
+def test_pdf_record_loading():
+    with export_client() as (client, Session, project_ids):
+        with Session() as db:
+            ids = [f.id for f in db.query(models.Fitup).order_by(models.Fitup.id)]
+            wanted = [ids[7], ids[2], 99999, ids[7], ids[30]]
+            # Request order kept, unknown ids skipped
+            assert [f.id for f in fitup_crud.get_many(db, wanted, chunk_size=2)] == [ids[7], ids[2], ids[7], ids[30]]
+            records = fitup_crud.get_many(db, [ids[3], ids[1]], columns=["joint_no"])
+            assert records == [{"id": ids[3], "joint_no": "J3"}, {"id": ids[1], "joint_no": "J1"}]
+
+        engine = Session.kw["bind"]
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            response = client.post("/export/pdf/fitups", json={
+                "record_ids": ids[:30] + [99999], "project": "P", "location": "Shop", "report_no": "FR-1",
+            })
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        assert response.status_code == 200 and response.content.startswith(b"%PDF")
+        assert len([s for s in statements if "FROM fitups" in s]) == 1, statements
+
+        response = client.post("/export/pdf/final-inspections", json={
+            "record_ids": [ids[4], ids[0]], "project": "P", "location": "Shop", "report_no": "FN-1",
+        })
+        assert response.status_code == 200 and response.content.startswith(b"%PDF")
+        assert client.post("/export/pdf/fitups", json={
+            "record_ids": [99999], "project": "P", "location": "Shop", "report_no": "FR-1",
+        }).status_code == 404
+
+
+# Batch PDF reports streamed as a ZIP
+
+def test_pdf_batch_zip():
+    with export_client() as (client, Session, project_ids):
+        response = client.post("/export/pdf/batch", json={"project_id": project_ids[0]})
+        assert response.status_code == 200, response.text
+        archive = zipfile.ZipFile(io.BytesIO(response.content))
+        fitup_reports = {fitup_row(i)["fitup_report_no"] for i in range(ROWS)
+                         if fitup_row(i)["project"] == 0 and fitup_row(i)["fitup_report_no"]}
+        # One PDF per report number; records without one are left out
+        assert sorted(archive.namelist()) == sorted(
+            [f"fitup/{report_no}.pdf" for report_no in fitup_reports] + ["final/FN-0.pdf"]
+        )
+        assert all(archive.read(name).startswith(b"%PDF") for name in archive.namelist())
+
+        response = client.post("/export/pdf/batch", json={"project_id": project_ids[1], "report_types": ["final"],
+                                                          "report_nos": ["FN-1"]})
+        assert zipfile.ZipFile(io.BytesIO(response.content)).namelist() == ["final/FN-1.pdf"]
+        assert client.post("/export/pdf/batch", json={"project_id": project_ids[0],
+                                                      "report_types": ["weld-map"]}).status_code == 400
+        assert client.post("/export/pdf/batch", json={"project_id": 99999}).status_code == 404
+
+
+# Fast PDF table path
+
+def test_pdf_fast_tables():
+    records = [
+        {"line_no": f"L{i}", "spool_no": "S1", "joint_no": f"J{i}", "part1_grade": "A106", "part1_size": '6"',
+         "part2_grade": "A105", "part2_size": '6"', "joint_type": "BW", "part1_thickness": 7.11,
+         "fitup_result": "accepted" if i % 7 else "a long remark that wraps onto a second line of the cell"}
+        for i in range(150)
+    ]
+    operator_data = {"project": "Project 1", "location": "Shop", "report_no": "FR-1", "date": "2024-05-01"}
+    fast = PDFGenerator(fast_tables=True).generate_fitup_report(records, operator_data).getvalue()
+    paragraph = PDFGenerator(fast_tables=False).generate_fitup_report(records, operator_data).getvalue()
+    pages = [len(re.findall(rb"/Type /Page\b(?!s)", pdf)) for pdf in (fast, paragraph)]
+    assert fast.startswith(b"%PDF") and paragraph.startswith(b"%PDF")
+    # The fast path breaks the table into pages the way the single paragraph table does
+    assert pages[0] == pages[1] > 1, pages
+
+
+# Export column registry
+
+def test_export_column_registry():
+    projection = get_projection(models.NDTRequest)
+    assert projection.headers[:3] == ["ID", "Project ID", "Line No"]
+    assert projection.attrs[:3] == ["id", "project_id", "line_no"]
+    assert export.FITUP_PDF_FIELDS == get_projection(models.Fitup).report_fields
+    try:
+        get_projection(models.User)
+        assert False, "users have no export columns"
+    except KeyError as e:
+        assert "User" in str(e)
+
+    with export_client() as (client, Session, project_ids):
+        with Session() as db:
+            row = db.execute(projection.select(["joint_no", "ndt_method"]).order_by(models.NDTRequest.id)).first()
+            assert tuple(row) == ("J0", "RT")
+
+        # Excel sheets and columnar extracts take their columns from the registry
+        register_projection(models.NDTRequest, [("Joint", "joint_no"), ("Method", "ndt_method")])
+        try:
+            book = workbook(client.get("/export/excel/ndt-requests").content)
+            assert sheet_values(book["NDT Requests"])[:2] == [["Joint", "Method"], ["J0", "RT"]]
+            assert client.get("/export/ndt-requests.csv").text.splitlines()[:2] == ["joint_no,ndt_method", "J0,RT"]
+        finally:
+            register_projection(models.NDTRequest, projection.columns, projection.report_fields)
+
+
+# Concurrent sheet production
+
+def test_xlsx_writer_concurrent_sheets():
+    release_first = threading.Event()
+    threads = set()
+
+    def producer(name, count, wait=None):
+        def produce():
+            threads.add(threading.current_thread().name)
+            if wait:
+                # The first sheet finishes last, yet keeps its place in the workbook
+                assert wait.wait(5)
+            return name, ["N"], ([n] for n in range(count))
+        return produce
+
+    def second():
+        sheet = producer("Second", 3)()
+        release_first.set()
+        return sheet
+
+    timings = {}
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        content = b"".join(stream_xlsx_concurrent(
+            [producer("First", 1000, wait=release_first), second],
+            executor,
+            trailing_sheets=lambda: [("Summary", ["Sheets"], iter([[len(timings)]]))],
+            timings=timings,
+        ))
+    book = workbook(content)
+    assert book.sheetnames == ["First", "Second", "Summary"]
+    assert sheet_values(book["First"])[1:] == [[n] for n in range(1000)]
+    assert sheet_values(book["Second"]) == [["N"], [0], [1], [2]]
+    # Trailing sheets are built once every produced sheet is written
+    assert sheet_values(book["Summary"]) == [["Sheets"], [2]]
+    assert set(timings) == {"First", "Second"} and threading.current_thread().name not in threads
+
+
+def test_xlsx_writer_stopped_early():
+    spools = []
+
+    class TrackedSpool(tempfile.SpooledTemporaryFile):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            spools.append(self)
+
+    slow_started = threading.Event()
+    slow_rows = []
+
+    def slow_rows_forever():
+        slow_started.set()
+        while True:
+            slow_rows.append(len(slow_rows))
+            time.sleep(0.001)
+            yield [len(slow_rows)]
+
+    def fast():
+        assert slow_started.wait(5)
+        return "Fast", ["N"], iter([[1], [2]])
+
+    saved = xlsx_stream.tempfile.SpooledTemporaryFile
+    xlsx_stream.tempfile.SpooledTemporaryFile = TrackedSpool
+    try:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            chunks = stream_xlsx_concurrent([lambda: ("Slow", ["N"], slow_rows_forever()), fast], executor)
+            assert next(chunks)
+            # The client went away while the slow sheet was still being read
+            chunks.close()
+    finally:
+        xlsx_stream.tempfile.SpooledTemporaryFile = saved
+    # The slow producer stopped reading rows and every spool was released
+    assert len(spools) == 2 and all(spool.closed for spool in spools)
+    rows_read = len(slow_rows)
+    time.sleep(0.05)
+    assert len(slow_rows) == rows_read
+
+
+def test_comprehensive_export():
+    with export_client() as (client, Session, project_ids):
+        logs = io.StringIO()
+        handler = logging.StreamHandler(logs)
+        export.logger.addHandler(handler)
+        export.logger.setLevel(logging.INFO)
+        try:
+            response = client.get("/export/excel/comprehensive")
+        finally:
+            export.logger.removeHandler(handler)
+        assert response.status_code == 200, response.text
+        # Streamed as the sheets finish; the per-sheet timings are logged afterwards
+        assert "content-length" not in response.headers and "server-timing" not in response.headers
+        line = json.loads(logs.getvalue())
+        assert line["event"] == "comprehensive_export"
+        assert set(line["sheets_ms"]) == {"Projects", "Materials", "Fit-ups", "Final Inspections", "NDT Requests"}
+        book = workbook(response.content)
+        assert book.sheetnames == ["Projects", "Materials", "Fit-ups", "Final Inspections", "NDT Requests", "Summary"]
+        assert sheet_values(book["Summary"]) == [
+            ["Category", "Count"], ["Projects", 2], ["Materials", ROWS], ["Fit-ups", ROWS],
+            ["Final Inspections", ROWS], ["NDT Requests", ROWS],
+        ]
+
+
+if __name__ == "__main__":
+    test_xlsx_writer()
+    test_excel_exports()
+    test_chunked_iteration()
+    test_columnar_exports()
+    test_export_jobs()
+    test_job_queue()
+    test_export_cache_validation()
+    test_table_versions_bumped_after_commit()
+    test_export_cache_eviction()
+    test_pdf_record_loading()
+    test_pdf_batch_zip()
+    test_pdf_fast_tables()
+    test_export_column_registry()
+    test_xlsx_writer_concurrent_sheets()
+    test_xlsx_writer_stopped_early()
+    test_comprehensive_export()
+    print("✅ Export tests passed")
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Tests for the composable list filters: filter_conditions() on its own, and the
+fit-up, final inspection, NDT and material list endpoints combining filters
+with sort, cursor pages and skip/limit.
+
+Uses a temporary SQLite file, so no database server is needed:
+    python test_list_filters.py    (or: pytest test_list_filters.py)
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app.core.security import create_access_token, get_password_hash
+from app.crud import fitup_crud
+from app.database import Base, async_database_url, get_async_db, get_db, make_async_engine, make_engine
+from app import models, schemas
+from app.routers import final, fitup, material, ndt
+
+ROWS = 60
+TODAY = date.today()
+
+
+def fitup_row(i):
+    return dict(
+        project=i % 2, status=("pending", "approved", "rejected")[i % 3],
+        is_approved=(False, True)[i % 4 == 1], line_no=f"L{i % 4}", spool_no=f"S{i % 5}", joint_no=f"J{i}",
+        created_at=TODAY - timedelta(days=i % 10), welder_no=f"W{i % 6}", ndt_method=("RT", "UT", "PT")[i % 3],
+        material_type=("pipe", "plate")[i % 2],
+    )
+
+
+@contextmanager
+def filtered_client():
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{directory}/filters.db"
+        engine, async_engine = make_engine(url), make_async_engine(async_database_url(url))
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        AsyncSession = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+        db = Session()
+        user = models.User(username="admin", email="admin@example.com",
+                           hashed_password=get_password_hash("secret"), role="admin")
+        db.add(user)
+        db.flush()
+        project_list = [
+            models.Project(project_number=f"P{i}", project_name=f"Project {i}", client="Client",
+                           project_manager="PM", start_date=TODAY, created_by=user.id)
+            for i in range(2)
+        ]
+        db.add_all(project_list)
+        db.flush()
+        project_ids = [project.id for project in project_list]
+        for i in range(ROWS):
+            row = fitup_row(i)
+            common = dict(project_id=project_ids[row["project"]], line_no=row["line_no"], spool_no=row["spool_no"],
+                          joint_no=row["joint_no"], status=row["status"], created_at=row["created_at"],
+                          created_by=user.id)
+            db.add(models.Fitup(**common, is_approved=row["is_approved"]))
+            db.add(models.FinalInspection(**common, is_approved=row["is_approved"], welder_no=row["welder_no"]))
+            db.add(models.NDTRequest(**common, welder_no=row["welder_no"], ndt_method=row["ndt_method"]))
+            db.add(models.Material(project_id=common["project_id"], status=row["status"],
+                                   material_type=row["material_type"], heat_no=f"H{i}",
+                                   created_at=row["created_at"], created_by=user.id))
+        db.commit()
+        db.close()
+
+        app = FastAPI()
+        for router, prefix in ((fitup.router, "/fitup"), (final.router, "/final"),
+                               (ndt.router, "/ndt"), (material.router, "/material")):
+            app.include_router(router, prefix=prefix)
+
+        async def override_async_db():
+            async with AsyncSession() as async_db:
+                yield async_db
+
+        def override_db():
+            sync_db = Session()
+            try:
+                yield sync_db
+            finally:
+                sync_db.close()
+
+        app.dependency_overrides[get_db] = override_db
+        app.dependency_overrides[get_async_db] = override_async_db
+        client = TestClient(app)
+        client.headers["Authorization"] = f"Bearer {create_access_token({'sub': 'admin'})}"
+        try:
+            yield client, project_ids
+        finally:
+            asyncio.run(async_engine.dispose())
+            engine.dispose()
+
+
+def expected_joints(predicate):
+    return sorted(f"J{i}" for i in range(ROWS) if predicate(fitup_row(i)))
+
+
+def joints(response):
+    assert response.status_code == 200, response.text
+    return sorted(item["joint_no"] for item in response.json() if "joint_no" in item)
+
+
+def test_filter_conditions():
+    assert fitup_crud.filter_conditions(None) == []
+    assert fitup_crud.filter_conditions(schemas.FitupFilter()) == []
+    conditions = fitup_crud.filter_conditions(schemas.FitupFilter(project_id=1, status="pending, approved",
+                                                                  approval="pending"))
+    assert [str(condition) for condition in conditions] == [
+        "fitups.project_id = :project_id_1",
+        "fitups.status IN (__[POSTCOMPILE_status_1])",
+        "fitups.is_approved IS NULL",
+    ]
+    assert fitup_crud.filter_conditions({"status": " , "}) == []
+    try:
+        fitup_crud.filter_conditions({"welder_no": "W1"})
+        assert False, "fit-ups have no welder filter"
+    except ValueError:
+        pass
+
+
+def test_list_endpoints_combine_filters():
+    with filtered_client() as (client, project_ids):
+        params = {"limit": 500}
+
+        # project_id and status together (previously only project_id was applied)
+        response = client.get("/fitup/", params={**params, "project_id": project_ids[1], "status": "approved"})
+        assert joints(response) == expected_joints(lambda r: r["project"] == 1 and r["status"] == "approved")
+
+        # Pending (is_approved IS NULL) is covered by test_filter_conditions: the
+        # response schemas need a boolean, so the seeded rows are all decided
+        for approval, value in (("approved", True), ("rejected", False)):
+            for prefix in ("/fitup/", "/final/"):
+                response = client.get(prefix, params={**params, "approval": approval})
+                assert joints(response) == expected_joints(lambda r: r["is_approved"] is value), (prefix, approval)
+
+        created_from, created_to = (TODAY - timedelta(days=6)).isoformat(), (TODAY - timedelta(days=2)).isoformat()
+        response = client.get("/fitup/", params={**params, "created_from": created_from, "created_to": created_to,
+                                                 "line_no": "L1", "status": "pending,rejected"})
+        assert joints(response) == expected_joints(
+            lambda r: TODAY - timedelta(days=6) <= r["created_at"] <= TODAY - timedelta(days=2)
+            and r["line_no"] == "L1" and r["status"] in ("pending", "rejected")
+        )
+        response = client.get("/fitup/", params={**params, "spool_no": "S3", "joint_no": "J8"})
+        assert joints(response) == ["J8"]
+
+        response = client.get("/final/", params={**params, "welder_no": "W2", "project_id": project_ids[0]})
+        assert joints(response) == expected_joints(lambda r: r["welder_no"] == "W2" and r["project"] == 0)
+
+        response = client.get("/ndt/", params={**params, "ndt_method": "RT,UT", "welder_no": "W4"})
+        assert joints(response) == expected_joints(lambda r: r["ndt_method"] in ("RT", "UT") and r["welder_no"] == "W4")
+
+        response = client.get("/material/", params={**params, "material_type": "plate", "status": "approved"})
+        assert len(response.json()) == len(expected_joints(
+            lambda r: r["material_type"] == "plate" and r["status"] == "approved"
+        ))
+
+        # Invalid filter values are rejected by validation
+        assert client.get("/fitup/", params={"approval": "maybe"}).status_code == 422
+        assert client.get("/fitup/", params={"created_from": "yesterday"}).status_code == 422
+
+
+def test_filters_with_sort_and_pages():
+    with filtered_client() as (client, project_ids):
+        filters = {"project_id": project_ids[0], "approval": "rejected", "sort": "-created_at"}
+        expected = expected_joints(lambda r: r["project"] == 0 and r["is_approved"] is False)
+
+        records, after = [], None
+        while True:
+            response = client.get("/fitup/", params={**filters, "limit": 3, **({"after": after} if after else {})})
+            assert response.status_code == 200, response.text
+            records.extend(response.json())
+            after = response.headers.get("X-Next-Cursor")
+            if after is None:
+                break
+        assert len(expected) > 3 and sorted(r["joint_no"] for r in records) == expected
+        keys = [(r["created_at"], r["id"]) for r in records]
+        assert keys == sorted(keys, reverse=True)
+
+        # skip/limit applies the same filters and sort
+        response = client.get("/fitup/", params={**filters, "skip": 2, "limit": 3})
+        assert [r["id"] for r in response.json()] == [r["id"] for r in records[2:5]]
+
+
+if __name__ == "__main__":
+    test_filter_conditions()
+    test_list_endpoints_combine_filters()
+    test_filters_with_sort_and_pages()
+    print("✅ List filter tests passed")
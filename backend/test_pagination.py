@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Tests for keyset (cursor) pagination: cursor encoding, CRUDBase / AsyncCRUDBase
+/ audit trail pages, and the list endpoints walking pages through the
+X-Next-Cursor header while skip/limit keeps working.
+
+Uses a temporary SQLite file, so no database server is needed:
+    python test_pagination.py    (or: pytest test_pagination.py)
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app.core.security import create_access_token, get_password_hash
+from app.database import Base, async_database_url, get_async_db, get_db, make_async_engine, make_engine
+from app import models
+from app.crud import fitup_crud, fitup_async_crud
+from app.crud.audit_trail import audit_trail as audit_trail_crud
+from app.routers import audit_trail, fitup, final, material, ndt, projects
+from app.schemas.audit_trail import AuditTrailFilter
+from app.utils.pagination import decode_cursor, encode_cursor
+
+ROWS = 57
+
+
+@contextmanager
+def seeded_database():
+    """Two users, three projects (one assigned to the inspector) and ROWS records per table."""
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{directory}/pages.db"
+        engine, async_engine = make_engine(url), make_async_engine(async_database_url(url))
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        AsyncSession = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+        db = Session()
+        admin = models.User(username="admin", email="admin@example.com",
+                            hashed_password=get_password_hash("secret"), role="admin")
+        inspector = models.User(username="inspector", email="inspector@example.com",
+                                hashed_password=get_password_hash("secret"), role="inspector")
+        db.add_all([admin, inspector])
+        db.flush()
+        project_list = [
+            models.Project(project_number=f"P{i}", project_name=f"Project {i}", client="Client",
+                           project_manager="PM", start_date=date.today(), created_by=admin.id)
+            for i in range(3)
+        ]
+        db.add_all(project_list)
+        db.flush()
+        db.add(models.UserProjectAssignment(user_id=inspector.id, project_id=project_list[1].id,
+                                            assigned_by=admin.id))
+        for i in range(ROWS):
+            # Few distinct dates, so (created_at, id) ties are exercised
+            created = date.today() - timedelta(days=i % 4)
+            project_id = project_list[i % 3].id
+            db.add(models.Fitup(project_id=project_id, joint_no=f"J{i}", status=("pending", "approved")[i % 2],
+                                created_by=admin.id, created_at=created))
+            db.add(models.FinalInspection(project_id=project_id, joint_no=f"J{i}", created_by=admin.id))
+            db.add(models.NDTRequest(project_id=project_id, joint_no=f"J{i}", created_by=admin.id))
+            db.add(models.Material(project_id=project_id, material_type="pipe", heat_no=f"H{i}",
+                                   created_by=admin.id))
+            db.add(models.AuditTrail(user_id=admin.id, action="create", table_name="fitups", record_id=i,
+                                     created_at=datetime(2024, 1, 1) + timedelta(hours=i % 5)))
+        project_ids = [project.id for project in project_list]
+        db.commit()
+        db.close()
+        try:
+            yield Session, AsyncSession, project_ids
+        finally:
+            asyncio.run(async_engine.dispose())
+            engine.dispose()
+
+
+def walk(fetch_page):
+    """All records returned by fetch_page(after) -> (records, next_cursor), page after page."""
+    records, after, pages = [], None, 0
+    while True:
+        page, after = fetch_page(after)
+        records.extend(page)
+        pages += 1
+        if after is None:
+            return records, pages
+
+
+def test_cursor_encoding():
+    cursor = encode_cursor("-created_at", date(2024, 5, 1), 42)
+    assert decode_cursor(cursor, "-created_at") == (date(2024, 5, 1), 42)
+    assert decode_cursor(encode_cursor("created_at", datetime(2024, 5, 1, 8, 30), 7), "created_at") == \
+        (datetime(2024, 5, 1, 8, 30), 7)
+    assert decode_cursor(encode_cursor("id", 9, 9), "id") == (9, 9)
+    for bad_cursor, sort in (("not-a-cursor", "id"), ("", "id"), (cursor, "created_at")):
+        try:
+            decode_cursor(bad_cursor, sort)
+            assert False, f"{bad_cursor!r} should be rejected"
+        except ValueError:
+            pass
+
+
+def test_crud_pages():
+    with seeded_database() as (Session, AsyncSession, project_ids):
+        db = Session()
+        everything = db.query(models.Fitup).all()
+        for sort, key, reverse in (("id", lambda f: f.id, False), ("-id", lambda f: f.id, True),
+                                   ("created_at", lambda f: (f.created_at, f.id), False),
+                                   ("-created_at", lambda f: (f.created_at, f.id), True)):
+            records, pages = walk(lambda after: fitup_crud.get_page(db, after=after, limit=10, sort=sort))
+            assert [f.id for f in records] == [f.id for f in sorted(everything, key=key, reverse=reverse)], sort
+            assert pages == 6
+
+        # Equality filters and conditions combine with the cursor
+        records, _ = walk(lambda after: fitup_crud.get_page(
+            db, models.Fitup.status == "approved", after=after, limit=4, sort="-created_at",
+            project_id=project_ids[0], joint_no=None
+        ))
+        expected = [f for f in everything if f.project_id == project_ids[0] and f.status == "approved"]
+        assert sorted(f.id for f in records) == sorted(f.id for f in expected) and len(records) == len(set(records))
+
+        # A page exactly filling the last rows has no next cursor
+        page, next_cursor = fitup_crud.get_page(db, limit=ROWS)
+        assert len(page) == ROWS and next_cursor is None
+        try:
+            fitup_crud.get_page(db, sort="joint_no")
+            assert False, "unknown sort key accepted"
+        except ValueError:
+            pass
+
+        # Audit records, newest first
+        records, _ = walk(lambda after: audit_trail_crud.get_page(
+            db, filters=AuditTrailFilter(table_name="fitups"), after=after, limit=8
+        ))
+        assert [(r.created_at, r.id) for r in records] == sorted(((r.created_at, r.id) for r in records), reverse=True)
+        assert len(records) == ROWS
+
+        # The async variant returns the same pages
+        async def async_walk():
+            async with AsyncSession() as adb:
+                records, after = [], None
+                while True:
+                    page, after = await fitup_async_crud.get_page(adb, after=after, limit=10, sort="-created_at")
+                    records.extend(page)
+                    if after is None:
+                        return records
+
+        sync_records, _ = walk(lambda after: fitup_crud.get_page(db, after=after, limit=10, sort="-created_at"))
+        assert [f.id for f in asyncio.run(async_walk())] == [f.id for f in sync_records]
+        db.close()
+
+
+def test_list_endpoints():
+    with seeded_database() as (Session, AsyncSession, project_ids):
+        app = FastAPI()
+        for router, prefix in ((fitup.router, "/fitup"), (final.router, "/final"), (ndt.router, "/ndt"),
+                               (material.router, "/material"), (projects.router, "/projects"),
+                               (audit_trail.router, "/audit")):
+            app.include_router(router, prefix=prefix)
+
+        def override_db():
+            db = Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        async def override_async_db():
+            async with AsyncSession() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = override_db
+        app.dependency_overrides[get_async_db] = override_async_db
+        client = TestClient(app)
+        admin = {"Authorization": f"Bearer {create_access_token({'sub': 'admin'})}"}
+        inspector = {"Authorization": f"Bearer {create_access_token({'sub': 'inspector'})}"}
+
+        def walk_endpoint(path, headers=admin, **params):
+            def fetch(after):
+                response = client.get(path, params={**params, **({"after": after} if after else {})},
+                                      headers=headers)
+                assert response.status_code == 200, response.text
+                return response.json(), response.headers.get("X-Next-Cursor")
+            return walk(fetch)
+
+        for path in ("/fitup/", "/final/", "/ndt/", "/material/", "/audit/"):
+            records, pages = walk_endpoint(path, limit=20)
+            assert len(records) == ROWS and len({r["id"] for r in records}) == ROWS and pages == 3, path
+
+        records, _ = walk_endpoint("/fitup/", limit=5, project_id=project_ids[2], sort="-created_at")
+        assert {r["project_id"] for r in records} == {project_ids[2]} and len(records) == ROWS // 3
+        records, _ = walk_endpoint("/material/", limit=5, status="pending")
+        assert len(records) == ROWS
+
+        records, _ = walk_endpoint("/projects/", limit=1)
+        assert [r["id"] for r in records] == project_ids
+        records, _ = walk_endpoint("/projects/", headers=inspector, limit=1)
+        assert [r["id"] for r in records] == [project_ids[1]]
+
+        records, _ = walk_endpoint("/audit/record/fitups/3", limit=1)
+        assert [r["record_id"] for r in records] == [3]
+
+        # skip/limit keeps the OFFSET behaviour and sends no cursor
+        response = client.get("/fitup/", params={"skip": 10, "limit": 5}, headers=admin)
+        with Session() as db:
+            assert [r["id"] for r in response.json()] == [f.id for f in fitup_crud.get_multi(db, skip=10, limit=5)]
+        assert "X-Next-Cursor" not in response.headers
+
+        # ... and honours sort, for projects too
+        response = client.get("/projects/", params={"skip": 1, "sort": "-id"}, headers=admin)
+        assert [r["id"] for r in response.json()] == project_ids[::-1][1:]
+        assert client.get("/projects/", params={"skip": 1}, headers=inspector).json() == []
+        assert client.get("/projects/", params={"skip": 1, "sort": "nope"}, headers=admin).status_code == 400
+
+        cursor = client.get("/fitup/", params={"limit": 5}, headers=admin).headers["X-Next-Cursor"]
+        for params in ({"after": "garbage"}, {"after": cursor, "sort": "-id"}, {"after": cursor, "skip": 5},
+                       {"sort": "status"}, {"limit": 0}):
+            assert client.get("/fitup/", params=params, headers=admin).status_code == 400, params
+        assert client.get("/audit/", params={"after": "garbage"}, headers=admin).status_code == 400
+
+
+if __name__ == "__main__":
+    test_cursor_encoding()
+    test_crud_pages()
+    test_list_endpoints()
+    print("✅ Pagination tests passed")
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Index regression tests: builds the schema with the alembic migrations, runs the
+hot CRUD, dashboard and audit queries, and checks with EXPLAIN QUERY PLAN that
+SQLite answers each of them from the intended index instead of a table scan.
+Also checks that the models and the migrations describe the same schema, and
+that upgrading fills the dashboard counters of databases that predate them.
+
+Uses a temporary SQLite file, so no database server is needed:
+    python test_query_indexes.py    (or: pytest test_query_indexes.py)
+"""
+
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BACKEND_DIR)
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, event, func, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.database import Base
+from app import models
+from app.crud import fitup_crud, final_inspection_crud, ndt_request_crud, material_crud
+from app.crud.audit_trail import audit_trail as audit_trail_crud
+from app.utils.dashboard_stats import trends
+from app.utils.pagination import encode_cursor
+
+
+def upgrade(url, revision="head"):
+    saved_url = settings.database_url
+    settings.database_url = url
+    try:
+        config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+        config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+        command.upgrade(config, revision)
+    finally:
+        settings.database_url = saved_url
+
+
+@contextmanager
+def migrated_database():
+    """Session on a temporary SQLite file upgraded to the latest migration."""
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{directory}/indexes.db"
+        upgrade(url)
+        engine = create_engine(url)
+        db = sessionmaker(bind=engine)()
+        try:
+            yield engine, db
+        finally:
+            db.close()
+            engine.dispose()
+
+
+class QueryPlans:
+    """Records the query plan of every SELECT run inside the block."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    def details(self):
+        with self.engine.connect() as connection:
+            return [
+                [row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+                for statement, parameters in self.statements
+            ]
+
+
+def assert_uses_index(engine, run, index_prefix):
+    """Every query issued by run() must search an index whose name starts with index_prefix."""
+    with QueryPlans(engine) as plans:
+        run()
+    assert plans.statements, "no query was run"
+    for plan in plans.details():
+        assert any(index_prefix in detail and detail.startswith("SEARCH") for detail in plan), plan
+
+
+def test_hot_queries_use_indexes():
+    with migrated_database() as (engine, db):
+        today = date.today()
+        for table, crud in (
+            ("fitups", fitup_crud),
+            ("final_inspections", final_inspection_crud),
+            ("ndt_requests", ndt_request_crud),
+            ("materials", material_crud),
+        ):
+            model = crud.model
+            assert_uses_index(engine, lambda: crud.get_by_project(db, project_id=1), f"ix_{table}_project_")
+            assert_uses_index(engine, lambda: crud.get_by_status(db, status="pending"), f"ix_{table}_status")
+            assert_uses_index(
+                engine,
+                lambda: db.query(model).filter(model.project_id == 1, model.status == "pending").all(),
+                f"ix_{table}_project_status",
+            )
+            assert_uses_index(
+                engine,
+                lambda: db.query(model).filter(model.project_id == 1, model.created_at >= today).all(),
+                f"ix_{table}_project_created_at",
+            )
+
+        for model, table in ((models.Fitup, "fitups"), (models.FinalInspection, "final_inspections"),
+                             (models.NDTRequest, "ndt_requests")):
+            assert_uses_index(
+                engine,
+                lambda: db.query(model).filter(
+                    model.project_id == 1, model.line_no == "L1", model.spool_no == "S1", model.joint_no == "J1"
+                ).all(),
+                f"ix_{table}_project_joint",
+            )
+        for model, table in ((models.Fitup, "fitups"), (models.FinalInspection, "final_inspections")):
+            assert_uses_index(
+                engine,
+                lambda: db.execute(
+                    select(func.count()).select_from(model).where(model.project_id == 1, model.is_approved.is_(None))
+                ).scalar(),
+                f"ix_{table}_pending_approval",
+            )
+
+        # Trend series over a date range, for all projects and for one
+        start = today - timedelta(days=30)
+        assert_uses_index(engine, lambda: trends(db, "week", start, today, entities=["fitups"],
+                                                 use_counters=False), "ix_fitups_created_at")
+        assert_uses_index(engine, lambda: trends(db, "week", start, today, entities=["fitups"], project_id=1,
+                                                 use_counters=False), "ix_fitups_project_created_at")
+
+        # Keyset pages seek into the index instead of skipping rows
+        cursor = encode_cursor("-created_at", today, 100)
+        assert_uses_index(engine, lambda: fitup_crud.get_page(db, after=cursor, sort="-created_at", project_id=1),
+                          "ix_fitups_project_created_at")
+        assert_uses_index(engine, lambda: fitup_crud.get_page(db, after=cursor, sort="-created_at"),
+                          "ix_fitups_created_at")
+
+        # Welder filter of the final inspection and NDT list endpoints
+        for crud, table in ((final_inspection_crud, "final_inspections"), (ndt_request_crud, "ndt_requests")):
+            assert_uses_index(
+                engine, lambda: crud.get_page(db, *crud.filter_conditions({"welder_no": "W1"})),
+                f"ix_{table}_welder_no",
+            )
+
+        assert_uses_index(engine, lambda: audit_trail_crud.get_by_record(db, "fitups", 1), "ix_audit_trail_record")
+        assert_uses_index(engine, lambda: audit_trail_crud.get_by_user(db, 1), "ix_audit_trail_user_created_at")
+
+
+def test_migrations_match_models():
+    with migrated_database() as (engine, db):
+        with engine.connect() as connection:
+            diff = compare_metadata(MigrationContext.configure(connection), Base.metadata)
+        assert diff == [], diff
+
+
+def test_upgrade_backfills_dashboard_counters():
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{directory}/counters.db"
+        upgrade(url, "0003")
+        engine = create_engine(url)
+        try:
+            # Rows written without the ORM, as in a database that predates the counters
+            with engine.begin() as connection:
+                connection.execute(insert(models.Project), [{
+                    "project_number": "P1", "project_name": "Project 1", "client": "Client",
+                    "project_manager": "PM", "start_date": date(2024, 5, 1), "created_by": 1,
+                }])
+                connection.execute(insert(models.Fitup), [
+                    {"project_id": 1, "joint_no": f"J{i}", "status": "pending", "created_at": date(2024, 5, 1),
+                     "created_by": 1}
+                    for i in range(3)
+                ])
+            upgrade(url)
+            with engine.connect() as connection:
+                counts = dict(connection.execute(
+                    select(models.DashboardCounter.entity, func.sum(models.DashboardCounter.count))
+                    .group_by(models.DashboardCounter.entity)
+                ).all())
+            assert counts == {"projects": 1, "fitups": 3}, counts
+        finally:
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    test_hot_queries_use_indexes()
+    test_migrations_match_models()
+    test_upgrade_backfills_dashboard_counters()
+    print("✅ Query index tests passed")
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-request SQL instrumentation: Server-Timing entries, the
+request log line, N+1 detection and the slow-query log, for sync endpoints
+(threadpool) and async endpoints (AsyncSession).
+
+Uses a temporary SQLite file, so no database server is needed:
+    python test_query_stats.py    (or: pytest test_query_stats.py)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.database import make_async_engine, make_engine
+from app.utils.query_stats import (
+    QueryStatsMiddleware, RequestQueries, configure_slow_query_log, current_queries, parameter_shape,
+)
+
+
+class Captured(logging.Handler):
+    def __init__(self, name):
+        super().__init__(logging.INFO)
+        self.logger = logging.getLogger(name)
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append((record.levelno, json.loads(record.getMessage())))
+
+    def __enter__(self):
+        self.saved = self.logger.level, self.logger.propagate, self.logger.disabled
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.logger.disabled = False
+        self.logger.addHandler(self)
+        return self
+
+    def __exit__(self, *exc):
+        self.logger.removeHandler(self)
+        self.logger.setLevel(self.saved[0])
+        self.logger.propagate = self.saved[1]
+        self.logger.disabled = self.saved[2]
+
+
+@contextmanager
+def instrumented_app():
+    with tempfile.TemporaryDirectory() as directory:
+        engine = make_engine(f"sqlite:///{directory}/stats.db")
+        async_engine = make_async_engine(f"sqlite+aiosqlite:///{directory}/stats.db")
+        with engine.begin() as connection:
+            connection.exec_driver_sql("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+            connection.exec_driver_sql("INSERT INTO items (name) VALUES ('a'), ('b'), ('c')")
+
+        app = FastAPI()
+        app.add_middleware(QueryStatsMiddleware)
+
+        @app.get("/sync")
+        def sync_endpoint(repeat: int = 3):
+            with engine.connect() as connection:
+                for item_id in range(repeat):
+                    connection.execute(text("SELECT name FROM items WHERE id = :id"), {"id": item_id})
+            return {"in_request": current_queries() is not None}
+
+        @app.get("/async")
+        async def async_endpoint():
+            async with async_engine.connect() as connection:
+                await connection.execute(text("SELECT count(*) FROM items"))
+                await connection.execute(text("SELECT name FROM items"))
+            return {}
+
+        @app.get("/timed")
+        def timed_endpoint(response: Response):
+            response.headers["Server-Timing"] = "render;dur=1.0"
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+            return {}
+
+        try:
+            yield TestClient(app)
+        finally:
+            asyncio.run(async_engine.dispose())
+            engine.dispose()
+
+
+def test_request_queries():
+    queries = RequestQueries()
+    for seconds in (0.002, 0.010, 0.001):
+        queries.record("SELECT a FROM t WHERE id = ?", seconds)
+    queries.record("SELECT b FROM t", 0.003)
+    assert queries.count == 4 and abs(queries.seconds - 0.016) < 1e-9
+    assert queries.slowest_statement == "SELECT a FROM t WHERE id = ?"
+    assert queries.repeated(threshold=2) == [{"statement": "SELECT a FROM t WHERE id = ?", "count": 3}]
+    assert queries.repeated(threshold=3) == []
+    assert queries.server_timing() == 'db;dur=16.0;desc="4 queries", db-slowest;dur=10.0'
+
+    assert parameter_shape({"id": 1, "name": "x", "note": None}) == {"id": "int", "name": "str", "note": "NoneType"}
+    assert parameter_shape((1, "secret")) == ["int", "str"]
+    assert parameter_shape([(1, "a"), (2, "b")], executemany=True) == {"rows": 2, "row": ["int", "str"]}
+
+
+def test_server_timing_and_request_log():
+    with instrumented_app() as client, Captured("app.utils.query_stats") as log:
+        response = client.get("/sync", params={"repeat": 3})
+        assert response.json() == {"in_request": True}
+        assert response.headers["server-timing"].startswith('db;dur=')
+        assert 'desc="3 queries"' in response.headers["server-timing"]
+
+        response = client.get("/async")
+        assert 'desc="2 queries"' in response.headers["server-timing"]
+
+        # Entries set by the endpoint are kept
+        timing = client.get("/timed").headers["server-timing"]
+        assert timing.startswith("render;dur=1.0, db;dur=") and 'desc="1 queries"' in timing
+
+        levels, lines = zip(*log.lines)
+        assert [line["path"] for line in lines] == ["/sync", "/async", "/timed"]
+        assert [line["queries"] for line in lines] == [3, 2, 1]
+        assert all(level == logging.INFO and line["status"] == 200 and not line["repeated"]
+                   for level, line in log.lines)
+        assert lines[1]["slowest_statement"].startswith("SELECT")
+
+
+def test_repeated_statement_is_flagged():
+    with instrumented_app() as client, Captured("app.utils.query_stats") as log:
+        client.get("/sync", params={"repeat": settings.query_repeat_threshold + 2})
+        level, line = log.lines[-1]
+        assert level == logging.WARNING
+        assert line["repeated"] == [{
+            "statement": "SELECT name FROM items WHERE id = ?", "count": settings.query_repeat_threshold + 2
+        }]
+
+
+def test_slow_query_log():
+    saved = settings.slow_query_threshold_ms
+    settings.slow_query_threshold_ms = 0
+    try:
+        with Captured("app.slow_queries") as log, instrumented_app() as client:
+            client.get("/sync", params={"repeat": 1})
+            level, line = log.lines[-1]
+            assert level == logging.WARNING and line["event"] == "slow_query"
+            assert line["statement"] == "SELECT name FROM items WHERE id = ?"
+            assert line["parameters"] == ["int"]
+    finally:
+        settings.slow_query_threshold_ms = saved
+
+    with instrumented_app() as client, Captured("app.slow_queries") as log:
+        client.get("/sync", params={"repeat": 1})
+        assert log.lines == []
+
+
+def test_configured_logs_reach_stderr():
+    loggers = [logging.getLogger("app.utils.query_stats"), logging.getLogger("app.slow_queries")]
+    saved = [(log, log.level, log.propagate, log.disabled, list(log.handlers)) for log in loggers]
+    saved_file = settings.slow_query_log_file
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            for log in loggers:
+                log.handlers = []
+                log.setLevel(logging.NOTSET)
+                log.disabled = True
+            settings.slow_query_log_file = Path(directory) / "logs" / "slow.log"
+            configure_slow_query_log()
+            configure_slow_query_log()
+
+            request_log, slow_log = loggers
+            # The per-request INFO lines are emitted without any root logger configuration
+            assert request_log.isEnabledFor(logging.INFO) and not request_log.disabled
+            assert [type(handler) for handler in request_log.handlers] == [logging.StreamHandler]
+            assert slow_log.isEnabledFor(logging.WARNING) and not slow_log.isEnabledFor(logging.INFO)
+            assert sorted(type(handler).__name__ for handler in slow_log.handlers) == ["FileHandler", "StreamHandler"]
+            for handler in slow_log.handlers:
+                handler.close()
+    finally:
+        settings.slow_query_log_file = saved_file
+        for log, level, propagate, disabled, handlers in saved:
+            log.handlers = handlers
+            log.setLevel(level)
+            log.propagate = propagate
+            log.disabled = disabled
+
+
+if __name__ == "__main__":
+    test_request_queries()
+    test_server_timing_and_request_log()
+    test_repeated_statement_is_flagged()
+    test_slow_query_log()
+    test_configured_logs_reach_stderr()
+    print("✅ Query statistics tests passed")
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming spreadsheet import: reading CSV/XLSX row by row, header
+mapping, batch validation with per-row errors and the error report, and the
+/import endpoints running the import as a background job.
+
+Uses a temporary SQLite file, so no database server is needed:
+    python test_spreadsheet_import.py    (or: pytest test_spreadsheet_import.py)
+"""
+
+import csv
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from openpyxl import Workbook
+from sqlalchemy import func
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.security import create_access_token, get_password_hash
+from app.crud import final_inspection_crud, fitup_crud, material_crud
+from app.database import Base, get_db, make_engine
+from app import models, schemas
+from app.routers import imports
+from app.routers.imports import COLUMN_ALIASES
+from app.utils import dashboard_counters  # noqa: F401  (registers the session listeners)
+from app.utils.job_queue import JobQueue
+from app.utils.spreadsheet_import import SheetReader, import_rows, normalize_header, progress_unit
+
+
+@contextmanager
+def import_database():
+    with tempfile.TemporaryDirectory() as directory:
+        engine = make_engine(f"sqlite:///{directory}/import.db")
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        db = Session()
+        user = models.User(username="admin", email="admin@example.com",
+                           hashed_password=get_password_hash("secret"), role="admin")
+        db.add(user)
+        db.add(models.User(username="inspector", email="inspector@example.com",
+                           hashed_password=get_password_hash("secret"), role="inspector"))
+        db.flush()
+        project = models.Project(project_number="P1", project_name="Project 1", client="Client",
+                                 project_manager="PM", start_date=date.today(), created_by=user.id)
+        db.add(project)
+        db.commit()
+        ids = user.id, project.id
+        db.close()
+        try:
+            yield Path(directory), Session, ids
+        finally:
+            engine.dispose()
+
+
+def write_csv(path, header, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return path
+
+
+def write_xlsx(path, header, rows):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(header)
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+    return path
+
+
+def test_sheet_reader():
+    assert normalize_header(" Joint No. ") == "joint_no"
+    assert normalize_header("Heat-Number") == "heat_number"
+    assert normalize_header(None) == ""
+
+    with tempfile.TemporaryDirectory() as directory:
+        rows = [["L1", 1], ["", None], ["L3", 3]]
+        for path in (write_csv(Path(directory) / "joints.csv", ["Line", "Joint"], rows),
+                     write_xlsx(Path(directory) / "joints.xlsx", ["Line", "Joint"], rows)):
+            with SheetReader(path) as sheet:
+                assert sheet.header == ["Line", "Joint"]
+                read = [(number, [str(value) for value in values]) for number, values in sheet]
+                # CSV files are measured in bytes, XLSX sheets in rows
+                size = path.stat().st_size if progress_unit(path) == "bytes" else 3
+                assert sheet.position == sheet.total == size, path
+            # Blank rows are skipped; numbers are spreadsheet rows (the header is row 1)
+            assert read == [(2, ["L1", "1"]), (4, ["L3", "3"])], path
+
+        # A byte order mark is dropped; quoted fields may span lines
+        path = Path(directory) / "notes.csv"
+        path.write_bytes("\ufeffJoint,Note\r\nJ1,\"two\r\nlines\"\r\nJ2,é\r\n".encode("utf-8"))
+        with SheetReader(path) as sheet:
+            assert sheet.header == ["Joint", "Note"] and sheet.position == len("\ufeffJoint,Note\r\n".encode("utf-8"))
+            assert list(sheet) == [(2, ["J1", "two\r\nlines"]), (3, ["J2", "é"])]
+
+        try:
+            with SheetReader(Path(directory) / "joints.txt"):
+                pass
+            assert False, "text file accepted"
+        except ValueError:
+            pass
+
+
+def test_import_rows_reports_row_errors():
+    with import_database() as (directory, Session, (user_id, project_id)):
+        header = ["Project ID", "Line No", "Joint No.", "Part1 Thickness", "Fitup Inspection Date", "Remarks"]
+        rows = [[project_id, f"L{i % 5}", f"J{i}", 12.5, "2024-05-01", "ok"] for i in range(2500)]
+        rows[10][3] = "thick"          # not a number
+        rows[1500][0] = 999            # unknown project
+        rows[2001][4] = "05/01/2024"   # not an ISO date
+        path = write_csv(directory / "fitups.csv", header, rows)
+
+        progress = []
+        db = Session()
+        summary = import_rows(
+            db, fitup_crud, schemas.FitupCreate, path,
+            errors_path=directory / "errors.csv", aliases=COLUMN_ALIASES, values={"created_by": user_id},
+            project_ids={project_id}, batch_size=1000, progress=lambda done, total: progress.append((done, total)),
+        )
+        db.close()
+
+        assert summary["rows"] == 2500 and summary["inserted"] == 2497 and summary["failed"] == 3
+        assert summary["ignored_columns"] == ["Remarks"]
+        assert [error["row"] for error in summary["errors"]] == [12, 1502, 2003]
+        assert summary["errors"][0]["column"] == "part1_thickness"
+        assert summary["errors"][1] == {"row": 1502, "column": "project_id", "message": "Project 999 does not exist"}
+        # Bytes read after the header and after each batch of 1000 rows
+        size = path.stat().st_size
+        with open(path, "rb") as f:
+            lines = f.readlines()
+        assert progress == [(sum(map(len, lines[:rows + 1])), size) for rows in (0, 1000, 2000, 2500)]
+        assert progress[-1] == (size, size)
+
+        with open(directory / "errors.csv", newline="") as f:
+            report = list(csv.reader(f))
+        assert report[0] == ["row", "column", "error"] and [row[0] for row in report[1:]] == ["12", "1502", "2003"]
+
+        with Session() as db:
+            assert db.query(models.Fitup).count() == 2497
+            fitup = db.query(models.Fitup).filter(models.Fitup.joint_no == "J0").one()
+            assert (fitup.line_no, fitup.part1_thickness, fitup.fitup_inspection_date, fitup.created_by) == \
+                ("L0", 12.5, date(2024, 5, 1), user_id)
+            # Stored through the ORM, so the dashboard counters follow
+            assert db.query(func.sum(models.DashboardCounter.count)).filter(
+                models.DashboardCounter.entity == "fitups"
+            ).scalar() == 2497
+
+
+def test_import_xlsx_cells():
+    with import_database() as (directory, Session, (user_id, project_id)):
+        header = ["Line", "Joint", "Welder", "Welding Completion Date", "Weld Length"]
+        rows = [["L1", 7, "W-3", datetime(2024, 6, 2), 150.0], ["L1", 8.0, 42, datetime(2024, 6, 3), None]]
+        path = write_xlsx(directory / "weld_log.xlsx", header, rows)
+        db = Session()
+        summary = import_rows(
+            db, final_inspection_crud, schemas.FinalInspectionCreate, path,
+            errors_path=directory / "errors.csv", aliases=COLUMN_ALIASES, defaults={"project_id": project_id},
+            values={"created_by": user_id},
+        )
+        db.close()
+        assert summary["inserted"] == 2 and summary["failed"] == 0
+        with Session() as db:
+            records = db.query(models.FinalInspection).order_by(models.FinalInspection.id).all()
+            # Numeric cells of text columns keep their spreadsheet spelling
+            assert [(r.joint_no, r.welder_no) for r in records] == [("7", "W-3"), ("8", "42")]
+            assert records[0].welding_completion_date == date(2024, 6, 2) and records[0].weld_length == 150.0
+            assert records[1].project_id == project_id and records[1].status == "pending"
+
+        # A required column that is neither in the file nor given as a default
+        path = write_csv(directory / "materials.csv", ["Heat No", "Grade"], [["H1", "A106"]])
+        db = Session()
+        try:
+            import_rows(db, material_crud, schemas.MaterialCreate, path, errors_path=directory / "errors.csv",
+                        defaults={"project_id": project_id})
+            assert False, "import without material_type accepted"
+        except ValueError as e:
+            assert "material_type" in str(e)
+        db.close()
+
+
+def test_import_endpoints():
+    with import_database() as (directory, Session, (user_id, project_id)):
+        saved = settings.import_dir, imports.import_jobs, imports.SessionLocal
+        settings.import_dir = directory / "imports"
+        imports.import_jobs = JobQueue(directory / "imports" / "jobs", max_workers=1)
+        imports.SessionLocal = Session
+        try:
+            app = FastAPI()
+            app.include_router(imports.router, prefix="/import")
+
+            def override_db():
+                db = Session()
+                try:
+                    yield db
+                finally:
+                    db.close()
+
+            app.dependency_overrides[get_db] = override_db
+            client = TestClient(app)
+            client.headers["Authorization"] = f"Bearer {create_access_token({'sub': 'admin'})}"
+
+            path = write_csv(directory / "certs.csv", ["Material Type", "Heat Number", "Thickness"],
+                             [["pipe", f"H{i}", 6.35] for i in range(300)] + [["", "H-blank", 1]])
+            with open(path, "rb") as f:
+                response = client.post("/import/material", params={"project_id": project_id},
+                                       files={"file": ("焊口.csv", f, "text/csv")})
+            assert response.status_code == 202, response.text
+            job_id = response.json()["id"]
+
+            for _ in range(200):
+                job = client.get(f"/import/jobs/{job_id}").json()
+                if job["status"] not in ("queued", "running"):
+                    break
+                time.sleep(0.05)
+            assert job["status"] == "completed", job
+            assert (job["inserted"], job["failed"], job["rows_processed"]) == (300, 1, 301)
+            assert job["processed"] == job["total"] == path.stat().st_size and job["progress_unit"] == "bytes"
+            assert job["errors"][0]["row"] == 302 and job["errors"][0]["column"] == "material_type"
+
+            response = client.get(job["error_report_url"])
+            assert response.status_code == 200
+            # Non-ASCII upload names get an ASCII fallback and the RFC 5987 form
+            assert response.headers["content-disposition"] == (
+                'attachment; filename="___import_errors.csv"; filename*=UTF-8\'\'%E7%84%8A%E5%8F%A3_import_errors.csv'
+            )
+            assert response.text.splitlines()[1].startswith("302,material_type,")
+            # The uploaded file is removed once imported
+            assert list((directory / "imports" / "uploads").iterdir()) == []
+            with Session() as db:
+                assert db.query(models.Material).count() == 300
+
+            with open(path, "rb") as f:
+                assert client.post("/import/ndt", files={"file": ("certs.csv", f)}).status_code == 400
+                f.seek(0)
+                assert client.post("/import/material", files={"file": ("certs.pdf", f)}).status_code == 400
+            assert client.get("/import/jobs/unknown").status_code == 404
+
+            # Other users cannot see the job or its error report
+            inspector = {"Authorization": f"Bearer {create_access_token({'sub': 'inspector'})}"}
+            assert client.get(f"/import/jobs/{job_id}", headers=inspector).status_code == 404
+            assert client.get(f"/import/jobs/{job_id}/errors", headers=inspector).status_code == 404
+        finally:
+            settings.import_dir, imports.import_jobs, imports.SessionLocal = saved
+
+
+if __name__ == "__main__":
+    test_sheet_reader()
+    test_import_rows_reports_row_errors()
+    test_import_xlsx_cells()
+    test_import_endpoints()
+    print("✅ Spreadsheet import tests passed")
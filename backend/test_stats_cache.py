@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Tests for the dashboard statistics cache: hits and misses, TTL expiry, the shared
+file backend and its invalidation generations, per-key lock cleanup, and
+invalidation when a commit changes a project's figures.
+
+Runs against an in-memory SQLite database, so no server is needed:
+    python test_stats_cache.py    (or: pytest test_stats_cache.py)
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app import models
+from app.utils.dashboard_counters import add_change_listener
+from app.utils.stats_cache import DASHBOARD_KEY, FileBackend, MemoryBackend, StatsCache, project_key
+
+
+def make_session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+def test_hits_misses_and_ttl():
+    cache = StatsCache(MemoryBackend(), ttl_seconds=0.2)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"value": len(calls)}
+
+    assert cache.get_or_compute(DASHBOARD_KEY, compute) == ({"value": 1}, False)
+    assert cache.get_or_compute(DASHBOARD_KEY, compute) == ({"value": 1}, True)
+    time.sleep(0.25)
+    assert cache.get_or_compute(DASHBOARD_KEY, compute) == ({"value": 2}, False)
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_get_or_compute_many_computes_only_missing_keys():
+    cache = StatsCache(MemoryBackend(), ttl_seconds=60)
+    cache.get_or_compute(project_key(1), lambda: {"project": 1})
+    requested = []
+
+    def compute(keys):
+        requested.append(keys)
+        return {key: {"computed": key} for key in keys}
+
+    values, hits = cache.get_or_compute_many([project_key(1), project_key(2)], compute)
+    assert hits == 1 and requested == [[project_key(2)]]
+    assert values == {project_key(1): {"project": 1}, project_key(2): {"computed": project_key(2)}}
+    assert cache.get_or_compute_many([project_key(2)], compute) == ({project_key(2): {"computed": project_key(2)}}, 1)
+
+
+def test_file_backend_is_shared():
+    with tempfile.TemporaryDirectory() as directory:
+        first = StatsCache(FileBackend(directory), ttl_seconds=60)
+        second = StatsCache(FileBackend(directory), ttl_seconds=60)
+
+        first.get_or_compute(project_key(1), lambda: {"fitups": 3})
+        assert second.get_or_compute(project_key(1), lambda: {"fitups": 0}) == ({"fitups": 3}, True)
+
+        second.invalidate_projects([1])
+        assert first.get_or_compute(project_key(1), lambda: {"fitups": 4}) == ({"fitups": 4}, False)
+
+        # A value computed while another worker invalidated its key is not stored
+        def compute_during_write():
+            second.invalidate_projects([2])
+            return {"fitups": 5}
+
+        assert first.get_or_compute(project_key(2), compute_during_write) == ({"fitups": 5}, False)
+        assert second.get_or_compute(project_key(2), lambda: {"fitups": 6}) == ({"fitups": 6}, False)
+
+        def compute_many_during_write(keys):
+            second.invalidate_projects([3])
+            return {key: {"fitups": 7} for key in keys}
+
+        first.get_or_compute_many([project_key(3), project_key(4)], compute_many_during_write)
+        assert first.get_or_compute_many([project_key(3), project_key(4)], lambda keys: {}) == (
+            {project_key(4): {"fitups": 7}}, 1
+        )
+
+
+def test_key_locks_are_released():
+    cache = StatsCache(MemoryBackend(), ttl_seconds=60)
+    for project_id in range(100):
+        cache.get_or_compute(project_key(project_id), lambda: {"fitups": 1})
+    try:
+        cache.get_or_compute(DASHBOARD_KEY, lambda: 1 / 0)
+    except ZeroDivisionError:
+        pass
+    assert cache._key_locks == {}
+
+
+def test_commit_invalidates_changed_projects():
+    cache = StatsCache(MemoryBackend(), ttl_seconds=60)
+    add_change_listener(cache.invalidate_projects)
+    db = make_session()
+    projects = [
+        models.Project(project_number=f"P{i}", project_name=f"Project {i}", client="Client",
+                       project_manager="PM", start_date=date.today(), created_by=1)
+        for i in range(2)
+    ]
+    db.add_all(projects)
+    db.commit()
+
+    for key in (DASHBOARD_KEY, project_key(projects[0].id), project_key(projects[1].id)):
+        cache.get_or_compute(key, lambda: {"cached": True})
+
+    # Rolled back writes leave the cache alone
+    db.add(models.Fitup(project_id=projects[0].id, joint_no="1", created_by=1))
+    db.flush()
+    db.rollback()
+    assert cache.get_or_compute(DASHBOARD_KEY, lambda: {"cached": False})[1]
+
+    # A committed write drops the dashboard and the project it touched, nothing else
+    db.add(models.Fitup(project_id=projects[0].id, joint_no="1", created_by=1))
+    db.commit()
+    assert not cache.get_or_compute(DASHBOARD_KEY, lambda: {"cached": False})[1]
+    assert not cache.get_or_compute(project_key(projects[0].id), lambda: {"cached": False})[1]
+    assert cache.get_or_compute(project_key(projects[1].id), lambda: {"cached": False})[1]
+    db.close()
+
+
+if __name__ == "__main__":
+    test_hits_misses_and_ttl()
+    test_get_or_compute_many_computes_only_missing_keys()
+    test_file_backend_is_shared()
+    test_key_locks_are_released()
+    test_commit_invalidates_changed_projects()
+    print("✅ Stats cache tests passed")